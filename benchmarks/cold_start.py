@@ -0,0 +1,77 @@
+"""
+Cold-start time of the entry points in fresh interpreters: importing bot.py / main.py and
+loading the item catalog plus the preset editor's item list, with and without the compiled
+catalog in config/compiled/.
+
+    python -m benchmarks.cold_start --runs 5
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+from utils.compiled import COMPILED_DIR
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Each target prints the seconds spent inside the interpreter, the subprocess wall time adds interpreter startup
+TARGETS = {
+    "bot.py": "import time; t = time.perf_counter(); import bot; from utils.items import ItemCatalog; ItemCatalog(); print(time.perf_counter() - t)",
+    "main.py": "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)",
+    "catalog": "import time; t = time.perf_counter(); from utils.items import ItemCatalog, load_bot_items; ItemCatalog(); load_bot_items(); print(time.perf_counter() - t)",
+}
+
+
+def run_once(code: str) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        return {"error": (proc.stderr.strip().splitlines() or ["failed"])[-1]}
+    inner = float(proc.stdout.strip().splitlines()[-1])
+    return {"wall_ms": wall * 1000, "inner_ms": inner * 1000}
+
+
+def summarize(samples: list[dict]) -> dict:
+    errors = [s["error"] for s in samples if "error" in s]
+    if errors:
+        return {"error": errors[0]}
+    return {
+        "wall_ms": round(statistics.median(s["wall_ms"] for s in samples), 1),
+        "inner_ms": round(statistics.median(s["inner_ms"] for s in samples), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start time of bot.py / main.py with and without the compiled catalog.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--targets", nargs="+", default=list(TARGETS), choices=list(TARGETS))
+    parser.add_argument("--output", help="Write results JSON to this file")
+    args = parser.parse_args()
+
+    report = {}
+    for name in args.targets:
+        # First run rebuilds the artifact, the following ones load it
+        shutil.rmtree(COMPILED_DIR, ignore_errors=True)
+        cold = run_once(TARGETS[name])
+        warm = [run_once(TARGETS[name]) for _ in range(args.runs)]
+        report[name] = {"without_compiled": summarize([cold]), "with_compiled": summarize(warm)}
+
+    for name, r in report.items():
+        print(f"== {name}")
+        for label, result in r.items():
+            if "error" in result:
+                print(f"   {label:<17} unavailable: {result['error']}")
+            else:
+                print(f"   {label:<17} {result['inner_ms']:>8.1f} ms in-process   {result['wall_ms']:>8.1f} ms wall")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Import-time profile of the entry modules, checked against a budget. Uses 'python -X importtime'
+in fresh interpreters and also fails when a module drags in one of the heavy subsystems
+that are meant to load on first use only (scapy, SQLAlchemy, cv2, tesseract).
+
+    python -m benchmarks.import_time --runs 5
+    python -m benchmarks.import_time --top 15 --modules gui.gui
+
+Exits with 1 when a budget is exceeded or a deferred module was imported eagerly.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Cumulative import time budget per module, in ms
+BUDGETS = {
+    "bot": 150,
+    "net.sniffer": 100,
+    "utils.items": 100,
+    "gui.gui": 600,
+    "main": 600,
+    "cli": 50,
+}
+# Must not be imported by any of the modules above, only when the bot / sniffer is built
+DEFERRED = ["scapy", "sqlalchemy", "cv2", "pytesseract", "win32gui"]
+
+
+def profile(module: str) -> dict:
+    """One fresh interpreter importing 'module': {"total_ms", "modules": {name: (self_ms, cumulative_ms)}}."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"error": (proc.stderr.strip().splitlines() or ["failed"])[-1]}
+    # Children are listed before their parent, indented: the module's subtree is every line since the
+    # previous top-level import (interpreter startup such as site/.pth files comes before that)
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, raw_name = line[len("import time:"):].split("|")
+        name = raw_name.strip()
+        modules[name] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+        if raw_name[1:2] != " " and name != module: # Another top-level import, start over
+            modules = {}
+    return {"total_ms": modules[module][1], "modules": modules}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of the entry modules against a budget.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modules", nargs="+", default=list(BUDGETS))
+    parser.add_argument("--top", type=int, default=5, help="Show the N slowest imports (cumulative) of each module")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    args = parser.parse_args()
+
+    report = {}
+    failed = False
+    for module in args.modules:
+        runs = [profile(module) for _ in range(args.runs)]
+        errors = [r["error"] for r in runs if "error" in r]
+        if errors:
+            report[module] = {"error": errors[0]}
+            print(f"== {module}\n   unavailable: {errors[0]}")
+            continue
+
+        total = statistics.median(r["total_ms"] for r in runs)
+        budget = BUDGETS.get(module)
+        deferred = sorted({name for name in runs[-1]["modules"] if name.split(".")[0] in DEFERRED})
+        slowest = sorted(runs[-1]["modules"].items(), key=lambda item: item[1][1], reverse=True)
+        top = [(name, cumulative) for name, (_, cumulative) in slowest if name != module][:args.top]
+        ok = (budget is None or total <= budget) and not deferred
+        failed |= not ok
+        report[module] = {"total_ms": round(total, 1), "budget_ms": budget, "deferred_imported": deferred, "top": top, "ok": ok}
+
+        print(f"== {module}: {total:.1f} ms (budget {budget if budget is not None else '-'} ms) {'OK' if ok else 'OVER'}")
+        for name, cumulative in top:
+            print(f"   {cumulative:>8.1f} ms  {name}")
+        if deferred:
+            print(f"   imported eagerly: {', '.join(deferred[:10])}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
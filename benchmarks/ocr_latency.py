@@ -0,0 +1,104 @@
+"""
+Per-call OCR latency of each backend for the reads the bot performs: market title,
+item stats header and the search box. Uses a saved screenshot when given, otherwise
+renders the expected text into a blank frame.
+
+    python -m benchmarks.ocr_latency --frame screenshot.png --iterations 50
+"""
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+import cv2 as cv
+
+from config import CAPTURE_POSITIONS, MOUSE_POSITIONS
+from core.capture import get_ocr_backend
+from core.preprocess import GRAY
+
+RESOLUTION = "2560x1600"
+SAMPLE_TEXT = {"title": "Fort Sterling Marketplace", "stats": "Sell Orders", "search": "Adept's Bag 4_0"}
+
+
+def bot_regions() -> dict:
+    regions = {name: tuple(CAPTURE_POSITIONS[RESOLUTION]["market"][name]) for name in ("title", "stats")}
+    # Search box text sits just left of the click target used by MarketManager.search_text
+    x, y = MOUSE_POSITIONS[RESOLUTION]["market"]["search"]
+    regions["search"] = (x - 130, y - 20, x + 150, y + 20)
+    return regions
+
+
+def synthetic_frame(regions: dict) -> np.ndarray:
+    width, height = (int(v) for v in RESOLUTION.split("x"))
+    frame = np.full((height, width, 4), 30, dtype=np.uint8)
+    for name, (x0, y0, x1, y1) in regions.items():
+        text = SAMPLE_TEXT[name]
+        scale = 1.0
+        (tw, th), _ = cv.getTextSize(text, cv.FONT_HERSHEY_SIMPLEX, scale, 2)
+        scale = min((x1 - x0 - 10) / tw, (y1 - y0 - 6) / th, 1.5)
+        cv.putText(frame, text, (x0 + 5, y1 - (y1 - y0) // 4), cv.FONT_HERSHEY_SIMPLEX, scale, (220, 220, 220, 255), 2)
+    return frame
+
+
+def bench_backend(backend, frame: np.ndarray, regions: dict, iterations: int) -> dict:
+    results = {}
+    for name, (x0, y0, x1, y1) in regions.items():
+        bw = GRAY.apply(frame[y0:y1, x0:x1])
+        text = backend.image_to_string(bw, "--psm 6").strip() # Warm-up, loads the model
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            backend.image_to_string(bw, "--psm 6")
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        results[name] = {
+            "text": text,
+            "mean_ms": round(statistics.fmean(samples), 2),
+            "p50_ms": round(samples[len(samples) // 2], 2),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR latency per backend for the bot's regions.")
+    parser.add_argument("--frame", help="Screenshot (2560x1600) to read from instead of synthetic text")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--backends", nargs="+", default=["tesserocr", "pytesseract"])
+    parser.add_argument("--output", help="Write results JSON to this file")
+    args = parser.parse_args()
+
+    regions = bot_regions()
+    if args.frame:
+        frame = cv.imread(args.frame, cv.IMREAD_UNCHANGED)
+        if frame is None:
+            raise SystemExit(f"Frame not found: {args.frame}")
+        if frame.shape[2] == 3:
+            frame = cv.cvtColor(frame, cv.COLOR_BGR2BGRA)
+    else:
+        frame = synthetic_frame(regions)
+
+    report = {}
+    for name in args.backends:
+        try:
+            backend = get_ocr_backend(name)
+            report[name] = bench_backend(backend, frame, regions, args.iterations)
+        except Exception as e:
+            report[name] = {"error": str(e)}
+
+    for name, results in report.items():
+        print(f"== {name}")
+        if "error" in results:
+            print(f"   unavailable: {results['error']}")
+            continue
+        for region, r in results.items():
+            print(f"   {region:<7} mean {r['mean_ms']:>8.2f} ms   p50 {r['p50_ms']:>8.2f} ms   p95 {r['p95_ms']:>8.2f} ms   '{r['text']}'")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
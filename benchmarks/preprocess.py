@@ -0,0 +1,103 @@
+"""
+Time and memory per OCR preprocessing call: the old path (full frame -> PIL RGB -> crop ->
+BGR -> gray -> Otsu) against core.preprocess working on the region view of the frame.
+
+    python -m benchmarks.preprocess --iterations 200
+"""
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+import cv2 as cv
+from PIL import Image
+
+from benchmarks.ocr_latency import RESOLUTION, bot_regions, synthetic_frame
+from core.preprocess import GRAY, Preprocess
+
+
+def legacy_pipeline(frame: np.ndarray, region: tuple) -> tuple[np.ndarray, int]:
+    """Returns the binarized crop and the bytes of every intermediate buffer it allocated."""
+    rgb_full = cv.cvtColor(frame, cv.COLOR_BGRA2RGB)
+    pil_full = Image.fromarray(rgb_full)
+    pil_crop = pil_full.crop(region)
+    rgb = np.array(pil_crop)
+    bgr = cv.cvtColor(rgb, cv.COLOR_RGB2BGR)
+    gray = cv.cvtColor(bgr, cv.COLOR_BGR2GRAY)
+    _, bw = cv.threshold(gray, 0, 255, cv.THRESH_BINARY | cv.THRESH_OTSU)
+    # PIL buffers live outside the Python allocator, count them from their size
+    allocated = rgb_full.nbytes * 2 + rgb.nbytes * 2 + bgr.nbytes + gray.nbytes + bw.nbytes
+    return bw, allocated
+
+
+def native_pipeline(frame: np.ndarray, region: tuple, preprocess: Preprocess = GRAY) -> tuple[np.ndarray, int]:
+    x0, y0, x1, y1 = region
+    bw = preprocess.apply(frame[y0:y1, x0:x1])
+    return bw, bw.nbytes
+
+
+def measure(func, frame: np.ndarray, region: tuple, iterations: int) -> dict:
+    func(frame, region) # Warm-up
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(frame, region)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    _, allocated = func(frame, region)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    return {
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "allocated_kb": round(allocated / 1024, 1),
+        "traced_peak_kb": round(peak / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR preprocessing cost per call, old PIL path vs NumPy views.")
+    parser.add_argument("--frame", help=f"Screenshot ({RESOLUTION}) to crop from instead of a synthetic frame")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--output", help="Write results JSON to this file")
+    args = parser.parse_args()
+
+    regions = bot_regions()
+    if args.frame:
+        frame = cv.imread(args.frame, cv.IMREAD_UNCHANGED)
+        if frame is None:
+            raise SystemExit(f"Frame not found: {args.frame}")
+        if frame.shape[2] == 3:
+            frame = cv.cvtColor(frame, cv.COLOR_BGR2BGRA)
+    else:
+        frame = synthetic_frame(regions)
+
+    report = {}
+    for name, region in regions.items():
+        legacy_bw, _ = legacy_pipeline(frame, region)
+        native_bw, _ = native_pipeline(frame, region)
+        report[name] = {
+            "legacy": measure(legacy_pipeline, frame, region, args.iterations),
+            "native": measure(native_pipeline, frame, region, args.iterations),
+            "identical_output": bool(np.array_equal(legacy_bw, native_bw)),
+        }
+
+    for name, r in report.items():
+        legacy, native = r["legacy"], r["native"]
+        speedup = legacy["mean_ms"] / native["mean_ms"] if native["mean_ms"] else float("inf")
+        print(f"{name:<7} legacy {legacy['mean_ms']:>8.3f} ms {legacy['allocated_kb']:>9.1f} KB   "
+              f"native {native['mean_ms']:>7.3f} ms {native['allocated_kb']:>7.1f} KB   "
+              f"x{speedup:.1f}   same output: {r['identical_output']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Item icon loading through the thumbnail cache against the local stand-in image server:
+cold prefetch of a filter's items, a warm session (new cache on the same directory) and
+eviction under a small size bound. Asserts that warm lookups never reach the server.
+
+    python -m benchmarks.thumbnails --items 300 --latency 0.02
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+
+from simulation.image_server import StandInImageServer
+from utils.items import load_bot_items
+from utils.thumbnails import ThumbnailCache, ThumbnailPrefetcher
+
+
+def item_names(count: int) -> list[str]:
+    names = [uid for uid, _, _, _ in load_bot_items()["entries"]]
+    if not names:
+        names = [f"T{t}_ITEM_{i}@{e}" for i in range(count) for t in range(4, 9) for e in range(4)]
+    return names[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Thumbnail cache cold/warm timing against a local image server.")
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the stand-in server takes per image")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    args = parser.parse_args()
+
+    names = item_names(args.items)
+    report = {"items": len(names)}
+    failures = []
+    with tempfile.TemporaryDirectory() as directory, StandInImageServer(latency=args.latency, missing={names[-1]}) as server:
+        # Cold: everything comes from the server, in the background
+        cache = ThumbnailCache(directory, base_url=server.url)
+        ready = []
+        prefetcher = ThumbnailPrefetcher(cache, on_ready=lambda name, path: ready.append(name))
+        start = time.perf_counter()
+        prefetcher.prefetch(names, limit=len(names))
+        prefetcher.wait_idle(timeout=120)
+        report["cold_prefetch_s"] = round(time.perf_counter() - start, 3)
+        report["cold_requests"] = server.requests
+        report["downloaded"] = len(ready)
+        report["blobs"] = cache.stats()["blobs"]
+        prefetcher.close()
+
+        # Warm: a new session on the same directory, lookups stay local
+        requests_before = server.requests
+        start = time.perf_counter()
+        cache = ThumbnailCache(directory, base_url=server.url)
+        report["index_load_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        timings = []
+        for name in names[:-1]:
+            t = time.perf_counter()
+            if cache.path(name) is None:
+                failures.append(f"{name} not cached after prefetch")
+            timings.append(time.perf_counter() - t)
+        report["warm_lookup_us"] = round(statistics.median(timings) * 1e6, 2)
+        if server.requests != requests_before:
+            failures.append(f"warm session made {server.requests - requests_before} requests")
+        if cache.fetch(names[-1]) is not None:
+            failures.append("missing image was cached")
+
+        # Bounded: room for about a third of the blobs, oldest names evicted first
+        bound = max(1, cache.total_bytes // 3)
+        small = ThumbnailCache(directory + "/bounded", base_url=server.url, max_bytes=bound)
+        for name in names[:-1]:
+            small.fetch(name)
+        report["bounded"] = small.stats()
+        if small.total_bytes > bound:
+            failures.append(f"bounded cache holds {small.total_bytes} > {bound} bytes")
+        if names[-2] not in small:
+            failures.append("most recent item was evicted")
+
+    for key, value in report.items():
+        print(f"{key:<18} {value}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({**report, "failures": failures}, f, indent=2)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
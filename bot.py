@@ -1,39 +1,91 @@
-from managers.market import MarketManager
-from core.capture import WindowCapture
-from net.sniffer import AlbionSniffer
-from database.interface import DatabaseInterface
 from managers.config_manager import ConfigManager, PRESETS_DIR
+from managers.search_planner import SearchPlanner, SearchGroup
 from utils.helper import ITEMS_BLACK_MARKET
+from utils.items import ItemCatalog
+from utils.tracing import TRACER, span, traced
+from utils.metrics import METRICS
 import os
-import re
 import json
 import threading
+import time
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # cv2, scapy and SQLAlchemy take most of the startup time, they are imported when the bot is built
+    from core.capture import WindowCapture
+    from database.interface import DatabaseInterface
+    from managers.market import MarketManager
+    from net.sniffer import AlbionSniffer
+
+# A response is complete once no order has been added for this long (orders are appended one by one)
+MARKET_DATA_QUIET = 0.05 # s
 
 class TradeBot:
-    def __init__(self, capture: WindowCapture = None, sniffer: AlbionSniffer = None, market_manager: MarketManager = None, db: DatabaseInterface = None):
+    def __init__(self, capture: "WindowCapture" = None, sniffer: "AlbionSniffer" = None, market_manager: "MarketManager" = None, db: "DatabaseInterface" = None, config_manager: ConfigManager = None):
         BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-        self.config_manager = ConfigManager()
+        if config_manager == None:
+            config_manager = ConfigManager()
+        self.config_manager = config_manager
+        self.catalog = ItemCatalog()
+        self.search_planner = SearchPlanner(self.catalog)
 
         if capture == None:
-            capture = WindowCapture(base_dir=BASE_DIR, window_name="Albion Online Client")
+            from core.capture import WindowCapture
+            capture = WindowCapture(base_dir=BASE_DIR, window_name="Albion Online Client", use_print_window=bool(self.config_manager.get("capture_print_window")))
         self.capture = capture
         capture.set_foreground_window()
 
         if market_manager == None:
-            market_manager = MarketManager(capture=capture)
+            from core.input import create_input_sender
+            from managers.market import MarketManager
+            input_sender = create_input_sender(self.config_manager.get("input_backend"), float(self.config_manager.get("input_action_gap") or 0.05))
+            market_manager = MarketManager(capture=capture, input_sender=input_sender)
         self.market_manager = market_manager
+        self.timing = market_manager.timing
 
         if db == None:
+            from database.interface import DatabaseInterface
             db = DatabaseInterface()
         self.db = db
 
         if sniffer == None:
+            from net.sniffer import AlbionSniffer
             sniffer = AlbionSniffer()
         self.sniffer = sniffer
+        self.cancelled = threading.Event() # Checked between items and inside waits, set by cancel()
+        self.is_shut_down = False
+        self._shutdown_lock = threading.Lock() # Window close and disconnect can both call shutdown()
         self.sniffer_thread = threading.Thread(target=self.sniffer.start, daemon=True)
         self.sniffer_thread.start()   
 
+        # Latency histograms: Prometheus text on localhost and a periodic JSON dump
+        metrics_port = self.config_manager.get("metrics_port")
+        if metrics_port:
+            TRACER.serve(int(metrics_port))
+        metrics_export_file = self.config_manager.get("metrics_export_file")
+        if metrics_export_file:
+            TRACER.start_file_export(metrics_export_file)
+
+    def cancel(self) -> None:
+        """
+        Stops the running check_price / buy_items loop after the current item. Stays set until whoever
+        starts the next run clears it (JobScheduler does), so a cancel during the run's first UI steps is kept.
+        """
+        self.cancelled.set()
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Cancels, stops the sniffer and closes the database after its queued writes are flushed. Runs once."""
+        with self._shutdown_lock:
+            if self.is_shut_down:
+                return
+            self.is_shut_down = True
+        self.cancel()
+        self.sniffer.stop()
+        self.sniffer_thread.join(timeout)
+        self.db.close(timeout)
+        self.timing.save()
+
     def load_preset_items(self, setting_key):
         """Loads items list from the preset file defined in settings."""
         preset_file = self.config_manager.get(setting_key)
@@ -54,24 +106,8 @@ class TradeBot:
             return []
 
     def parse_item_info(self, full_unique_name):
-        if "@" in full_unique_name:
-            parts = full_unique_name.split("@")
-            base_with_tier = parts[0]
-            try: enchant = int(parts[1])
-            except: enchant = 0
-        else:
-            base_with_tier = full_unique_name
-            enchant = 0
-
-        match = re.match(r"(T\d+)_(.+)", base_with_tier)
-        if match:
-            tier = match.group(1)
-            base_name = match.group(2)
-        else:
-            tier = "TX"
-            base_name = base_with_tier
-
-        return base_name, tier, enchant
+        key = self.catalog.get(full_unique_name)
+        return key.base_name, key.tier_label, key.enchant
 
     def check_price(self, isBlackMarket=True):
         self.capture.set_foreground_window()
@@ -90,59 +126,108 @@ class TradeBot:
         self.market_manager.change_tab("buy")
 
         try:
-            for item in items_to_check:
-                self.sniffer.clear_buffer()
-                
-                if isBlackMarket:
+            if isBlackMarket:
+                for item in items_to_check:
+                    if self.cancelled.is_set(): break
                     # Search using the name directly (item is the value from dictionary)
-                    self.market_manager.search_item(item, black_market=True)
-                else:
-                    # Search using the unique name (item is the key/id from preset)
-                    self.market_manager.search_item(item, from_db=True, black_market=False)
-                    
-                self.market_manager.sleep(.3)
-                self.market_manager.check_pages()
-
-                current_market_orders = self.sniffer.market_data_buffer
-                if not current_market_orders:
-                    # Use item as the identifier in the log
-                    print(f"No market data captured for: {item}")
-
-                found_prices = {}
-                
-                for order in current_market_orders:
-                    quality = order.get('QualityLevel', 1)
-                    if quality > 3: continue
-
-                    full_name = order.get('ItemTypeId', 'Unknown')
-                    base_name, tier, enchant = self.parse_item_info(full_name)
-                    raw_price = order.get('UnitPriceSilver', 0)
-                    real_price = order.get('unit_price_real', raw_price)
-
-                    key = (base_name, tier, enchant)
-                    if key not in found_prices: 
-                        found_prices[key] = real_price
-                    else:
-                        if real_price > found_prices[key]:
-                            found_prices[key] = real_price
-
-                if found_prices:
-                    db_payload = []
-                    for (base, tier, enc), price in found_prices.items():
-                        if enc > 0: unique_name = f"{tier}_{base}@{enc}"
-                        else: unique_name = f"{tier}_{base}"
-
-                        item_data = {
-                            'unique_name': unique_name,
-                            'price_black_market': int(price),
-                            'black_market_updated_at': datetime.now(timezone.utc)
-                        }
-                        db_payload.append(item_data)
-
-                    if db_payload:
-                        self.db.update_item_prices(db_payload)
+                    self.search_and_save_prices(item, item)
+            else:
+                # One search per base item covers all its tiers/enchants,
+                # variants that got no orders are searched individually afterwards
+                plan = self.search_planner.plan(items_to_check)
+                print(f"Planned {len(plan)} searches for {len(items_to_check)} items.")
+                for group in plan:
+                    if self.cancelled.is_set(): break
+                    self.check_price_group(group)
+            if self.cancelled.is_set():
+                print("Price check cancelled.")
         except KeyboardInterrupt:
             print("Stopping bot...")
+        finally:
+            self.timing.save()
+            METRICS.set("bot.step", "Idle")
+
+    def check_price_group(self, group: SearchGroup) -> None:
+        found_prices = self.search_and_save_prices(group.search_text, group.search_text)
+        if group.is_batched:
+            for key in self.search_planner.missing(group, found_prices):
+                if self.cancelled.is_set(): return
+                self.search_and_save_prices(key.search_text, key.unique_name)
+
+    @traced("bot.price_search")
+    def search_and_save_prices(self, search_text: str, label: str) -> dict:
+        """Runs one market search (with pagination) and stores the best Black Market price per item seen."""
+        METRICS.set("bot.step", f"Price check: {label}")
+        METRICS.add("bot.items")
+        self.sniffer.clear_buffer()
+        self.market_manager.search_text(search_text)
+        self.wait_for_market_data("sniffer.search")
+        self.market_manager.check_pages()
+
+        current_market_orders = list(self.sniffer.market_data_buffer)
+        if not current_market_orders:
+            # Use item as the identifier in the log
+            print(f"No market data captured for: {label}")
+            self.capture.report_anomaly("no_data", label)
+
+        found_prices = self.collect_prices(current_market_orders)
+        self.save_black_market_prices(found_prices)
+        return found_prices
+
+    def wait_for_market_data(self, key: str, default: float = .3) -> bool:
+        """
+        Waits until the sniffer has buffered a complete response: market orders arrived and none was added
+        for MARKET_DATA_QUIET. Bounded by what the timing profile allows for 'key'. The time until the last
+        order feeds the profile, so the limit follows the network's real latency.
+        """
+        timeout = self.timing.delay(key, default)
+        start = time.perf_counter()
+        count, last_change = 0, start
+        with span("sniffer.wait"):
+            while not self.cancelled.is_set():
+                now = time.perf_counter()
+                current = len(self.sniffer.market_data_buffer)
+                if current != count:
+                    count, last_change = current, now
+                elif count and now - last_change >= MARKET_DATA_QUIET:
+                    break
+                if now - start >= timeout:
+                    break
+                time.sleep(0.01)
+        arrived = count > 0
+        if arrived or not self.cancelled.is_set(): # A cancelled wait says nothing about the latency
+            self.timing.observe(key, (last_change if arrived else time.perf_counter()) - start, ok=arrived)
+        return arrived
+
+    def collect_prices(self, orders: list) -> dict:
+        found_prices = {}
+        for order in orders:
+            quality = order.get('QualityLevel', 1)
+            if quality > 3: continue
+
+            key = self.catalog.get(order.get('ItemTypeId', 'Unknown'))
+            raw_price = order.get('UnitPriceSilver', 0)
+            real_price = order.get('unit_price_real', raw_price)
+
+            if key not in found_prices: 
+                found_prices[key] = real_price
+            else:
+                if real_price > found_prices[key]:
+                    found_prices[key] = real_price
+        return found_prices
+
+    def save_black_market_prices(self, found_prices: dict) -> None:
+        if not found_prices:
+            return
+        db_payload = []
+        for key, price in found_prices.items():
+            item_data = {
+                'unique_name': key.unique_name,
+                'price_black_market': int(price),
+                'black_market_updated_at': datetime.now(timezone.utc)
+            }
+            db_payload.append(item_data)
+        self.db.update_item_prices(db_payload)
 
     def buy_items(self, fast_buy: bool = False):
         self.capture.set_foreground_window()
@@ -157,82 +242,99 @@ class TradeBot:
             
         try:
             for item_unique_name in items_to_buy_list:
-                # Logic assumes item_unique_name is the base T-level item? 
-                # Adjust if your preset contains full names like T4_BAG
-                # If preset has "BAG", use "T8_"+... logic. 
-                # Assuming preset has FULL Unique Names now:
+                if self.cancelled.is_set():
+                    print("Buy routine cancelled.")
+                    break
+                self.buy_item_if_profitable(item_unique_name, items_prices, fast_buy)
+        except KeyboardInterrupt:
+            print("Stopping bot...")
+        finally:
+            self.timing.save()
+            METRICS.set("bot.step", "Idle")
+
+    @traced("bot.buy_cycle")
+    def buy_item_if_profitable(self, item_unique_name: str, items_prices: dict, fast_buy: bool = False):
+        """Opens one item on the Create Buy Order tab and places an order when the Black Market margin allows it."""
+        # Logic assumes item_unique_name is the base T-level item? 
+        # Adjust if your preset contains full names like T4_BAG
+        # If preset has "BAG", use "T8_"+... logic. 
+        # Assuming preset has FULL Unique Names now:
+        METRICS.set("bot.step", f"Buy: {item_unique_name}")
+        METRICS.add("bot.items")
+        self.market_manager.search_item(item_unique_name, from_db=True)
+        self.sniffer.clear_buffer()
+        self.market_manager.open_item()
+        self.wait_for_market_data("sniffer.order")
+
+        current_market_orders = list(self.sniffer.market_data_buffer) # The sniffer may still append to it
+        if not current_market_orders:
+            print(f"No data: {item_unique_name}")
+            self.capture.report_anomaly("no_data", item_unique_name)
+
+        lowest_price = float('inf')
+        order_price = 0
+        
+        for order in current_market_orders:
+            if order.get('AuctionType') == 'offer':
+                price = order.get('UnitPriceSilver', 0) / 10000
+                quality = order.get('QualityLevel', 0)
                 
-                self.market_manager.search_item(item_unique_name, from_db=True)
-                self.sniffer.clear_buffer()
-                self.market_manager.open_item()
-                self.market_manager.sleep(.3)
+                if price < lowest_price and price > 0:
+                    lowest_price = price
+        
+        for order in current_market_orders:
+            if order.get('AuctionType') == 'request':
+                price = order.get('UnitPriceSilver', 0) / 10000
+                quality = order.get('QualityLevel', 0)
 
-                current_market_orders = self.sniffer.market_data_buffer
-                if not current_market_orders:
-                    print(f"No data: {item_unique_name}")
+                if price > order_price and price > 0:
+                    order_price = price
 
-                lowest_price = float('inf')
-                order_price = 0
-                
-                for order in current_market_orders:
-                    if order.get('AuctionType') == 'offer':
-                        price = order.get('UnitPriceSilver', 0) / 10000
-                        quality = order.get('QualityLevel', 0)
-                        
-                        if price < lowest_price and price > 0:
-                            lowest_price = price
-                
-                for order in current_market_orders:
-                    if order.get('AuctionType') == 'request':
-                        price = order.get('UnitPriceSilver', 0) / 10000
-                        quality = order.get('QualityLevel', 0)
+        if fast_buy == False:
+            lowest_price = order_price
 
-                        if price > order_price and price > 0:
-                            order_price = price
+        print(f"Lowest Price for {item_unique_name}: {lowest_price}")
 
-                if fast_buy == False:
-                    lowest_price = order_price
+        # 1. Get Black Market price from the database
+        if item_unique_name not in items_prices:
+            print(f"No Black Market price for {item_unique_name}. Skipping.")
+            self.market_manager.close_item()
+            return
+        black_market_price = items_prices[item_unique_name] / 10000
 
-                print(f"Lowest Price for {item_unique_name}: {lowest_price}")
+        # 2. Get minimum profit rate from settings
+        min_profit_rate = self.config_manager.get("min_profit_rate") or 0.0
 
-                # 1. Get Black Market price from the database
-                black_market_price = items_prices[item_unique_name] / 10000
+        
 
-                # 2. Get minimum profit rate from settings
-                min_profit_rate = self.config_manager.get("min_profit_rate") or 0.0
+        potential_sell_price = black_market_price * 0.96 
+        profit = potential_sell_price - lowest_price
+        profit_margin = (profit / lowest_price) * 100 if lowest_price > 0 else 0
 
-                
-
-                potential_sell_price = black_market_price * 0.96 
-                profit = potential_sell_price - lowest_price
-                profit_margin = (profit / lowest_price) * 100 if lowest_price > 0 else 0
-
-                # 4. Compare and print success
-                if profit_margin >= min_profit_rate:
-                    # --- Determine Quantity to Buy based on price ---
-                    buy_quantities_config = self.config_manager.get("buy_quantities_by_price") or {}
-                    # Sort price thresholds from smallest to largest
-                    sorted_thresholds = sorted([int(k) for k in buy_quantities_config.keys()])
-                    
-                    quantity_to_buy = 0
-                    # Find the right quantity for the current price
-                    for threshold in sorted_thresholds:
-                        if lowest_price < threshold:
-                            quantity_to_buy = buy_quantities_config[str(threshold)]
-                            break
-                    
-                    if quantity_to_buy > 0:
-                        print(f"Profitable trade for {item_unique_name}! Price: {lowest_price}, Margin: {profit_margin:.2f}%. Buying {quantity_to_buy} units.")
-                        # Assuming buy_item can take a quantity. If not, this needs to be implemented in MarketManager.
-                        self.market_manager.buy_item(amount=quantity_to_buy) 
-                    else:
-                        print(f"Item {item_unique_name} is profitable, but its price ({lowest_price}) is above all configured buying thresholds. Skipping.")
-                        self.market_manager.close_item()
-                else:
-                    print(f"Item {item_unique_name} not profitable enough. Margin: {profit_margin:.2f}%, Required: {min_profit_rate}%. Skipping.")
-                    self.market_manager.close_item()
-        except KeyboardInterrupt:
-            print("Stopping bot...")
+        # 4. Compare and print success
+        if profit_margin >= min_profit_rate:
+            # --- Determine Quantity to Buy based on price ---
+            buy_quantities_config = self.config_manager.get("buy_quantities_by_price") or {}
+            # Sort price thresholds from smallest to largest
+            sorted_thresholds = sorted([int(k) for k in buy_quantities_config.keys()])
+            
+            quantity_to_buy = 0
+            # Find the right quantity for the current price
+            for threshold in sorted_thresholds:
+                if lowest_price < threshold:
+                    quantity_to_buy = buy_quantities_config[str(threshold)]
+                    break
+            
+            if quantity_to_buy > 0:
+                print(f"Profitable trade for {item_unique_name}! Price: {lowest_price}, Margin: {profit_margin:.2f}%. Buying {quantity_to_buy} units.")
+                # Assuming buy_item can take a quantity. If not, this needs to be implemented in MarketManager.
+                self.market_manager.buy_item(amount=quantity_to_buy) 
+            else:
+                print(f"Item {item_unique_name} is profitable, but its price ({lowest_price}) is above all configured buying thresholds. Skipping.")
+                self.market_manager.close_item()
+        else:
+            print(f"Item {item_unique_name} not profitable enough. Margin: {profit_margin:.2f}%, Required: {min_profit_rate}%. Skipping.")
+            self.market_manager.close_item()
 
 if __name__ == "__main__":
     bot = TradeBot()
@@ -0,0 +1,292 @@
+"""
+Headless entry point: runs the sniffer, price checks, buying, pcap replay and benchmarks
+without Flet. Subsystems are imported by the command that needs them, so e.g.
+'cli.py replay' never loads cv2 or SQLAlchemy.
+
+    python cli.py sniff --interface "Ethernet" --stats-interval 10
+    python cli.py check-price --preset "Buy Items Preset.json" --every 30
+    python cli.py buy --city lymhurst --preset TestFort.json
+    python cli.py replay capture.pcap --orders-out orders.json
+    python cli.py bench import_time -- --runs 3
+    python cli.py --json sniff        # one JSON object per line on stdout, logs on stderr
+
+Exit codes: 0 done, 1 failed, 2 bad arguments, 3 precondition not met (wrong market, missing preset),
+130 stopped by a signal (after a graceful shutdown).
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_PRECONDITION = 3
+EXIT_INTERRUPTED = 130
+BENCHMARKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+
+
+class Output:
+    """Events for whoever runs the CLI: 'key=value' lines, or JSON lines with --json (logs then go to stderr)."""
+    def __init__(self, as_json: bool = False):
+        self.as_json = as_json
+        self.stream = sys.stdout
+        if as_json:
+            sys.stdout = sys.stderr # print() from the bot must not mix with the JSON stream
+
+    def emit(self, event: str, **fields) -> None:
+        if self.as_json:
+            line = json.dumps({"event": event, "time": round(time.time(), 3), **fields}, default=str)
+        else:
+            line = event + "".join(f" {key}={value}" for key, value in fields.items())
+        self.stream.write(line + "\n")
+        self.stream.flush()
+
+
+class Shutdown:
+    """
+    SIGINT/SIGTERM (and SIGBREAK on Windows) set 'event' and run the callbacks, so loops finish
+    their current step and the DB queue gets flushed. A second signal stops immediately.
+    """
+    def __init__(self, out: Output):
+        self.out = out
+        self.event = threading.Event()
+        self.callbacks = []
+        self._install(self._handle)
+
+    @staticmethod
+    def _install(handler) -> None:
+        for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), handler)
+
+    def interrupt_immediately(self) -> None:
+        """For commands with nothing to wind down: any of the signals raises KeyboardInterrupt right away."""
+        self._install(signal.default_int_handler)
+
+    def on_stop(self, callback) -> None:
+        self.callbacks.append(callback)
+
+    def _handle(self, signum, frame):
+        if self.event.is_set():
+            raise KeyboardInterrupt
+        self.event.set()
+        self.out.emit("stopping", signal=signal.Signals(signum).name)
+        for callback in self.callbacks:
+            callback()
+
+    @property
+    def requested(self) -> bool:
+        return self.event.is_set()
+
+
+# --- Commands ---
+
+def cmd_sniff(args, out: Output, shutdown: Shutdown) -> int:
+    from database.interface import DatabaseInterface
+    from net.sniffer import AlbionSniffer
+    from utils.metrics import METRICS
+
+    db = DatabaseInterface() if not args.no_db else None
+    sniffer = AlbionSniffer(db_interface=db)
+    thread = threading.Thread(target=sniffer.start, kwargs={"interface": args.interface}, daemon=True)
+    shutdown.on_stop(sniffer.stop)
+    thread.start()
+    out.emit("started", command="sniff", interface=args.interface or "default", db=db is not None)
+
+    deadline = time.monotonic() + args.duration if args.duration else None
+    sampler = METRICS.sampler(args.stats_interval) # Rates over each stats interval
+    sampler.rates()
+    while not shutdown.requested and thread.is_alive():
+        timeout = args.stats_interval if deadline is None else min(args.stats_interval, deadline - time.monotonic())
+        if timeout <= 0 or shutdown.event.wait(timeout):
+            break
+        sample = METRICS.sample(sampler)
+        out.emit("stats", **{name.replace(".", "_") + "_per_s": round(rate, 2) for name, rate in sample["rates"].items()},
+                 db_queue=sample["gauges"].get("db.queue_depth"))
+
+    sniffer.stop()
+    thread.join(5)
+    flushed = db.close() if db else True
+    totals = METRICS.totals()
+    out.emit("finished", command="sniff", packets=totals.get("sniffer.packets", 0), orders=totals.get("sniffer.orders", 0), db_flushed=flushed)
+    if not flushed:
+        return EXIT_ERROR
+    return EXIT_INTERRUPTED if shutdown.requested else EXIT_OK
+
+
+def build_bot(out: Output, shutdown: Shutdown):
+    from bot import TradeBot
+    bot = TradeBot()
+    shutdown.on_stop(bot.cancel)
+    out.emit("bot_ready", market=bot.market_manager.get_market_title())
+    return bot
+
+
+def preset_exists(out: Output, preset: str) -> bool:
+    from managers.config_manager import PRESETS_DIR
+    if os.path.exists(os.path.join(PRESETS_DIR, preset)):
+        return True
+    out.emit("error", reason="preset_not_found", preset=preset, presets_dir=PRESETS_DIR)
+    return False
+
+
+def cmd_check_price(args, out: Output, shutdown: Shutdown) -> int:
+    if args.preset and not preset_exists(out, args.preset):
+        return EXIT_PRECONDITION
+    from utils.metrics import METRICS
+    bot = build_bot(out, shutdown)
+    if args.preset:
+        bot.config_manager.settings["check_price_preset"] = args.preset # This run only, not saved
+    try:
+        # bot.cancelled is never cleared here, a signal that came in before or during a run ends it
+        while not shutdown.requested:
+            start = time.perf_counter()
+            items_before = METRICS.totals().get("bot.items", 0)
+            bot.check_price(isBlackMarket=not args.preset)
+            out.emit("check_price", preset=args.preset or "black_market", items=METRICS.totals().get("bot.items", 0) - items_before,
+                     seconds=round(time.perf_counter() - start, 1), cancelled=bot.cancelled.is_set())
+            if not args.every or shutdown.requested or shutdown.event.wait(args.every * 60):
+                break
+    finally:
+        bot.shutdown()
+    out.emit("finished", command="check-price")
+    return EXIT_INTERRUPTED if shutdown.requested else EXIT_OK
+
+
+def cmd_buy(args, out: Output, shutdown: Shutdown) -> int:
+    if args.preset and not preset_exists(out, args.preset):
+        return EXIT_PRECONDITION
+    bot = build_bot(out, shutdown)
+    try:
+        # Travel is manual: the open market must be the requested one
+        market = bot.market_manager.get_market_title()
+        if args.city and market != args.city:
+            out.emit("error", reason="wrong_market", expected=args.city, found=market)
+            return EXIT_PRECONDITION
+        if args.preset:
+            bot.config_manager.settings[f"buy_items_preset_{market}"] = args.preset # This run only, not saved
+        start = time.perf_counter()
+        if not shutdown.requested:
+            bot.buy_items(fast_buy=args.fast)
+        out.emit("finished", command="buy", market=market, seconds=round(time.perf_counter() - start, 1), cancelled=bot.cancelled.is_set())
+    finally:
+        bot.shutdown()
+    return EXIT_INTERRUPTED if shutdown.requested else EXIT_OK
+
+
+def cmd_replay(args, out: Output, shutdown: Shutdown) -> int:
+    """Feeds a capture through the sniffer's packet path, e.g. to check decoder changes against real traffic."""
+    if not os.path.exists(args.pcap):
+        out.emit("error", reason="file_not_found", path=args.pcap)
+        return EXIT_PRECONDITION
+    from scapy.all import PcapReader # scapy.all registers the layers, scapy.utils alone yields Raw packets
+    from net.sniffer import AlbionSniffer
+    from utils.metrics import METRICS
+
+    db = None
+    if args.db:
+        from database.interface import DatabaseInterface
+        db = DatabaseInterface()
+    sniffer = AlbionSniffer(db_interface=db)
+    start = time.perf_counter()
+    read = 0
+    with PcapReader(args.pcap) as reader:
+        for packet in reader:
+            if shutdown.requested:
+                break
+            read += 1
+            sniffer.packet_callback(packet)
+    elapsed = time.perf_counter() - start
+    flushed = db.close() if db else True
+
+    if args.orders_out:
+        with open(args.orders_out, "w", encoding="utf-8") as f:
+            json.dump(sniffer.market_data_buffer, f, indent=2, default=str)
+    totals = METRICS.totals()
+    out.emit("finished", command="replay", packets=read, game_packets=totals.get("sniffer.packets", 0),
+             messages=totals.get("sniffer.messages", 0), orders=len(sniffer.market_data_buffer),
+             seconds=round(elapsed, 3), packets_per_s=round(read / elapsed, 1) if elapsed else None, db_flushed=flushed)
+    if not flushed:
+        return EXIT_ERROR
+    return EXIT_INTERRUPTED if shutdown.requested else EXIT_OK
+
+
+def available_benchmarks() -> list[str]:
+    return sorted(f[:-3] for f in os.listdir(BENCHMARKS_DIR) if f.endswith(".py") and not f.startswith("_"))
+
+
+def cmd_bench(args, out: Output, shutdown: Shutdown) -> int:
+    import runpy
+    shutdown.interrupt_immediately()
+    if args.name not in available_benchmarks():
+        out.emit("error", reason="unknown_benchmark", name=args.name, available=available_benchmarks())
+        return EXIT_USAGE
+    sys.argv = [f"benchmarks.{args.name}", *args.bench_args]
+    start = time.perf_counter()
+    code = EXIT_OK
+    try:
+        runpy.run_module(f"benchmarks.{args.name}", run_name="__main__", alter_sys=True)
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (EXIT_OK if e.code is None else EXIT_ERROR)
+    out.emit("finished", command="bench", name=args.name, exit_code=code, seconds=round(time.perf_counter() - start, 2))
+    return code
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="Albion trade bot without the GUI.")
+    parser.add_argument("--json", action="store_true", help="JSON lines on stdout, logs on stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sniff = commands.add_parser("sniff", help="Capture market data into the database")
+    sniff.add_argument("--interface", help="Capture interface, the system default when omitted")
+    sniff.add_argument("--duration", type=float, help="Stop after this many seconds")
+    sniff.add_argument("--stats-interval", type=float, default=10.0, help="Seconds between stats events")
+    sniff.add_argument("--no-db", action="store_true", help="Decode only, do not write to the database")
+    sniff.set_defaults(func=cmd_sniff)
+
+    check = commands.add_parser("check-price", help="Check Black Market prices (dictionary items, or a preset)")
+    check.add_argument("--preset", help="Preset file in config/presets instead of the Black Market item list")
+    check.add_argument("--every", type=float, help="Repeat every N minutes until stopped")
+    check.set_defaults(func=cmd_check_price)
+
+    buy = commands.add_parser("buy", help="Place buy orders in the open market")
+    buy.add_argument("--city", help="Expected market (e.g. fort_sterling), fails if another one is open")
+    buy.add_argument("--preset", help="Preset file in config/presets, instead of the configured one for the city")
+    buy.add_argument("--fast", action="store_true", help="Check the margin against the lowest sell offer instead of the highest buy order (orders are still placed)")
+    buy.set_defaults(func=cmd_buy)
+
+    replay = commands.add_parser("replay", help="Decode a pcap file through the sniffer")
+    replay.add_argument("pcap")
+    replay.add_argument("--db", action="store_true", help="Write decoded orders and history to the database")
+    replay.add_argument("--orders-out", help="Write the decoded market orders to this JSON file")
+    replay.set_defaults(func=cmd_replay)
+
+    bench = commands.add_parser("bench", help="Run a benchmark from benchmarks/, arguments after '--' are passed on")
+    bench.add_argument("name", help=", ".join(available_benchmarks()))
+    bench.add_argument("bench_args", nargs=argparse.REMAINDER)
+    bench.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if getattr(args, "bench_args", None) and args.bench_args[0] == "--":
+        args.bench_args = args.bench_args[1:]
+    out = Output(args.json)
+    shutdown = Shutdown(out)
+    try:
+        return args.func(args, out, shutdown)
+    except KeyboardInterrupt:
+        out.emit("aborted", command=args.command)
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        out.emit("error", command=args.command, reason=type(e).__name__, detail=str(e))
+        return EXIT_ERROR
+
+
+if __name__ == "__main__":
+    sys.exit(main())
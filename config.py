@@ -1,5 +1,5 @@
 import config
-from utils.helper import MOUSE_POSITIONS, ITEM_DATA, CAPTURE_POSITIONS, ITEMS_TO_BUY, ITEMS_BLACK_MARKET
+from utils.helper import MOUSE_POSITIONS, CAPTURE_POSITIONS, OCR_PREPROCESS, ITEMS_TO_BUY, ITEMS_BLACK_MARKET
 
 # The port Albion uses for main game traffic (UDP)
 GAME_PORT = 5056
@@ -10,7 +10,7 @@ OP_AUCTION_GET_OFFERS = 236
 
 MOUSE_POSITIONS = MOUSE_POSITIONS
 CAPTURE_POSITIONS = CAPTURE_POSITIONS
-ITEM_DATA = ITEM_DATA
+OCR_PREPROCESS = OCR_PREPROCESS
 ITEMS_TO_BUY = ITEMS_TO_BUY
 ITEMS_BLACK_MARKET = ITEMS_BLACK_MARKET
 LANGUAGE = "EN-US"
\ No newline at end of file
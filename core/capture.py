@@ -1,19 +1,236 @@
 import ctypes
 from typing import Optional, Tuple, List
 
-import win32gui
-import win32ui
-import win32con
-import win32api
-import win32process
+try:
+    import win32gui
+    import win32con
+    import win32api
+    import win32process
+except ImportError:
+    # Not on Windows: only captures built on a non-GDI FrameSource (files, NumPy) work
+    win32gui = win32con = win32api = win32process = None
 
 import numpy as np
 import cv2 as cv
 from PIL import Image
-import pytesseract
 
-from pathlib import Path
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+try:
+    # In-process libtesseract bindings, much cheaper per call than the pytesseract subprocess
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+from collections import OrderedDict
+import hashlib
+import os
+import shlex
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.frames import FrameSource, Win32FrameSource
+from core.preprocess import Preprocess, GRAY, COLOR
+from core.debug_recorder import DebugRecorder
+from core.templates import TemplateLibrary, ACCEPT_SCORE, REJECT_SCORE
+from utils.tracing import traced
+
+
+class OcrCache:
+    """
+    Bounded LRU cache of OCR results keyed by a hash of the (binarized) pixels plus the Tesseract config.
+    Static UI regions (market title, stats header) are OCR'd once per session instead of on every read.
+    """
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(img: np.ndarray, config: str, kind: str = "text") -> tuple:
+        digest = hashlib.blake2b(np.ascontiguousarray(img), digest_size=16).digest()
+        return (kind, config, img.shape, digest)
+
+    def get(self, key: tuple):
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, value) -> None:
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses,
+                    "hit_rate": round(self.hits / total, 3) if total else 0.0}
+
+
+class OcrBackend:
+    """Runs Tesseract on a grayscale or RGB uint8 image. image_to_data mirrors pytesseract.Output.DICT."""
+    name = "base"
+
+    def image_to_string(self, img: np.ndarray, config: str = "--psm 6") -> str:
+        raise NotImplementedError
+
+    def image_to_data(self, img: np.ndarray, config: str = "--psm 6") -> dict:
+        raise NotImplementedError
+
+
+class PytesseractBackend(OcrBackend):
+    """Spawns the tesseract executable per call. Always available where Tesseract is installed."""
+    name = "pytesseract"
+
+    def __init__(self):
+        if pytesseract is None:
+            raise RuntimeError("pytesseract is not installed")
+
+    def image_to_string(self, img: np.ndarray, config: str = "--psm 6") -> str:
+        return pytesseract.image_to_string(img, config=config)
+
+    def image_to_data(self, img: np.ndarray, config: str = "--psm 6") -> dict:
+        return pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT, config=config)
+
+
+class TesserocrBackend(OcrBackend):
+    """
+    Persistent libtesseract engines via tesserocr. The language model is loaded once per
+    (thread, config) and reused, so parallel region reads each get their own warm engine.
+    """
+    name = "tesserocr"
+
+    def __init__(self, lang: str = "eng", tessdata_path: Optional[str] = None):
+        if tesserocr is None:
+            raise RuntimeError("tesserocr is not installed")
+        self.lang = lang
+        self.tessdata_path = tessdata_path or os.environ.get("TESSDATA_PREFIX")
+        self._local = threading.local()
+        self._engines = [] # Every engine ever created, so close() can free them from any thread
+        self._lock = threading.Lock()
+
+    def _engine(self, config: str):
+        engines = getattr(self._local, "engines", None)
+        if engines is None:
+            engines = self._local.engines = {}
+        api = engines.get(config)
+        if api is None:
+            psm, variables = self.parse_config(config)
+            kwargs = {"lang": self.lang, "psm": psm}
+            if self.tessdata_path:
+                kwargs["path"] = self.tessdata_path
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+            for name, value in variables.items():
+                api.SetVariable(name, value)
+            engines[config] = api
+            with self._lock:
+                self._engines.append(api)
+        return api
+
+    @staticmethod
+    def parse_config(config: str) -> tuple[int, dict]:
+        """'--psm 6 -c key=value' -> (6, {'key': 'value'}). Other flags are ignored."""
+        psm = 3
+        variables = {}
+        args = shlex.split(config or "")
+        for i, arg in enumerate(args):
+            if arg == "--psm" and i + 1 < len(args):
+                psm = int(args[i + 1])
+            elif arg == "-c" and i + 1 < len(args) and "=" in args[i + 1]:
+                name, value = args[i + 1].split("=", 1)
+                variables[name] = value
+        return psm, variables
+
+    def _set_image(self, api, img: np.ndarray) -> None:
+        img = np.ascontiguousarray(img)
+        bytes_per_pixel = 1 if img.ndim == 2 else img.shape[2]
+        height, width = img.shape[:2]
+        api.SetImageBytes(img.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+
+    def image_to_string(self, img: np.ndarray, config: str = "--psm 6") -> str:
+        api = self._engine(config)
+        self._set_image(api, img)
+        return api.GetUTF8Text()
+
+    def image_to_data(self, img: np.ndarray, config: str = "--psm 6") -> dict:
+        api = self._engine(config)
+        self._set_image(api, img)
+        api.Recognize()
+        data = {"text": [], "left": [], "top": [], "width": [], "height": [], "conf": []}
+        iterator = api.GetIterator()
+        level = tesserocr.RIL.WORD
+        if iterator is None:
+            return data
+        for word in tesserocr.iterate_level(iterator, level):
+            box = word.BoundingBox(level)
+            if box is None:
+                continue
+            x1, y1, x2, y2 = box
+            data["text"].append(word.GetUTF8Text(level) or "")
+            data["left"].append(x1)
+            data["top"].append(y1)
+            data["width"].append(x2 - x1)
+            data["height"].append(y2 - y1)
+            data["conf"].append(word.Confidence(level))
+        return data
+
+    def close(self) -> None:
+        with self._lock:
+            for api in self._engines:
+                api.End()
+            self._engines.clear()
+
+
+_default_backend = None
+_default_backend_lock = threading.Lock()
+
+def get_ocr_backend(name: Optional[str] = None) -> OcrBackend:
+    """
+    Shared OCR backend: tesserocr when installed, pytesseract otherwise.
+    'name' ("tesserocr" / "pytesseract") forces one, e.g. for benchmarks.
+    """
+    global _default_backend
+    if name == "pytesseract":
+        return PytesseractBackend()
+    if name == "tesserocr":
+        return TesserocrBackend()
+
+    with _default_backend_lock:
+        if _default_backend is None:
+            try:
+                _default_backend = TesserocrBackend()
+            except Exception as e:
+                if tesserocr is not None:
+                    print(f"[OCR] tesserocr unavailable ({e}), using pytesseract.")
+                _default_backend = PytesseractBackend()
+        return _default_backend
+
+
+_ocr_pool = None
+
+def get_ocr_pool() -> ThreadPoolExecutor:
+    """Small shared pool for OCR of several regions at once. Tesseract releases the GIL while it works."""
+    global _ocr_pool
+    with _default_backend_lock:
+        if _ocr_pool is None:
+            _ocr_pool = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="ocr")
+        return _ocr_pool
 
 
 class WindowCapture:
@@ -23,73 +240,61 @@ class WindowCapture:
     debugging: bool
     
 
-    def __init__(self, window_name: str, base_dir: Optional[str] = "", debugging=False):
+    def __init__(self, window_name: Optional[str] = None, base_dir: Optional[str] = "", debugging=False, frame_source: Optional[FrameSource] = None, ocr_backend: Optional[OcrBackend] = None, use_print_window: bool = False):
         self.BASE_DIR = base_dir
         self.debugging = debugging
-        ctypes.windll.user32.SetProcessDPIAware()
 
-        self.hwnd = win32gui.FindWindow(None, window_name)
-        if not self.hwnd:
-            raise RuntimeError(f"Window not found: {window_name}")
-
-        left, top, right, bottom = win32gui.GetWindowRect(self.hwnd)
-        self.width = int(right - left)
-        self.height = int(bottom - top)
+        if frame_source is None:
+            ctypes.windll.user32.SetProcessDPIAware()
+            self.hwnd = win32gui.FindWindow(None, window_name)
+            if not self.hwnd:
+                raise RuntimeError(f"Window not found: {window_name}")
+            frame_source = Win32FrameSource(self.hwnd, use_print_window=use_print_window)
+        else:
+            self.hwnd = getattr(frame_source, "hwnd", 0)
+
+        self.frame_source = frame_source
+        self.width = frame_source.width
+        self.height = frame_source.height
+        self.ocr_cache = OcrCache()
+        self._ocr = ocr_backend
+        self._templates = None
+        # Debug frames go to a background recorder, never written on the bot thread
+        self.recorder = DebugRecorder(base_dir) if debugging else None
+
+    @property
+    def ocr(self) -> OcrBackend:
+        # Resolved on first read, captures serving canned text never need Tesseract installed
+        if self._ocr is None:
+            self._ocr = get_ocr_backend()
+        return self._ocr
+
+    @property
+    def templates(self) -> TemplateLibrary:
+        if self._templates is None:
+            self._templates = TemplateLibrary(self.get_window_resolution())
+        return self._templates
+
+    def grab_region(self, region: Optional[Tuple[int, int, int, int]] = None) -> Optional[np.ndarray]:
+        """BGRA pixels of one region (or the whole window). A view into a reused buffer, copy it to keep it."""
+        return self.frame_source.grab(region)
 
     def _capture_np_bgra(self) -> Optional[np.ndarray]:
-        hwndDC = mfcDC = saveDC = saveBitMap = None
-        try:
-            hwndDC = win32gui.GetWindowDC(self.hwnd)
-            if not hwndDC:
-                return None
-
-            mfcDC = win32ui.CreateDCFromHandle(hwndDC)
-            saveDC = mfcDC.CreateCompatibleDC()
-            saveBitMap = win32ui.CreateBitmap()
-            saveBitMap.CreateCompatibleBitmap(mfcDC, self.width, self.height)
-            saveDC.SelectObject(saveBitMap)
-
-            PW_RENDERFULLCONTENT = 0x00000002
-            result = ctypes.windll.user32.PrintWindow(self.hwnd, saveDC.GetSafeHdc(), PW_RENDERFULLCONTENT)
-
-            if result != 1:
-                SRCCOPY = 0x00CC0020
-                saveDC.BitBlt((0, 0), (self.width, self.height), mfcDC, (0, 0), SRCCOPY)
-
-            bmpinfo = saveBitMap.GetInfo()
-            bmpbytes = saveBitMap.GetBitmapBits(True)
-
-            w = bmpinfo["bmWidth"]
-            h = bmpinfo["bmHeight"]
-            arr = np.frombuffer(bmpbytes, dtype=np.uint8)
-            try:
-                arr = arr.reshape((h, w, 4))
-            except ValueError:
-                return None
+        return self.grab_region()
 
-            return arr
+    def close(self) -> None:
+        self.frame_source.close()
+        if self.recorder:
+            self.recorder.close()
 
-        finally:
-            try:
-                if saveBitMap:
-                    win32gui.DeleteObject(saveBitMap.GetHandle())
-            except Exception:
-                pass
-            try:
-                if saveDC:
-                    saveDC.DeleteDC()
-            except Exception:
-                pass
-            try:
-                if mfcDC:
-                    mfcDC.DeleteDC()
-            except Exception:
-                pass
-            try:
-                if hwndDC:
-                    win32gui.ReleaseDC(self.hwnd, hwndDC)
-            except Exception:
-                pass
+    def record_debug(self, img, action: str, region: Optional[Tuple[int, int, int, int]] = None, note: str = "") -> None:
+        if self.recorder:
+            self.recorder.record(img, action, region, note)
+
+    def report_anomaly(self, reason: str, detail: str = "") -> None:
+        """Dumps the recent debug frames (debugging only), e.g. when an expected read or packet did not arrive."""
+        if self.recorder:
+            self.recorder.dump(reason, detail)
 
     @staticmethod
     def _bgra_to_pil_rgb(bgra: np.ndarray) -> Image.Image:
@@ -97,12 +302,6 @@ class WindowCapture:
         rgb = cv.cvtColor(bgra, cv.COLOR_BGRA2RGB)
         return Image.fromarray(rgb)
 
-    @staticmethod
-    def _pil_to_cv_bgr(pil_img: Image.Image) -> np.ndarray:
-        """PIL RGB -> OpenCV BGR ndarray."""
-        rgb = np.array(pil_img, copy=False)
-        return cv.cvtColor(rgb, cv.COLOR_RGB2BGR)
-
     def get_screenshot(
         self,
         x_0_crop: Optional[int] = None,
@@ -110,56 +309,137 @@ class WindowCapture:
         x_1_crop: Optional[int] = None,
         y_1_crop: Optional[int] = None,
     ) -> Optional[Image.Image]:
-        bgra = self._capture_np_bgra()
+        region = None if x_0_crop is None else (x_0_crop, y_0_crop, x_1_crop, y_1_crop)
+        # Only the requested region is captured and converted
+        bgra = self.grab_region(region)
         if bgra is None:
             return None
 
-        pil_img = self._bgra_to_pil_rgb(bgra)
-
-        if x_0_crop is None:
-            if self.debugging == True:
-                self._safe_imwrite(self.BASE_DIR, pil_img)
-            return pil_img
+        if self.debugging == True:
+            self.record_debug(bgra, "screenshot", region)
+        return self._bgra_to_pil_rgb(bgra)
 
-        x0, y0, x1, y1 = int(x_0_crop), int(y_0_crop), int(x_1_crop), int(y_1_crop)
-        x0 = max(0, min(x0, self.width))
-        x1 = max(0, min(x1, self.width))
-        y0 = max(0, min(y0, self.height))
-        y1 = max(0, min(y1, self.height))
-        if x1 <= x0 or y1 <= y0:
+    def preprocess_region(self, region: Optional[Tuple[int, int, int, int]], preprocess: Preprocess = GRAY) -> Optional[np.ndarray]:
+        """Grabs one region and runs the OCR preprocessing on it, without going through PIL."""
+        bgra = self.grab_region(region)
+        if bgra is None:
             return None
+        return preprocess.apply(bgra)
 
-        if self.debugging == True:
-            self._safe_imwrite(self.BASE_DIR, pil_img.crop((x0, y0, x1, y1)))
-
-        return pil_img.crop((x0, y0, x1, y1))
+    def _read_text(self, img: np.ndarray, tesseract_config: str, kind: str = "text") -> str:
+        cache_key = OcrCache.make_key(img, tesseract_config, kind)
+        text = self.ocr_cache.get(cache_key)
+        if text is None:
+            text = self.ocr.image_to_string(img, tesseract_config)
+            self.ocr_cache.put(cache_key, text)
+        return text
 
+    @traced("ocr.text")
     def get_text_from_screenshot(
         self,
         crop_screenshot_positions: Tuple[int, int, int, int],
         is_gray_reading: bool = True,
         lowercase: bool = True,
         tesseract_config: str = "--psm 6",
+        preprocess: Optional[Preprocess] = None,
     ) -> str:
-        pil_img = self.get_screenshot(*crop_screenshot_positions)
-        if pil_img is None:
+        """'preprocess' overrides the default pipeline picked by is_gray_reading (e.g. upscaling for small text)."""
+        preprocess = preprocess or (GRAY if is_gray_reading else COLOR)
+        img = self.preprocess_region(crop_screenshot_positions, preprocess)
+        if img is None:
             return ""
 
-        if is_gray_reading:
-            cv_img = self._pil_to_cv_bgr(pil_img)
-            gray = cv.cvtColor(cv_img, cv.COLOR_BGR2GRAY)
-            _, bw = cv.threshold(gray, 0, 255, cv.THRESH_BINARY | cv.THRESH_OTSU)
-            
-            if self.debugging:
-                self._safe_imwrite(self.BASE_DIR, bw)
-
-            text = pytesseract.image_to_string(bw, config=tesseract_config)
-        else:
-            text = pytesseract.image_to_string(pil_img, config={tesseract_config})
-
-        text = text.rstrip("\n")
+        text = self._read_text(img, tesseract_config, preprocess.kind).rstrip("\n")
+        if self.debugging:
+            self.record_debug(img, "ocr.text", crop_screenshot_positions, text)
         return text.lower() if lowercase else text
 
+    def _timed_read(self, img: np.ndarray, tesseract_config: str, kind: str) -> tuple[str, float]:
+        start = time.perf_counter()
+        text = self._read_text(img, tesseract_config, kind)
+        return text, (time.perf_counter() - start) * 1000
+
+    @traced("ocr.batch")
+    def read_regions(
+        self,
+        regions: dict,
+        lowercase: bool = True,
+        tesseract_config: str = "--psm 6",
+        preprocess: Optional[dict] = None,
+    ) -> dict:
+        """
+        Reads several regions of the same UI state: one grab of their bounding box, each region cropped
+        as a view of it, OCR run in parallel on the shared pool.
+        regions: {name: (x0, y0, x1, y1)}, preprocess: optional {name: Preprocess}.
+        Returns {name: {"text": str, "ms": OCR time of that region}}.
+        """
+        preprocess = preprocess or {}
+        results = {name: {"text": "", "ms": 0.0} for name in regions}
+        bounds = self.frame_source.clamp((
+            min(r[0] for r in regions.values()), min(r[1] for r in regions.values()),
+            max(r[2] for r in regions.values()), max(r[3] for r in regions.values()),
+        )) if regions else None
+        frame = self.grab_region(bounds) if bounds else None
+        if frame is None:
+            return results
+
+        # Preprocessing copies out of the capture buffer before any worker starts, so the next grab cannot race it
+        jobs = {}
+        bx, by = bounds[0], bounds[1]
+        for name, region in regions.items():
+            clamped = self.frame_source.clamp(region)
+            if clamped is None:
+                continue
+            x0, y0, x1, y1 = clamped
+            options = preprocess.get(name) or GRAY
+            img = options.apply(frame[y0 - by:y1 - by, x0 - bx:x1 - bx])
+            if self.debugging:
+                self.record_debug(img, f"ocr.batch.{name}", region)
+            jobs[name] = (img, options.kind)
+
+        pool = get_ocr_pool()
+        futures = {name: pool.submit(self._timed_read, img, tesseract_config, kind) for name, (img, kind) in jobs.items()}
+        for name, future in futures.items():
+            text, ms = future.result()
+            text = text.rstrip("\n")
+            results[name] = {"text": text.lower() if lowercase else text, "ms": round(ms, 3)}
+        return results
+
+    @traced("ocr.match")
+    def match_label(
+        self,
+        crop_screenshot_positions: Tuple[int, int, int, int],
+        expected_text: str,
+        tesseract_config: str = "--psm 6",
+        preprocess: Optional[Preprocess] = None,
+    ) -> bool:
+        """
+        True if the region shows the fixed label 'expected_text'. Decided by template matching when the
+        score is clear, otherwise by OCR; an OCR confirmation stores the crop as the template for next time.
+        """
+        preprocess = preprocess or GRAY
+        bw = self.preprocess_region(crop_screenshot_positions, preprocess)
+        if bw is None:
+            return False
+        name = TemplateLibrary.slug(expected_text)
+        score = self.templates.score(name, bw)
+        if self.debugging:
+            self.record_debug(bw, "ocr.match", crop_screenshot_positions, f"{name} score={score}")
+        if score is not None:
+            if score >= ACCEPT_SCORE:
+                return True
+            if score <= REJECT_SCORE:
+                return False
+
+        matched = self.get_text_from_screenshot(crop_screenshot_positions, tesseract_config=tesseract_config, preprocess=preprocess) == expected_text.lower()
+        if score is not None and matched:
+            # The label is there but its template no longer matches well: UI or resolution drift
+            self.report_anomaly("ocr_mismatch", f"{name} template score {score:.2f}")
+        if matched and score is None:
+            self.templates.save(name, bw)
+        return matched
+
+    @traced("ocr.position")
     def get_text_screen_position(
         self,
         target_text: str,
@@ -169,47 +449,56 @@ class WindowCapture:
         tesseract_config: str = "--psm 6",
         gate_left_gt: Optional[int] = 2200,
         gate_top_lt: Optional[int] = 400,
+        preprocess: Optional[Preprocess] = None,
     ) -> List[int]:
         x, y = 0, 0
-        if search_region:
-            pil_img = self.get_screenshot(*search_region)
-        else:
-            pil_img = self.get_screenshot()
-
-        if pil_img is None:
+        preprocess = preprocess or (GRAY if is_gray_reading else COLOR)
+        data_src = self.preprocess_region(search_region, preprocess)
+        if data_src is None:
             return [x, y]
-
-        cv_img = self._pil_to_cv_bgr(pil_img)
-        data_src = cv_img
-
-        if is_gray_reading:
-            gray = cv.cvtColor(cv_img, cv.COLOR_BGR2GRAY)
-            _, data_src = cv.threshold(gray, 0, 255, cv.THRESH_BINARY | cv.THRESH_OTSU)
-
         if self.debugging:
-            self._safe_imwrite(self.BASE_DIR, cv_img)
+            self.record_debug(data_src, "ocr.position", search_region, target_text)
+
+        x_offset = search_region[0] if search_region else 0
+        y_offset = search_region[1] if search_region else 0
 
-        text_data = pytesseract.image_to_data(
-            data_src, output_type=pytesseract.Output.DICT, config=tesseract_config
-        )
+        def accept(left: int, top: int) -> bool:
+            return (gate_left_gt is None or left > gate_left_gt) and (gate_top_lt is None or top < gate_top_lt)
+
+        # Fast path: a known label/button is located by template, Tesseract only runs when it is not found
+        template_name = TemplateLibrary.slug(target_text)
+        if preprocess.threshold:
+            score, loc = self.templates.locate(template_name, data_src)
+            if score is not None and score >= ACCEPT_SCORE:
+                left, top = preprocess.to_region(*loc)
+                left, top = left + x_offset, top + y_offset
+                if accept(left, top):
+                    return [left + position_offset[0], top + position_offset[1]]
+
+        cache_key = OcrCache.make_key(data_src, tesseract_config, "data_" + preprocess.kind)
+        text_data = self.ocr_cache.get(cache_key)
+        if text_data is None:
+            text_data = self.ocr.image_to_data(data_src, tesseract_config)
+            self.ocr_cache.put(cache_key, text_data)
 
         if not text_data or "text" not in text_data:
             return [x, y]
 
-        x_offset = search_region[0] if search_region else 0
-        y_offset = search_region[1] if search_region else 0
-
         t_lower = target_text.lower()
         for i, word in enumerate(text_data.get("text", [])):
             if not word:
                 continue
             if t_lower in word.lower():
-                left = int(text_data["left"][i]) + x_offset
-                top = int(text_data["top"][i]) + y_offset
+                box_left, box_top = int(text_data["left"][i]), int(text_data["top"][i])
+                left, top = preprocess.to_region(box_left, box_top)
+                left, top = left + x_offset, top + y_offset
 
-                if (gate_left_gt is None or left > gate_left_gt) and (gate_top_lt is None or top < gate_top_lt):
+                if accept(left, top):
                     x = left + position_offset[0]
                     y = top + position_offset[1]
+                    if preprocess.threshold and not self.templates.has(template_name) and word.lower() == t_lower:
+                        box_w, box_h = int(text_data["width"][i]), int(text_data["height"][i])
+                        self.templates.save(template_name, data_src[box_top:box_top + box_h, box_left:box_left + box_w])
                     break
 
         return [x, y]
@@ -247,38 +536,3 @@ class WindowCapture:
     def is_foreground_window(self) -> bool:
         """Checks if the captured window is currently the foreground window."""
         return win32gui.GetForegroundWindow() == self.hwnd
-
-    @staticmethod
-    def _safe_imwrite(path: str, img) -> bool:
-        # Normalize and ensure folder exists
-        p = Path(path+"/debug_image")
-        if p.suffix.lower() not in {".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".tif", ".webp"}:
-            # default to .png if missing/bad extension
-            p = p.with_suffix(".png")
-        if p.parent and not p.parent.exists():
-            p.parent.mkdir(parents=True, exist_ok=True)
-
-        import numpy as np
-        if not isinstance(img, np.ndarray):
-            try:
-                from PIL import Image
-                if isinstance(img, Image.Image):
-                    img = np.array(img)
-                else:
-                    raise TypeError("Unsupported image type for imwrite")
-            except Exception as e:
-                raise TypeError(f"Unsupported image type for imwrite: {type(img)}") from e
-
-        if img.dtype != np.uint8:
-            img = img.astype(np.uint8, copy=False)
-        if not img.flags["C_CONTIGUOUS"]:
-            img = np.ascontiguousarray(img)
-
-        ok = cv.imwrite(str(p), img)
-        if not ok:
-            raise IOError(
-                f"cv.imwrite failed for '{p}'. "
-                "Check write permissions and that the image has a valid shape "
-                "(HxW, HxWx3/BGR, or HxWx4/BGRA) and dtype=uint8."
-            )
-        return True
\ No newline at end of file
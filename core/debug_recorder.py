@@ -0,0 +1,159 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import cv2 as cv
+
+DEBUG_IMAGE = "debug_image.png"
+ANOMALY_DIR = "debug_anomalies"
+
+def write_image(path: str, img) -> bool:
+    """cv.imwrite for ndarrays and PIL images, creating the folder first."""
+    p = Path(path)
+    if p.suffix.lower() not in {".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".tif", ".webp"}:
+        # default to .png if missing/bad extension
+        p = p.with_suffix(".png")
+    if p.parent and not p.parent.exists():
+        p.parent.mkdir(parents=True, exist_ok=True)
+
+    if not isinstance(img, np.ndarray):
+        try:
+            from PIL import Image
+            if isinstance(img, Image.Image):
+                img = np.array(img)
+            else:
+                raise TypeError("Unsupported image type for imwrite")
+        except Exception as e:
+            raise TypeError(f"Unsupported image type for imwrite: {type(img)}") from e
+
+    if img.dtype != np.uint8:
+        img = img.astype(np.uint8, copy=False)
+    if not img.flags["C_CONTIGUOUS"]:
+        img = np.ascontiguousarray(img)
+
+    ok = cv.imwrite(str(p), img)
+    if not ok:
+        raise IOError(
+            f"cv.imwrite failed for '{p}'. "
+            "Check write permissions and that the image has a valid shape "
+            "(HxW, HxWx3/BGR, or HxWx4/BGRA) and dtype=uint8."
+        )
+    return True
+
+
+class DebugFrame:
+    __slots__ = ("timestamp", "action", "region", "image", "note")
+
+    def __init__(self, image: np.ndarray, action: str, region: Optional[Tuple[int, int, int, int]], note: str):
+        self.timestamp = time.time()
+        self.image = image
+        self.action = action
+        self.region = tuple(region) if region else None
+        self.note = note
+
+    def meta(self) -> dict:
+        return {"timestamp": self.timestamp, "action": self.action, "region": self.region,
+                "shape": list(self.image.shape), "note": self.note}
+
+
+class DebugRecorder:
+    """
+    Keeps the last 'capacity' debug frames (copies, with the action and region that produced them) in memory.
+    A background thread refreshes debug_image.png at most 'max_writes_per_second' times and, on dump(),
+    writes the whole ring plus a meta.json to debug_anomalies/<time>_<reason>/. The bot thread only copies
+    the frame into the ring, so debugging can stay on without slowing reads down.
+    """
+    def __init__(self, base_dir: str = "", capacity: int = 50, max_writes_per_second: float = 2.0, dump_cooldown: float = 30.0):
+        self.base_dir = base_dir
+        self.ring = deque(maxlen=capacity)
+        self.write_interval = 1.0 / max_writes_per_second if max_writes_per_second > 0 else 0.0
+        self.dump_cooldown = dump_cooldown
+        self.dropped = 0 # Latest-frame writes skipped by the rate limit
+        self.dumps_written = 0
+
+        self._latest = None
+        self._pending_dumps = deque()
+        self._last_write = 0.0
+        self._last_dump = {}
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name="DebugRecorder", daemon=True)
+        self._thread.start()
+
+    def record(self, image, action: str, region: Optional[Tuple[int, int, int, int]] = None, note: str = "") -> None:
+        if not isinstance(image, np.ndarray):
+            image = np.asarray(image)
+        # Capture buffers are reused by the next grab, the ring needs its own copy
+        frame = DebugFrame(image.copy(), action, region, note)
+        with self._cond:
+            self.ring.append(frame)
+            if self._latest is not None:
+                self.dropped += 1
+            self._latest = frame
+            self._cond.notify()
+
+    def dump(self, reason: str, detail: str = "") -> Optional[str]:
+        """
+        Queues the current ring for writing. The same reason within dump_cooldown is ignored, so put
+        per-item information in 'detail'. Returns the target folder.
+        """
+        now = time.time()
+        with self._cond:
+            if now - self._last_dump.get(reason, 0.0) < self.dump_cooldown or not self.ring:
+                return None
+            self._last_dump[reason] = now
+            slug = re.sub(r"[^A-Za-z0-9_-]+", "_", reason)[:60]
+            folder = os.path.join(self.base_dir, ANOMALY_DIR, time.strftime("%Y%m%d_%H%M%S") + f"_{slug}")
+            self._pending_dumps.append((folder, reason, detail, list(self.ring)))
+            self._cond.notify()
+        print(f"[Debug] Anomaly '{reason}' {detail}, dumping {len(self.ring)} frames to {folder}")
+        return folder
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and not self._pending_dumps and self._latest is None:
+                    self._cond.wait()
+                if not self._running and not self._pending_dumps and self._latest is None:
+                    return
+                if self._pending_dumps:
+                    job, latest = self._pending_dumps.popleft(), None
+                else:
+                    wait = self._last_write + self.write_interval - time.monotonic()
+                    if wait > 0 and self._running:
+                        self._cond.wait(wait)
+                        continue
+                    job, latest = None, self._latest
+                    self._latest = None
+                    self._last_write = time.monotonic()
+            try:
+                if job is not None:
+                    self._write_dump(*job)
+                else:
+                    write_image(os.path.join(self.base_dir, DEBUG_IMAGE), latest.image)
+            except Exception as e:
+                print(f"[Debug] Failed to write debug image: {e}")
+
+    def _write_dump(self, folder: str, reason: str, detail: str, frames: list) -> None:
+        os.makedirs(folder, exist_ok=True)
+        meta = []
+        for i, frame in enumerate(frames):
+            filename = f"{i:03d}_{re.sub(r'[^A-Za-z0-9_.-]+', '_', frame.action)}.png"
+            write_image(os.path.join(folder, filename), frame.image)
+            meta.append({"file": filename, **frame.meta()})
+        with open(os.path.join(folder, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"reason": reason, "detail": detail, "frames": meta}, f, indent=2)
+        self.dumps_written += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stops the writer after flushing pending dumps and the latest frame."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout)
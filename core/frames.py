@@ -0,0 +1,208 @@
+import ctypes
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+import cv2 as cv
+
+Region = Tuple[int, int, int, int]
+
+class FrameSource:
+    """
+    Supplies BGRA pixels of a window, either the full frame or one region (x0, y0, x1, y1).
+    grab() may return a view into a buffer the source reuses: copy it if it must outlive the next grab.
+    """
+    width: int
+    height: int
+
+    def grab(self, region: Optional[Region] = None) -> Optional[np.ndarray]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def clamp(self, region: Optional[Region]) -> Optional[Region]:
+        if region is None:
+            return 0, 0, self.width, self.height
+        x0, y0, x1, y1 = (int(v) for v in region)
+        x0 = max(0, min(x0, self.width))
+        x1 = max(0, min(x1, self.width))
+        y0 = max(0, min(y0, self.height))
+        y1 = max(0, min(y1, self.height))
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return x0, y0, x1, y1
+
+
+class NumpyFrameSource(FrameSource):
+    """Serves regions as views of an in-memory BGRA frame. Used for tests, benchmarks and the simulation."""
+    def __init__(self, frame: np.ndarray):
+        self.set_frame(frame)
+
+    def set_frame(self, frame: np.ndarray) -> None:
+        if frame.ndim == 2:
+            frame = cv.cvtColor(frame, cv.COLOR_GRAY2BGRA)
+        elif frame.shape[2] == 3:
+            frame = cv.cvtColor(frame, cv.COLOR_BGR2BGRA)
+        self.frame = frame
+        self.height, self.width = frame.shape[:2]
+
+    def grab(self, region: Optional[Region] = None) -> Optional[np.ndarray]:
+        region = self.clamp(region)
+        if region is None:
+            return None
+        x0, y0, x1, y1 = region
+        return self.frame[y0:y1, x0:x1]
+
+
+class FileFrameSource(NumpyFrameSource):
+    """NumpyFrameSource backed by image files (saved screenshots). next_frame() steps through them."""
+    def __init__(self, paths: list[str] | str):
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.position = 0
+        super().__init__(self.load(self.paths[0]))
+
+    @staticmethod
+    def load(path: str) -> np.ndarray:
+        img = cv.imread(path, cv.IMREAD_UNCHANGED)
+        if img is None:
+            raise FileNotFoundError(f"Frame not found: {path}")
+        return img
+
+    def next_frame(self) -> bool:
+        if self.position + 1 >= len(self.paths):
+            return False
+        self.position += 1
+        self.set_frame(self.load(self.paths[self.position]))
+        return True
+
+
+# --- Windows GDI ---
+
+SRCCOPY = 0x00CC0020
+PW_RENDERFULLCONTENT = 0x00000002
+DIB_RGB_COLORS = 0
+BI_RGB = 0
+MAX_BUFFERS = 8
+
+class BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ("biSize", ctypes.c_uint32), ("biWidth", ctypes.c_int32), ("biHeight", ctypes.c_int32),
+        ("biPlanes", ctypes.c_uint16), ("biBitCount", ctypes.c_uint16), ("biCompression", ctypes.c_uint32),
+        ("biSizeImage", ctypes.c_uint32), ("biXPelsPerMeter", ctypes.c_int32), ("biYPelsPerMeter", ctypes.c_int32),
+        ("biClrUsed", ctypes.c_uint32), ("biClrImportant", ctypes.c_uint32),
+    ]
+
+class BITMAPINFO(ctypes.Structure):
+    _fields_ = [("bmiHeader", BITMAPINFOHEADER), ("bmiColors", ctypes.c_uint32 * 3)]
+
+class RECT(ctypes.Structure):
+    _fields_ = [("left", ctypes.c_long), ("top", ctypes.c_long), ("right", ctypes.c_long), ("bottom", ctypes.c_long)]
+
+
+class Win32FrameSource(FrameSource):
+    """
+    GDI capture that keeps the window DC, a memory DC and DIB sections alive across calls.
+    By default regions are BitBlt'ed from the window DC, which copies only the region but sees whatever
+    is on screen (the bot keeps the client in the foreground); a grab that fails or comes back all black
+    (GPU-rendered clients, a minimised window) is redone with PrintWindow, for that call only.
+    use_print_window=True makes every grab a full-window PrintWindow, which also renders occluded windows.
+    grab() returns a copy: the DIB sections are reused and freed on eviction, so no view may escape.
+    """
+    def __init__(self, hwnd: int, use_print_window: bool = False):
+        self.hwnd = hwnd
+        self.use_print_window = use_print_window
+        self.user32 = ctypes.windll.user32
+        self.gdi32 = ctypes.windll.gdi32
+        self._declare_signatures()
+
+        rect = RECT()
+        self.user32.GetWindowRect(self.hwnd, ctypes.byref(rect))
+        self.width = int(rect.right - rect.left)
+        self.height = int(rect.bottom - rect.top)
+
+        self.window_dc = self.user32.GetWindowDC(self.hwnd)
+        if not self.window_dc:
+            raise RuntimeError("GetWindowDC failed")
+        self.mem_dc = self.gdi32.CreateCompatibleDC(self.window_dc)
+        self.buffers = OrderedDict() # (w, h) -> (HBITMAP, ndarray)
+
+    def _declare_signatures(self) -> None:
+        # Handles are pointer sized, the ctypes default of int truncates them on 64-bit
+        u, g = self.user32, self.gdi32
+        u.GetWindowDC.restype = ctypes.c_void_p
+        u.GetWindowDC.argtypes = [ctypes.c_void_p]
+        u.ReleaseDC.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+        u.PrintWindow.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint]
+        g.CreateCompatibleDC.restype = ctypes.c_void_p
+        g.CreateCompatibleDC.argtypes = [ctypes.c_void_p]
+        g.CreateDIBSection.restype = ctypes.c_void_p
+        g.CreateDIBSection.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.POINTER(ctypes.c_void_p), ctypes.c_void_p, ctypes.c_uint32]
+        g.SelectObject.restype = ctypes.c_void_p
+        g.SelectObject.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+        g.BitBlt.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_uint32]
+        g.DeleteObject.argtypes = [ctypes.c_void_p]
+        g.DeleteDC.argtypes = [ctypes.c_void_p]
+
+    def _buffer(self, w: int, h: int):
+        key = (w, h)
+        if key in self.buffers:
+            self.buffers.move_to_end(key)
+            return self.buffers[key]
+
+        bmi = BITMAPINFO()
+        hdr = bmi.bmiHeader
+        hdr.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+        hdr.biWidth = w
+        hdr.biHeight = -h # Negative: top-down rows, same layout as NumPy
+        hdr.biPlanes = 1
+        hdr.biBitCount = 32
+        hdr.biCompression = BI_RGB
+
+        bits = ctypes.c_void_p()
+        hbmp = self.gdi32.CreateDIBSection(self.mem_dc, ctypes.byref(bmi), DIB_RGB_COLORS, ctypes.byref(bits), None, 0)
+        if not hbmp or not bits.value:
+            raise RuntimeError("CreateDIBSection failed")
+        arr = np.ctypeslib.as_array((ctypes.c_ubyte * (w * h * 4)).from_address(bits.value)).reshape(h, w, 4)
+
+        self.buffers[key] = (hbmp, arr)
+        if len(self.buffers) > MAX_BUFFERS: # Safe to free: grab() only hands out copies
+            _, (old_bmp, _) = self.buffers.popitem(last=False)
+            self.gdi32.DeleteObject(old_bmp)
+        return hbmp, arr
+
+    def grab(self, region: Optional[Region] = None) -> Optional[np.ndarray]:
+        region = self.clamp(region)
+        if region is None:
+            return None
+        x0, y0, x1, y1 = region
+
+        if not self.use_print_window:
+            hbmp, arr = self._buffer(x1 - x0, y1 - y0)
+            self.gdi32.SelectObject(self.mem_dc, hbmp)
+            ok = self.gdi32.BitBlt(self.mem_dc, 0, 0, x1 - x0, y1 - y0, self.window_dc, x0, y0, SRCCOPY)
+            self.gdi32.GdiFlush()
+            if ok and arr.any():
+                return arr.copy()
+
+        hbmp, arr = self._buffer(self.width, self.height)
+        self.gdi32.SelectObject(self.mem_dc, hbmp)
+        if self.user32.PrintWindow(self.hwnd, self.mem_dc, PW_RENDERFULLCONTENT) != 1:
+            self.gdi32.BitBlt(self.mem_dc, 0, 0, self.width, self.height, self.window_dc, 0, 0, SRCCOPY)
+        self.gdi32.GdiFlush()
+        return arr[y0:y1, x0:x1].copy()
+
+    def close(self) -> None:
+        for hbmp, _ in self.buffers.values():
+            self.gdi32.DeleteObject(hbmp)
+        self.buffers.clear()
+        if self.mem_dc:
+            self.gdi32.DeleteDC(self.mem_dc)
+            self.mem_dc = None
+        if self.window_dc:
+            self.user32.ReleaseDC(self.hwnd, self.window_dc)
+            self.window_dc = None
+
+    def __del__(self):
+        try: self.close()
+        except Exception: pass
@@ -1,19 +1,252 @@
-import pyautogui
+import ctypes
+import threading
 import time
+from contextlib import contextmanager
+
+try:
+    import pyautogui
+except Exception:
+    # No display (headless Linux), only non-pyautogui senders such as the simulation harness work
+    pyautogui = None
+try:
+    import pyperclip
+except Exception:
+    pyperclip = None
+
+BACKENDS = ["pyautogui", "paste", "sendinput", "recording"]
+PAUSE = 0.1 # Wait after a standalone action, same as pyautogui.PAUSE
+TYPE_INTERVAL = 0.03
+ACTION_GAP = 0.05 # Wait between actions of one batch
 
 class InputSender():
+    """
+    Mouse and keyboard input through pyautogui, one key per character.
+    Actions issued inside 'with sender.batch():' are queued and run back to back when the block ends,
+    separated only by 'action_gap' instead of the full pause every standalone call gets; the pause follows the whole batch.
+    Subclasses change how actions reach the game by overriding _click/_type/_press/_gap.
+    """
+    pad_text = True # Short strings get trailing spaces so the search box has time to pick them up
+
+    def __init__(self, action_gap: float = ACTION_GAP, pause: float = PAUSE, type_interval: float = TYPE_INTERVAL):
+        self.action_gap = action_gap
+        self.pause = pause
+        self.type_interval = type_interval
+        self._local = threading.local()
+
+    # --- Public API used by the managers ---
+
     def sleep(self, seconds: int) -> None:
-        time.sleep(seconds)
+        if self._queue is not None:
+            self._queue.append(("gap", (seconds,)))
+        else:
+            self._gap(seconds)
 
     def typewrite(self, text: str | int) -> None:
         if type(text) == str:
-            text = text if len(text) >= 10 else text + "          "
+            if self.pad_text and len(text) < 10:
+                text = text + "          "
         else:
-            text = str(text)
-        pyautogui.typewrite(text, 0.03)
+            text = str(text) # Numbers, e.g. prices, are typed exactly
+        self._submit("type", text)
 
     def press(self, keycode: str) -> None:
-        pyautogui.press(keycode)
+        self._submit("press", keycode)
 
     def click(self, position: list[int], clicks: int = 1, interval: float = 0.02) -> None:
-        pyautogui.click(position, clicks=clicks, interval=interval)
+        self._submit("click", tuple(position), clicks, interval)
+
+    @property
+    def _queue(self):
+        return getattr(self._local, "queue", None)
+
+    @contextmanager
+    def batch(self):
+        """Queues the actions of the block and runs them in one go. Nested batches join the outer one."""
+        if self._queue is not None:
+            yield
+            return
+        self._local.queue = []
+        try:
+            yield
+        except BaseException:
+            self._local.queue = None # Half a sequence is worse than none
+            raise
+        actions, self._local.queue = self._local.queue, None
+        self.run_actions(actions)
+
+    def _submit(self, kind: str, *args) -> None:
+        if self._queue is not None:
+            self._queue.append((kind, args))
+            return
+        self.run_actions([(kind, args)])
+
+    def run_actions(self, actions: list) -> None:
+        """Runs queued actions 'action_gap' apart, then waits 'pause' like any standalone action."""
+        for i, (kind, args) in enumerate(actions):
+            if kind == "gap":
+                self._gap(*args)
+                continue
+            if i and actions[i - 1][0] != "gap":
+                self._gap(self.action_gap)
+            getattr(self, "_" + kind)(*args)
+        self._gap(self.pause)
+
+    # --- Backend ---
+
+    def _gap(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _type(self, text: str) -> None:
+        pyautogui.typewrite(text, self.type_interval, _pause=False)
+
+    def _press(self, keycode: str) -> None:
+        pyautogui.press(keycode, _pause=False)
+
+    def _click(self, position: tuple, clicks: int, interval: float) -> None:
+        pyautogui.click(position, clicks=clicks, interval=interval, _pause=False)
+
+
+class PasteInputSender(InputSender):
+    """pyautogui for the mouse, text entered in one Ctrl+V from the clipboard."""
+    pad_text = False
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if pyperclip is None:
+            raise RuntimeError("pyperclip is not installed")
+
+    def _type(self, text: str) -> None:
+        pyperclip.copy(text)
+        pyautogui.hotkey("ctrl", "v", _pause=False)
+
+
+# --- Windows SendInput ---
+
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+VIRTUAL_KEYS = {"enter": 0x0D, "return": 0x0D, "esc": 0x1B, "escape": 0x1B, "backspace": 0x08, "tab": 0x09, "delete": 0x2E, "space": 0x20}
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", ctypes.c_long), ("dy", ctypes.c_long), ("mouseData", ctypes.c_ulong),
+                ("dwFlags", ctypes.c_ulong), ("time", ctypes.c_ulong), ("dwExtraInfo", ctypes.c_size_t)]
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", ctypes.c_ushort), ("wScan", ctypes.c_ushort), ("dwFlags", ctypes.c_ulong),
+                ("time", ctypes.c_ulong), ("dwExtraInfo", ctypes.c_size_t)]
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [("uMsg", ctypes.c_ulong), ("wParamL", ctypes.c_ushort), ("wParamH", ctypes.c_ushort)]
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+class INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_ulong), ("u", _INPUTUNION)]
+
+
+class SendInputSender(InputSender):
+    """
+    Injects input with user32.SendInput. A whole search string goes out as one array of
+    Unicode key events, so typing costs one call regardless of its length and needs no padding.
+    """
+    pad_text = False
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.user32 = ctypes.windll.user32
+
+    def _send(self, events: list) -> None:
+        array = (INPUT * len(events))(*events)
+        sent = self.user32.SendInput(len(events), array, ctypes.sizeof(INPUT))
+        if sent != len(events):
+            raise OSError(f"SendInput injected {sent} of {len(events)} events")
+
+    @staticmethod
+    def _key(vk: int = 0, scan: int = 0, flags: int = 0) -> INPUT:
+        return INPUT(type=INPUT_KEYBOARD, u=_INPUTUNION(ki=KEYBDINPUT(wVk=vk, wScan=scan, dwFlags=flags)))
+
+    @staticmethod
+    def _mouse(flags: int) -> INPUT:
+        return INPUT(type=INPUT_MOUSE, u=_INPUTUNION(mi=MOUSEINPUT(dwFlags=flags)))
+
+    def _type(self, text: str) -> None:
+        events = []
+        for char in text:
+            code = ord(char)
+            events.append(self._key(scan=code, flags=KEYEVENTF_UNICODE))
+            events.append(self._key(scan=code, flags=KEYEVENTF_UNICODE | KEYEVENTF_KEYUP))
+        if events:
+            self._send(events)
+
+    def _press(self, keycode: str) -> None:
+        vk = VIRTUAL_KEYS.get(keycode.lower())
+        if vk is None and len(keycode) == 1:
+            self._type(keycode)
+            return
+        if vk is None:
+            raise ValueError(f"Unsupported key for SendInput: {keycode}")
+        self._send([self._key(vk=vk), self._key(vk=vk, flags=KEYEVENTF_KEYUP)])
+
+    def _click(self, position: tuple, clicks: int, interval: float) -> None:
+        self.user32.SetCursorPos(int(position[0]), int(position[1]))
+        for i in range(clicks):
+            if i:
+                time.sleep(interval)
+            self._send([self._mouse(MOUSEEVENTF_LEFTDOWN), self._mouse(MOUSEEVENTF_LEFTUP)])
+
+
+class RecordingInputSender(InputSender):
+    """
+    Sends nothing: every action is appended to 'actions' as (time, kind, target, count) and passed
+    to the listeners. For headless runs and tests.
+    """
+    pad_text = False
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.actions = []
+        self.listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback) -> None:
+        """callback(kind, target, count) is called after each recorded action."""
+        self.listeners.append(callback)
+
+    def _record(self, kind: str, target, count: int = 1) -> None:
+        with self._lock:
+            self.actions.append((time.perf_counter(), kind, target, count))
+        for callback in self.listeners:
+            callback(kind, target, count)
+
+    def sleep(self, seconds: float) -> None:
+        super().sleep(seconds)
+        if self._queue is None:
+            self._record("sleep", seconds)
+
+    def _gap(self, seconds: float) -> None:
+        pass
+
+    def _type(self, text: str) -> None:
+        self._record("type", text)
+
+    def _press(self, keycode: str) -> None:
+        self._record("press", keycode)
+
+    def _click(self, position: tuple, clicks: int, interval: float) -> None:
+        self._record("click", position, clicks)
+
+
+def create_input_sender(backend: str = "pyautogui", action_gap: float = ACTION_GAP) -> InputSender:
+    """InputSender for a 'input_backend' setting; unknown or unavailable backends fall back to pyautogui."""
+    senders = {"pyautogui": InputSender, "paste": PasteInputSender, "sendinput": SendInputSender, "recording": RecordingInputSender}
+    sender_class = senders.get(backend or "pyautogui")
+    if sender_class is None:
+        print(f"[Input] Unknown input backend '{backend}', expected one of {BACKENDS}. Using pyautogui.")
+        sender_class = InputSender
+    try:
+        return sender_class(action_gap=action_gap)
+    except Exception as e:
+        print(f"[Input] '{backend}' input unavailable ({e}), using pyautogui.")
+        return InputSender(action_gap=action_gap)
@@ -0,0 +1,55 @@
+from typing import Optional
+
+import numpy as np
+import cv2 as cv
+
+class Preprocess:
+    """
+    OCR preprocessing of one captured region, run directly on the BGRA view the FrameSource returns:
+    BGRA -> gray (or RGB) -> optional upscale -> optional median denoise -> optional Otsu threshold.
+    Every step after the first works in place or on a buffer of the crop size, never the full frame.
+    """
+    __slots__ = ("gray", "scale", "denoise", "threshold")
+
+    def __init__(self, gray: bool = True, scale: float = 1.0, denoise: int = 0, threshold: bool = True):
+        self.gray = gray
+        self.scale = float(scale)
+        self.denoise = int(denoise) # Median kernel size, 0 disables, even values are rounded up
+        self.threshold = threshold and gray
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "Preprocess":
+        data = data or {}
+        return cls(
+            gray=data.get("gray", True),
+            scale=data.get("scale", 1.0),
+            denoise=data.get("denoise", 0),
+            threshold=data.get("threshold", True),
+        )
+
+    @property
+    def kind(self) -> str:
+        """Cache namespace: results of different pipelines never share an OCR cache entry."""
+        return "text" if self.gray else "text_color"
+
+    def apply(self, bgra: np.ndarray) -> np.ndarray:
+        img = cv.cvtColor(bgra, cv.COLOR_BGRA2GRAY if self.gray else cv.COLOR_BGRA2RGB)
+        if self.scale != 1.0:
+            interpolation = cv.INTER_CUBIC if self.scale > 1.0 else cv.INTER_AREA
+            img = cv.resize(img, None, fx=self.scale, fy=self.scale, interpolation=interpolation)
+        if self.denoise > 1:
+            img = cv.medianBlur(img, self.denoise | 1)
+        if self.threshold:
+            cv.threshold(img, 0, 255, cv.THRESH_BINARY | cv.THRESH_OTSU, dst=img)
+        return img
+
+    def to_region(self, x: int, y: int) -> tuple[int, int]:
+        """Maps a position in the preprocessed image back to the captured region."""
+        return int(round(x / self.scale)), int(round(y / self.scale))
+
+    def __repr__(self) -> str:
+        return f"Preprocess(gray={self.gray}, scale={self.scale}, denoise={self.denoise}, threshold={self.threshold})"
+
+
+GRAY = Preprocess()
+COLOR = Preprocess(gray=False)
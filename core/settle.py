@@ -0,0 +1,106 @@
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+import cv2 as cv
+
+from core.templates import ACCEPT_SCORE
+from utils.tracing import TRACER
+
+Region = Tuple[int, int, int, int]
+
+# Mean absolute gray-level difference (0-255) between two samples that counts as "the UI moved"
+DIFF_THRESHOLD = 1.5
+POLL_INTERVAL = 0.015
+CHANGE_TIMEOUT = 0.3 # How long to wait for the first change before assuming the action shows none
+STABLE_SAMPLES = 2 # Consecutive unchanged samples needed to call the UI settled
+SAMPLE_STEP = 4 # Only every 4th pixel in each direction is compared
+
+class UiSettle:
+    """
+    Replaces fixed post-action sleeps: polls a small region of the window and returns as soon as it has
+    stopped changing (or shows an expected template), bounded by a timeout. Given a sample taken before
+    the action, it first waits for the region to change so a UI that has not reacted yet is not mistaken
+    for a settled one. Wait times land in the tracer as "settle.<action>".
+    """
+    def __init__(self, capture, poll_interval: float = POLL_INTERVAL, diff_threshold: float = DIFF_THRESHOLD, change_timeout: float = CHANGE_TIMEOUT):
+        self.capture = capture
+        self.poll_interval = poll_interval
+        self.diff_threshold = diff_threshold
+        self.change_timeout = change_timeout
+        self.timeouts = {}
+        self.last_timed_out = False
+
+    def sample(self, region: Region) -> Optional[np.ndarray]:
+        bgra = self.capture.grab_region(region)
+        if bgra is None:
+            return None
+        # Strided view first, so only the sampled pixels are converted
+        return cv.cvtColor(bgra[::SAMPLE_STEP, ::SAMPLE_STEP], cv.COLOR_BGRA2GRAY)
+
+    def changed(self, a: Optional[np.ndarray], b: Optional[np.ndarray]) -> bool:
+        if a is None or b is None or a.shape != b.shape:
+            return True
+        return float(cv.absdiff(a, b).mean()) > self.diff_threshold
+
+    def _template_visible(self, region: Region, template: str) -> bool:
+        templates = self.capture.templates
+        if not templates.has(template):
+            return False
+        bw = self.capture.preprocess_region(region)
+        score = templates.score(template, bw) if bw is not None else None
+        return score is not None and score >= ACCEPT_SCORE
+
+    def wait(self, action: str, region: Region, before: Optional[np.ndarray] = None, template: Optional[str] = None,
+             timeout: float = 1.0, change_timeout: Optional[float] = None) -> float:
+        """
+        Blocks until 'region' is settled, returns the seconds waited.
+        before: sample from just before the action; the wait then starts once the region differs from it
+                (or change_timeout passed without any change, e.g. clicking an already selected tab).
+        template: name of a TemplateLibrary template that, once matched in the region, ends the wait early.
+        """
+        if change_timeout is None:
+            change_timeout = self.change_timeout
+        start = time.perf_counter()
+        deadline = start + timeout
+        waiting_for_change = before is not None
+        previous = before
+        stable = 0
+        self.last_timed_out = False
+
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                self.timeouts[action] = self.timeouts.get(action, 0) + 1
+                self.last_timed_out = True
+                break
+            if template and self._template_visible(region, template):
+                break
+
+            current = self.sample(region)
+            if waiting_for_change:
+                if self.changed(before, current) or now - start >= change_timeout:
+                    waiting_for_change = False
+                    stable = 0
+            elif not self.changed(previous, current):
+                stable += 1
+                if stable >= STABLE_SAMPLES:
+                    break
+            else:
+                stable = 0
+            previous = current
+            time.sleep(self.poll_interval)
+
+        elapsed = time.perf_counter() - start
+        TRACER.observe(f"settle.{action}", elapsed)
+        return elapsed
+
+    def stats(self) -> dict:
+        """Wait-time distribution and timeout count per action."""
+        snapshot = TRACER.snapshot()
+        result = {}
+        for name, hist in snapshot.items():
+            if name.startswith("settle."):
+                action = name[len("settle."):]
+                result[action] = {**hist, "timeouts": self.timeouts.get(action, 0)}
+        return result
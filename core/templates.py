@@ -0,0 +1,76 @@
+import os
+import re
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+import cv2 as cv
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "templates")
+# TM_CCOEFF_NORMED scores: above ACCEPT the label is there, below REJECT it is not, in between ask OCR
+ACCEPT_SCORE = 0.85
+REJECT_SCORE = 0.5
+
+class TemplateLibrary:
+    """
+    Binarized snapshots of fixed UI labels/buttons, one folder per window resolution
+    (config/templates/2560x1600/sell_orders.png). Matching one against a binarized crop takes about
+    a millisecond, so yes/no UI checks only fall back to Tesseract when the score is ambiguous.
+    """
+    def __init__(self, resolution: str, directory: str = TEMPLATES_DIR):
+        self.directory = os.path.join(directory, resolution)
+        self.templates = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def slug(text: str) -> str:
+        """'Sell Orders' -> 'sell_orders', usable as a template name."""
+        return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+    def load(self) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        for filename in os.listdir(self.directory):
+            name, ext = os.path.splitext(filename)
+            if ext.lower() != ".png":
+                continue
+            img = cv.imread(os.path.join(self.directory, filename), cv.IMREAD_GRAYSCALE)
+            if img is not None:
+                self.templates[name] = img
+
+    def has(self, name: str) -> bool:
+        return name in self.templates
+
+    def save(self, name: str, bw: np.ndarray) -> None:
+        """Stores a binarized crop as template 'name' (used when OCR confirms what a region shows)."""
+        if bw.size == 0 or bw.min() == bw.max():
+            return # A flat image matches everything equally badly
+        bw = np.ascontiguousarray(bw)
+        with self._lock:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            cv.imwrite(os.path.join(self.directory, f"{name}.png"), bw)
+            self.templates[name] = bw.copy()
+        print(f"[Templates] Captured '{name}' {bw.shape[1]}x{bw.shape[0]}")
+
+    def locate(self, name: str, bw: np.ndarray) -> Tuple[Optional[float], Optional[Tuple[int, int]]]:
+        """Best score and top-left position of template 'name' inside 'bw'. (None, None) if it cannot be matched."""
+        template = self.templates.get(name)
+        if template is None:
+            return None, None
+        th, tw = template.shape[:2]
+        h, w = bw.shape[:2]
+        if th > h or tw > w:
+            # Crops of the same region can differ by a pixel, compare at the crop size
+            if th - h > 4 or tw - w > 4:
+                return None, None
+            template = template[:min(th, h), :min(tw, w)]
+        result = cv.matchTemplate(bw, template, cv.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv.minMaxLoc(result)
+        if not np.isfinite(max_val):
+            return None, None
+        return float(max_val), max_loc
+
+    def score(self, name: str, bw: np.ndarray) -> Optional[float]:
+        return self.locate(name, bw)[0]
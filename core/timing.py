@@ -0,0 +1,126 @@
+import json
+import os
+import platform
+import re
+import threading
+from collections import deque
+from typing import Optional
+
+TIMING_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "timing")
+MAX_SAMPLES = 200
+MIN_SAMPLES = 20 # Observations needed before a delay is adapted at all
+QUANTILE = 0.95
+MARGIN = 1.3 # Adapted delay = QUANTILE of observed latency * MARGIN
+ERROR_WINDOW = 30
+MAX_ERROR_RATE = 0.1 # Above this share of failed waits the delay is at least its default
+MAX_GROWTH = 3.0 # Adapted delays stay below default * MAX_GROWTH: a search without orders also times out
+
+class TimedDelay:
+    """Observed latencies and recent outcomes of one kind of wait."""
+    __slots__ = ("samples", "outcomes", "minimum", "maximum")
+
+    def __init__(self, minimum: float = 0.05, maximum: float = 5.0):
+        self.samples = deque(maxlen=MAX_SAMPLES)
+        self.outcomes = deque(maxlen=ERROR_WINDOW) # True = the wait ended with what it waited for
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def quantile(self, q: float = QUANTILE) -> Optional[float]:
+        if len(self.samples) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def value(self, default: float) -> float:
+        observed = self.quantile()
+        if observed is None:
+            return default
+        adapted = min(max(observed * MARGIN, self.minimum), self.maximum, default * MAX_GROWTH)
+        if self.error_rate() > MAX_ERROR_RATE:
+            # Too many timeouts: never below the default, and above it while waits keep timing out
+            return max(default, adapted)
+        return adapted
+
+
+class TimingProfile:
+    """
+    Per-machine timing of the waits the bot does after an action: how long the UI took to settle
+    and how long market packets took to arrive. delay(key, default) answers with a high percentile
+    of what was observed (plus margin), so fast machines stop waiting for slow-machine constants.
+    Until enough samples exist the hand-tuned default is used; when too many recent waits timed out
+    it is the floor, and the timeouts themselves, kept as samples, push the delay above it.
+    Saved to config/timing/<machine>.json.
+    """
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.delays = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_path() -> str:
+        machine = re.sub(r"[^A-Za-z0-9_.-]+", "_", platform.node() or "default")
+        return os.path.join(TIMING_DIR, f"{machine}.json")
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "TimingProfile":
+        profile = cls(path or cls.default_path())
+        if not os.path.exists(profile.path):
+            return profile
+        try:
+            with open(profile.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for key, entry in data.items():
+                delay = profile._get(key)
+                delay.samples.extend(float(v) for v in entry.get("samples", []))
+                delay.outcomes.extend(bool(v) for v in entry.get("outcomes", []))
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"[Timing] Ignoring unreadable profile {profile.path}: {e}")
+        return profile
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            data = {key: {"samples": [round(v, 4) for v in d.samples], "outcomes": list(d.outcomes)} for key, d in self.delays.items()}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def _get(self, key: str) -> TimedDelay:
+        delay = self.delays.get(key)
+        if delay is None:
+            delay = self.delays[key] = TimedDelay()
+        return delay
+
+    def delay(self, key: str, default: float) -> float:
+        with self._lock:
+            return self._get(key).value(default)
+
+    def observe(self, key: str, seconds: float, ok: bool = True) -> None:
+        """
+        Records one wait: 'seconds' it took, 'ok' False if it timed out. A timeout is kept as a sample
+        at the time waited: the real latency was at least that long, and leaving it out would let
+        the quantile, and so the delay, shrink toward the waits that happened to be fast enough.
+        """
+        with self._lock:
+            delay = self._get(key)
+            delay.samples.append(seconds)
+            delay.outcomes.append(ok)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                key: {
+                    "samples": len(d.samples),
+                    "p95_ms": round(d.quantile() * 1000, 1) if d.quantile() is not None else None,
+                    "error_rate": round(d.error_rate(), 3),
+                }
+                for key, d in sorted(self.delays.items())
+            }
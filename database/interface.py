@@ -2,6 +2,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.dialects.postgresql import insert
 from .models import Base, MarketOrder, MarketHistory, ItemData
+from utils.tracing import traced
+from utils.metrics import METRICS
 import threading
 import queue
 from datetime import datetime
@@ -16,6 +18,7 @@ class DatabaseInterface:
         self.Session = sessionmaker(bind=self.engine)
         self.write_queue = queue.Queue()
         self.running = True
+        METRICS.gauge("db.queue_depth", self.write_queue.qsize)
         
         self.writer_thread = threading.Thread(target=self._worker_loop, daemon=True)
         self.writer_thread.start()
@@ -42,7 +45,8 @@ class DatabaseInterface:
         batch_history = []
         batch_item_data = []
         
-        while self.running:
+        # After close() the loop keeps going until the queue is drained
+        while self.running or not self.write_queue.empty():
             try:
                 try:
                     dtype, data = self.write_queue.get(timeout=1.0)
@@ -70,6 +74,25 @@ class DatabaseInterface:
             except Exception as e:
                 print(f"[DB Loop Error] {e}")
 
+        # Partial batches left over at shutdown
+        if batch_orders: self._process_orders(session, batch_orders)
+        if batch_history: self._process_history(session, batch_history)
+        if batch_item_data: self._process_item_data(session, batch_item_data)
+        session.close()
+
+    def close(self, timeout: float = 10.0) -> bool:
+        """Stops the writer after it has written everything queued so far. False if it did not finish in time."""
+        pending = self.write_queue.qsize()
+        self.running = False
+        self.writer_thread.join(timeout)
+        if self.writer_thread.is_alive():
+            print(f"[DB] Writer still busy after {timeout}s, {self.write_queue.qsize()} writes pending.")
+            return False
+        self.engine.dispose()
+        print(f"[DB] Closed, {pending} queued writes flushed.")
+        return True
+
+    @traced("db.save_orders")
     def _process_orders(self, session, batch):
         try:
             stmt = insert(MarketOrder).values([
@@ -98,6 +121,7 @@ class DatabaseInterface:
             print(f"[DB Order Error] {e}")
             session.rollback()
 
+    @traced("db.save_history")
     def _process_history(self, session, batch):
         try:
             stmt = insert(MarketHistory).values(batch)
@@ -112,6 +136,7 @@ class DatabaseInterface:
             print(f"[DB History Error] {e}")
             session.rollback()
 
+    @traced("db.save_item_data")
     def _process_item_data(self, session, batch):
         try:
             for data in batch:
@@ -142,6 +167,7 @@ class DatabaseInterface:
             print(f"[DB ItemData Error] {e}")
             session.rollback()
 
+    @traced("db.get_all_prices_for_city")
     def get_all_prices_for_city(self, city: str) -> dict:
         """
         Retrieves all item prices for a specific city.
@@ -1,48 +1,90 @@
 import flet as ft
+import importlib
 import sys
 import threading
-import io
+import time
 import json
 import os
-import re
-from bot import TradeBot
-from database.interface import DatabaseInterface
 from managers.config_manager import ConfigManager, PRESETS_DIR
+from managers.scheduler import JobScheduler
 from gui.modules.popup import show_popup
+from gui.modules.log_console import LogConsole
+from gui.modules.metrics_panel import MetricsPanel
+from utils.items import ItemCatalog, load_bot_items
+from utils.item_index import ItemIndex
+from utils.thumbnails import ThumbnailCache, ThumbnailPrefetcher
+from utils.logger import LogBuffer, LogFile, ConsoleStream, ERROR
 
 # --- Constants ---
 BOT_ITEMS_FILE = "config/bot_items.json"
-
-class ConsoleRedirector(io.StringIO):
-    def __init__(self, update_callback):
-        super().__init__()
-        self.update_callback = update_callback
-
-    def write(self, message):
-        if message.strip():
-            self.update_callback(message)
-
-    def flush(self):
-        pass
+# Item lists: rows are ROW_EXTENT px high, only the visible ones plus OVERSCAN_ROWS on each side exist
+ROW_EXTENT = 35
+VISIBLE_ROWS = 12
+OVERSCAN_ROWS = 6
+ACTIVE_JOB_STATES = ("starting", "running", "waiting_for_travel", "cancelling")
+JOB_STOP_TIMEOUT = 15 # s the window waits on close for the job to reach a checkpoint
+LOAD_CHUNK = 1000 # Preset editor items parsed and shown per step while bot_items.json loads
+# Imported in the background after the window is shown, slowest first
+WARM_UP_MODULES = ["scapy.all", "net.sniffer", "database.interface", "core.capture", "managers.market", "bot"]
 
 class ItemData:
-    def __init__(self, unique_name, localized_name, category, sub_category):
-        self.unique_name = unique_name
+    __slots__ = ("key", "unique_name", "localized_name", "category", "sub_category", "tier", "enchant")
+
+    def __init__(self, key, localized_name, category, sub_category):
+        self.key = key
+        self.unique_name = key.unique_name
         self.localized_name = localized_name
         self.category = category
         self.sub_category = sub_category
-        match = re.match(r"T(\d+)_", unique_name)
-        self.tier = int(match.group(1)) if match else 0
-        if "@" in unique_name:
-            try:
-                self.enchant = int(unique_name.split("@")[1])
-            except:
-                self.enchant = 0
-        else:
-            self.enchant = 0
+        self.tier = key.tier
+        self.enchant = key.enchant
+
+class ItemRow(ft.Container):
+    """One reusable list row; bind() points it at another item instead of building a new control."""
+    def __init__(self, item_icon, on_item_click, thumbnails: ThumbnailCache):
+        super().__init__(height=ROW_EXTENT, visible=False)
+        self.item = None
+        self.thumbnails = thumbnails
+        self.on_item_click = on_item_click
+        self.name_text = ft.Text("", size=12, weight=ft.FontWeight.BOLD, overflow=ft.TextOverflow.ELLIPSIS, no_wrap=True)
+        self.unique_text = ft.Text("", size=9, color=ft.Colors.GREY_500, font_family="Consolas", overflow=ft.TextOverflow.ELLIPSIS, no_wrap=True)
+        self.image = ft.Image(src=" ", width=30, height=30, fit=ft.ImageFit.CONTAIN, border_radius=ft.border_radius.all(5))
+        self.content = ft.ListTile(
+            leading=ft.Icon(item_icon, size=14, color=ft.Colors.GREY_400),
+            title=ft.Row([
+                ft.Container(
+                    content=ft.Column([self.name_text, self.unique_text], spacing=2, alignment=ft.MainAxisAlignment.CENTER),
+                    width=250 # Set a fixed width for the text column
+                ),
+                self.image
+            ], vertical_alignment=ft.CrossAxisAlignment.CENTER, spacing=10),
+            dense=True, hover_color=ft.Colors.GREY_900,
+            on_click=self.click,
+            content_padding=ft.padding.symmetric(vertical=0, horizontal=5)
+        )
+
+    def click(self, e):
+        if self.item is not None:
+            self.on_item_click(self.item)
+
+    def bind(self, item) -> None:
+        if item is self.item:
+            return
+        self.item = item
+        self.visible = item is not None
+        if item is not None:
+            self.name_text.value = item.localized_name
+            self.unique_text.value = item.unique_name
+            self.image.src = self.thumbnails.src(item.unique_name)
 
 class ItemListPanel(ft.Container):
-    def __init__(self, title, button_text, button_icon, button_color, on_action_click, on_item_click, item_icon):
+    """
+    Virtualized item list: a fixed pool of ItemRow controls covers the viewport plus some overscan,
+    spacers stand in for the rows above and below it. Scrolling or a new item list only rebinds the rows
+    whose item changed, and the row for item i is always pool[i % len(pool)], so a scroll by k rows moves
+    k controls instead of re-rendering the window. Flet then sends just those property changes.
+    """
+    def __init__(self, title, button_text, button_icon, button_color, on_action_click, on_item_click, item_icon, thumbnails: ThumbnailCache, prefetcher: ThumbnailPrefetcher = None):
         super().__init__()
         self.expand = True
         self.padding = 5
@@ -50,58 +92,70 @@ class ItemListPanel(ft.Container):
         self.border_radius = 10
         self.border = ft.border.all(1, ft.Colors.GREY_800)
         self.on_action_click = on_action_click
-        self.on_item_click = on_item_click
-        self.item_icon = item_icon
+        self.prefetcher = prefetcher
         self.current_items = []
+        self.first = 0 # Index of the first pooled row
 
         self.action_btn = ft.ElevatedButton(
             text=button_text, icon=button_icon, bgcolor=button_color, color=ft.Colors.WHITE,
             on_click=self.trigger_action, height=30, style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=5))
         )
         self.count_text = ft.Text("0 items", size=11, color=ft.Colors.GREY_400)
-        self.item_list = ft.ListView(expand=True, spacing=1, item_extent=35, auto_scroll=False)
+        self.rows = [ItemRow(item_icon, on_item_click, thumbnails) for _ in range(VISIBLE_ROWS + 2 * OVERSCAN_ROWS)]
+        self.top_spacer = ft.Container(height=0)
+        self.bottom_spacer = ft.Container(height=0)
+        self.item_list = ft.ListView(expand=True, spacing=0, auto_scroll=False, on_scroll=self.on_scroll, on_scroll_interval=20)
 
         self.content = ft.Column([
             ft.Text(title, weight=ft.FontWeight.BOLD, size=14),
             ft.Divider(height=5, thickness=1),
             ft.Row([self.action_btn, self.count_text], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-            ft.Container(content=self.item_list, expand=True, bgcolor=ft.Colors.BLACK26, border_radius=5, padding=2, height=420) # 12 items * 35 extent
+            ft.Container(content=self.item_list, expand=True, bgcolor=ft.Colors.BLACK26, border_radius=5, padding=2, height=VISIBLE_ROWS * ROW_EXTENT)
         ], spacing=5)
+        self.render()
 
     def update_list(self, items):
         self.current_items = items
-        self.item_list.controls.clear()
-        display_limit = 100
-        for i, item in enumerate(items):
-            if i >= display_limit:
-                self.item_list.controls.append(ft.Text(f"... {len(items) - display_limit} more", size=11, italic=True))
-                break
-            self.item_list.controls.append(
-                ft.ListTile(
-                    leading=ft.Icon(self.item_icon, size=14, color=ft.Colors.GREY_400),
-                    title=ft.Row([
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Text(item.localized_name, size=12, weight=ft.FontWeight.BOLD, overflow=ft.TextOverflow.ELLIPSIS, no_wrap=True),
-                                ft.Text(item.unique_name, size=9, color=ft.Colors.GREY_500, font_family="Consolas", overflow=ft.TextOverflow.ELLIPSIS, no_wrap=True),
-                            ], spacing=2, alignment=ft.MainAxisAlignment.CENTER),
-                            width=250 # Set a fixed width for the text column
-                        ),
-                        ft.Image(
-                            src=f"https://render.albiononline.com/v1/item/{item.unique_name}",
-                            width=40, height=40, fit=ft.ImageFit.CONTAIN,
-                            border_radius=ft.border_radius.all(5),
-                        )
-                    ], vertical_alignment=ft.CrossAxisAlignment.CENTER, spacing=10),
-                    dense=True, hover_color=ft.Colors.GREY_900,
-                    on_click=lambda e, it=item: self.on_item_click(it),
-                    content_padding=ft.padding.symmetric(vertical=0, horizontal=5)
-                )
-            )
+        if self.first and self.first >= len(items):
+            # The list got shorter than the scroll position, start over at the top
+            self.first = 0
+            if self.item_list.page:
+                self.item_list.scroll_to(offset=0, duration=0)
         self.count_text.value = f"{len(items)} items"
+        self.render()
+        if self.count_text.page:
+            self.count_text.update()
+
+    def render(self):
+        items = self.current_items
+        pool = len(self.rows)
+        first = self.first
+        window = []
+        for i in range(first, first + pool):
+            row = self.rows[i % pool]
+            row.bind(items[i] if i < len(items) else None)
+            window.append(row)
+        self.top_spacer.height = first * ROW_EXTENT
+        self.bottom_spacer.height = max(0, len(items) - first - pool) * ROW_EXTENT
+        self.item_list.controls = [self.top_spacer, *window, self.bottom_spacer]
         if self.item_list.page:
             self.item_list.update()
-            self.count_text.update()
+
+    def on_scroll(self, e):
+        first = max(0, min(int(e.pixels // ROW_EXTENT) - OVERSCAN_ROWS, len(self.current_items) - len(self.rows)))
+        if first != self.first:
+            self.first = first
+            self.render()
+            if self.prefetcher:
+                self.prefetcher.prefetch([row.item.unique_name for row in self.rows if row.item is not None], urgent=True)
+
+    def show_thumbnail(self, unique_name: str, path: str):
+        """Points the row showing 'unique_name' (if any) at its freshly cached icon."""
+        for row in self.rows:
+            if row.item is not None and row.item.unique_name == unique_name:
+                row.image.src = path
+                if row.image.page:
+                    row.image.update()
 
     def trigger_action(self, e):
         self.on_action_click(self.current_items)
@@ -115,9 +169,18 @@ class PresetManager(ft.Column):
         self.spacing = 3 # Tight spacing (outside padding equivalent)
         self.padding = 20
         
-        self.raw_json = self.load_json_data()
-        self.all_item_objects = self.parse_items(self.raw_json)
+        # Filled by load_items() on a worker thread, the tab is usable while items arrive
+        self.categories = {}
+        self.all_item_objects = []
+        self.index = ItemIndex()
+        self.loading = True
+        self._lock = threading.RLock() # index + preset_mask, shared by the loader and UI events
+        # Icons come from a local cache, filled in the background for whatever the filters show
+        self.thumbnails = ThumbnailCache()
+        self.prefetcher = ThumbnailPrefetcher(self.thumbnails, on_ready=self.on_thumbnail)
         self.preset_set = set()
+        self.preset_mask = 0 # preset_set as an index bitset
+        self.search_text = ""
 
         self.selected_cat = None
         self.selected_sub = None
@@ -125,7 +188,6 @@ class PresetManager(ft.Column):
         self.selected_enchants = set()
 
         self.cat_row = ft.Row(wrap=True, spacing=2, run_spacing=2)
-        self.load_category_chips()
         self.sub_row = ft.Row(wrap=True, spacing=2, run_spacing=2)
         
         # Helper to create compact chips
@@ -140,8 +202,8 @@ class PresetManager(ft.Column):
         self.tier_row = ft.Row(wrap=True, spacing=2, run_spacing=2, controls=[create_chip(f"T{t}", t, self.on_tier_toggle) for t in [4, 5, 6, 7, 8]])
         self.enchant_row = ft.Row(wrap=True, spacing=2, run_spacing=2, controls=[create_chip(f".{e}", e, self.on_enchant_toggle) for e in [0, 1, 2, 3, 4]])
 
-        self.left_panel = ItemListPanel("Available", "Add Filtered", ft.Icons.ADD, ft.Colors.GREEN_700, self.add_items_bulk, self.add_single_item, ft.Icons.ADD_CIRCLE_OUTLINE)
-        self.right_panel = ItemListPanel("In Preset", "Remove Filtered", ft.Icons.DELETE, ft.Colors.RED_700, self.remove_items_bulk, self.remove_single_item, ft.Icons.HIGHLIGHT_OFF)
+        self.left_panel = ItemListPanel("Available", "Add Filtered", ft.Icons.ADD, ft.Colors.GREEN_700, self.add_items_bulk, self.add_single_item, ft.Icons.ADD_CIRCLE_OUTLINE, self.thumbnails, self.prefetcher)
+        self.right_panel = ItemListPanel("In Preset", "Remove Filtered", ft.Icons.DELETE, ft.Colors.RED_700, self.remove_items_bulk, self.remove_single_item, ft.Icons.HIGHLIGHT_OFF, self.thumbnails, self.prefetcher)
 
         self.preset_dropdown = ft.Dropdown(
             label="Select Preset", 
@@ -156,7 +218,12 @@ class PresetManager(ft.Column):
         self.update_preset_dropdown()
 
         self.filename_input = ft.TextField(label="Save as", suffix_text=".json", text_size=12, expand=True, dense=True, height=35)
+        self.search_input = ft.TextField(label="Search", prefix_icon=ft.Icons.SEARCH, text_size=12, width=220, dense=True, height=35, on_change=self.on_search_change)
         
+        self.loading_bar = ft.ProgressBar(width=300, value=0, color=ft.Colors.INDIGO_400, bgcolor=ft.Colors.GREY_800)
+        self.loading_text = ft.Text("Loading items...", size=11, color=ft.Colors.GREY_400)
+        self.loading_row = ft.Row([self.loading_bar, self.loading_text], vertical_alignment=ft.CrossAxisAlignment.CENTER)
+
         # Compact Filter Container with reduced internal padding
         filter_container = ft.Container(content=ft.Column([
             ft.Row([
@@ -164,7 +231,9 @@ class PresetManager(ft.Column):
                 ft.VerticalDivider(width=10, color=ft.Colors.TRANSPARENT),
                 ft.Row([ft.Text("Tier:", size=11, color=ft.Colors.GREY_500), self.tier_row], vertical_alignment=ft.CrossAxisAlignment.CENTER),
                 ft.VerticalDivider(width=10, color=ft.Colors.TRANSPARENT),
-                ft.Row([ft.Text("Ench:", size=11, color=ft.Colors.GREY_500), self.enchant_row], vertical_alignment=ft.CrossAxisAlignment.CENTER)
+                ft.Row([ft.Text("Ench:", size=11, color=ft.Colors.GREY_500), self.enchant_row], vertical_alignment=ft.CrossAxisAlignment.CENTER),
+                ft.VerticalDivider(width=10, color=ft.Colors.TRANSPARENT),
+                self.search_input
             ], vertical_alignment=ft.CrossAxisAlignment.CENTER),
             ft.Divider(height=2, color=ft.Colors.GREY_900),
             ft.Column([ft.Text("Category:", size=11, color=ft.Colors.GREY_500), self.cat_row], spacing=0),
@@ -181,29 +250,48 @@ class PresetManager(ft.Column):
                 ft.IconButton(icon=ft.Icons.SAVE, on_click=self.save_preset_click, icon_color=ft.Colors.GREEN_400, tooltip="Save")
             ], alignment=ft.MainAxisAlignment.START, vertical_alignment=ft.CrossAxisAlignment.CENTER), padding=5, bgcolor=ft.Colors.BLACK26, border_radius=5, margin=10),
             filter_container,
+            self.loading_row,
             ft.Divider(height=10, color=ft.Colors.TRANSPARENT), # Padding
             ft.Row([self.left_panel, ft.VerticalDivider(width=1, color=ft.Colors.GREY_800), self.right_panel], expand=True)
         ]
         self.apply_filters()
+        threading.Thread(target=self.load_items, daemon=True, name="preset-items").start()
 
-    def load_json_data(self):
-        if not os.path.exists(BOT_ITEMS_FILE): return {}
+    def load_items(self):
+        """Reads bot_items.json and feeds the index LOAD_CHUNK items at a time, redrawing the lists after each chunk."""
         try:
-            with open(BOT_ITEMS_FILE, "r", encoding="utf-8") as f: return json.load(f)
-        except: return {}
-
-    def parse_items(self, json_data):
-        objects = []
-        for cat, sub_cats in json_data.items():
-            for sub, items in sub_cats.items():
-                if isinstance(items, dict):
-                    for uid, name in items.items(): objects.append(ItemData(uid, name, cat, sub))
-                elif isinstance(items, list):
-                    for uid in items: objects.append(ItemData(uid, uid, cat, sub))
-        return objects
+            bot_items = load_bot_items(BOT_ITEMS_FILE)
+            self.categories = bot_items["categories"]
+            self.load_category_chips()
+            if self.cat_row.page: self.cat_row.update()
+
+            entries = bot_items["entries"]
+            for start in range(0, len(entries), LOAD_CHUNK):
+                chunk = self.parse_items(entries[start:start + LOAD_CHUNK])
+                with self._lock:
+                    self.all_item_objects.extend(chunk)
+                    self.index.add(chunk)
+                    # A preset loaded meanwhile may name items of this chunk
+                    self.preset_mask = self.index.mask_of(self.preset_set)
+                self.show_loading(len(self.all_item_objects), len(entries))
+                self.apply_filters()
+        except Exception as e:
+            print(f"[Presets] Could not load {BOT_ITEMS_FILE}: {e}")
+        self.loading = False
+        self.loading_row.visible = False
+        if self.loading_row.page: self.loading_row.update()
+
+    def show_loading(self, done: int, total: int):
+        self.loading_bar.value = done / total if total else 1
+        self.loading_text.value = f"Loading items... {done}/{total}"
+        if self.loading_row.page: self.loading_row.update()
+
+    def parse_items(self, entries):
+        catalog = ItemCatalog()
+        return [ItemData(catalog.get(uid), name, cat, sub) for uid, name, cat, sub in entries]
 
     def load_category_chips(self):
-        self.cat_row.controls = [ft.Chip(label=ft.Text(cat, size=11), on_select=self.on_cat_toggle, data=cat, label_padding=ft.padding.symmetric(horizontal=4)) for cat in self.raw_json.keys()]
+        self.cat_row.controls = [ft.Chip(label=ft.Text(cat, size=11), on_select=self.on_cat_toggle, data=cat, label_padding=ft.padding.symmetric(horizontal=4)) for cat in self.categories]
 
     def update_preset_dropdown(self):
         files = self.config.get_presets_list()
@@ -223,7 +311,7 @@ class PresetManager(ft.Column):
     def reload_sub_categories(self):
         self.sub_row.controls.clear()
         if self.selected_cat:
-            sub_cats = self.raw_json.get(self.selected_cat, {}).keys()
+            sub_cats = self.categories.get(self.selected_cat, [])
             for sub in sub_cats: 
                 self.sub_row.controls.append(ft.Chip(label=ft.Text(sub, size=11), on_select=self.on_sub_toggle, data=sub, label_padding=ft.padding.symmetric(horizontal=4)))
         if self.sub_row.page: self.sub_row.update()
@@ -246,25 +334,45 @@ class PresetManager(ft.Column):
         else: self.selected_enchants.discard(en)
         self.apply_filters()
 
-    def apply_filters(self):
-        filtered = []
-        for item in self.all_item_objects:
-            if self.selected_cat and item.category != self.selected_cat: continue
-            if self.selected_sub and item.sub_category != self.selected_sub: continue
-            if self.selected_tiers and item.tier not in self.selected_tiers: continue
-            if self.selected_enchants and item.enchant not in self.selected_enchants: continue
-            filtered.append(item)
-        
-        self.left_panel.update_list([i for i in filtered if i.unique_name not in self.preset_set])
-        self.right_panel.update_list([i for i in filtered if i.unique_name in self.preset_set])
+    def on_search_change(self, e):
+        self.search_text = e.control.value or ""
+        self.apply_filters()
 
-    def add_single_item(self, item): self.preset_set.add(item.unique_name); self.apply_filters()
-    def remove_single_item(self, item): self.preset_set.discard(item.unique_name); self.apply_filters()
+    def apply_filters(self):
+        # Bitset intersections on the prebuilt index, see utils/item_index.py
+        with self._lock:
+            mask = self.index.query(self.selected_cat, self.selected_sub, self.selected_tiers, self.selected_enchants, self.search_text)
+            self.left_panel.update_list(self.index.items_of(mask & ~self.preset_mask))
+            self.right_panel.update_list(self.index.items_of(mask & self.preset_mask))
+        # Visible rows of both panels first, then the rest of the filter in list order
+        visible = [row.item.unique_name for panel in (self.left_panel, self.right_panel) for row in panel.rows if row.item is not None]
+        self.prefetcher.prefetch(visible + [i.unique_name for i in self.index.items_of(mask)])
+
+    def will_unmount(self):
+        self.prefetcher.close() # Also writes the cache index
+
+    def on_thumbnail(self, unique_name, path):
+        self.left_panel.show_thumbnail(unique_name, path)
+        self.right_panel.show_thumbnail(unique_name, path)
+
+    def set_preset(self, unique_names):
+        with self._lock:
+            self.preset_set = set(unique_names)
+            self.preset_mask = self.index.mask_of(self.preset_set)
+
+    def add_single_item(self, item): self.add_items_bulk([item])
+    def remove_single_item(self, item): self.remove_items_bulk([item])
     def add_items_bulk(self, items): 
-        for i in items: self.preset_set.add(i.unique_name)
+        names = [i.unique_name for i in items]
+        with self._lock:
+            self.preset_set.update(names)
+            self.preset_mask |= self.index.mask_of(names)
         self.apply_filters()
     def remove_items_bulk(self, items): 
-        for i in items: self.preset_set.discard(i.unique_name)
+        names = [i.unique_name for i in items]
+        with self._lock:
+            self.preset_set.difference_update(names)
+            self.preset_mask &= ~self.index.mask_of(names)
         self.apply_filters()
 
     def load_preset_click(self, e):
@@ -274,7 +382,7 @@ class PresetManager(ft.Column):
             return
         try:
             with open(os.path.join(PRESETS_DIR, fname), "r") as f: 
-                self.preset_set = set(json.load(f))
+                self.set_preset(json.load(f))
             
             self.filename_input.value = fname.replace(".json", "")
             if self.filename_input.page: 
@@ -553,44 +661,93 @@ def main(page: ft.Page):
 
     config_manager = ConfigManager()
 
-    log_output = ft.TextField(value="--- Bot Logs ---\n", multiline=True, read_only=True, text_size=12, expand=True, bgcolor=ft.Colors.BLACK38, border_color=ft.Colors.GREY_800, text_style=ft.TextStyle(font_family="Consolas"))
-    
-    def log_msg(msg): 
-        if page: log_output.value += "\n"+msg; page.update()
-    
-    sys.stdout = ConsoleRedirector(log_msg)
-    sys.stderr = ConsoleRedirector(log_msg)
+    # Every print() lands in a ring buffer and logs/bot.log, the console redraws from it a few times per second
+    log_buffer = LogBuffer(log_file=LogFile())
+    log_console = LogConsole(log_buffer)
+    sys.stdout = ConsoleStream(log_buffer)
+    sys.stderr = ConsoleStream(log_buffer, default_level=ERROR)
 
     bot = None
-    def run_bot(task_name: str):
+    def get_bot():
         nonlocal bot
         if not bot:
             try:
                 print("Initializing bot...")
+                from bot import TradeBot
+                from database.interface import DatabaseInterface
                 bot = TradeBot(db=DatabaseInterface())
                 print("Bot initialized.")
             except Exception as e:
                 print(f"Error initializing bot: {e}")
-                return
-        
+                return None
+        return bot
+
+    scheduler = JobScheduler(get_bot)
+    progress_text = ft.Text("Idle", size=12, color=ft.Colors.GREY_400)
+    progress_bar = ft.ProgressBar(width=400, value=0, visible=False, color=ft.Colors.INDIGO_400, bgcolor=ft.Colors.GREY_800)
+    progress_row = ft.Column([progress_bar, progress_text], spacing=4)
+
+    def run_bot(job_name: str):
+        scheduler.start(job_name)
+
+    job_buttons = [
+        ft.ElevatedButton("Check Prices", icon=ft.Icons.SEARCH, on_click=lambda e: run_bot("check_price"), bgcolor=ft.Colors.INDIGO_600, color="white"),
+        ft.ElevatedButton("Check Preset", icon=ft.Icons.MANAGE_SEARCH, on_click=lambda e: run_bot("check_price_preset"), bgcolor=ft.Colors.INDIGO_400, color="white"),
+        ft.ElevatedButton("Buy Items", icon=ft.Icons.SHOPPING_CART, on_click=lambda e: run_bot("buy_items"), bgcolor=ft.Colors.TEAL_600, color="white"),
+        ft.ElevatedButton("Trade Route", icon=ft.Icons.ROUTE, on_click=lambda e: run_bot("trade_route"), bgcolor=ft.Colors.BLUE_GREY_600, color="white"),
+    ]
+
+    def on_progress(p):
+        # Pushed by the scheduler's worker thread on every state change, no polling
+        active = p["state"] in ACTIVE_JOB_STATES
+        progress_text.value = f"{p['job']}: {p['state']} | {p['done']}/{p['total']} done, {p['failed']} failed | {p['city'] or '-'} | {p['current'] or ''}"
+        progress_bar.visible = active
+        progress_bar.value = p["done"] / p["total"] if p["total"] else None
+        for button in job_buttons:
+            button.disabled = active # One job at a time, they all drive the same game window
+        if progress_row.page:
+            progress_row.update()
+            for button in job_buttons: button.update()
+
+    scheduler.add_listener(on_progress)
+
+    def shutdown(e=None):
+        scheduler.cancel()
+        if not scheduler.wait(JOB_STOP_TIMEOUT):
+            print(f"[Scheduler] Job still running after {JOB_STOP_TIMEOUT}s, shutting down anyway.")
         if bot:
-            task_to_run = getattr(bot, task_name, None)
-            if callable(task_to_run):
-                threading.Thread(target=task_to_run, daemon=True).start()
+            bot.shutdown()
+        log_buffer.close()
+
+    def on_window_event(e):
+        if e.data == "close":
+            shutdown()
+            page.window.destroy()
+
+    # Stop the job, the sniffer and the DB writer (flushing it) before the window goes away
+    page.window.prevent_close = True
+    page.window.on_event = on_window_event
+    page.on_disconnect = shutdown
 
     dash = ft.Container(content=ft.Column([
         ft.Text("Dashboard", size=24, weight=ft.FontWeight.BOLD),
         ft.Divider(),
         ft.Row([
-            ft.ElevatedButton("Check Prices", icon=ft.Icons.SEARCH, on_click=lambda e: run_bot("check_price"), bgcolor=ft.Colors.INDIGO_600, color="white"),
-            ft.ElevatedButton("Buy Items", icon=ft.Icons.SHOPPING_CART, on_click=lambda e: run_bot("buy_items"), bgcolor=ft.Colors.TEAL_600, color="white")
+            *job_buttons,
+            ft.ElevatedButton("Cancel", icon=ft.Icons.STOP, on_click=lambda e: scheduler.cancel(), bgcolor=ft.Colors.RED_700, color="white"),
         ]),
+        progress_row,
         ft.Divider(),
-        ft.Container(content=log_output, expand=True, border_radius=5)
+        log_console
     ]), padding=20, expand=True)
 
     config_tab = ft.Container(content=ConfigTab(config_manager), padding=20, expand=True)
     preset_manager = ft.Container(content=PresetManager(config_manager), padding=20, expand=True)
+    metrics_tab = ft.Container(content=ft.Column([
+        ft.Text("Health", size=24, weight=ft.FontWeight.BOLD),
+        ft.Divider(),
+        MetricsPanel(),
+    ]), padding=20, expand=True)
     
     # Hook to refresh presets dropdown when switching tabs
     def on_tab_change(e):
@@ -602,9 +759,23 @@ def main(page: ft.Page):
     t = ft.Tabs(selected_index=0, expand=True, on_change=on_tab_change, tabs=[
         ft.Tab(text="Dashboard", icon=ft.Icons.DASHBOARD, content=ft.Column([dash], scroll=ft.ScrollMode.AUTO, expand=True)),
         ft.Tab(text="Items Presets", icon=ft.Icons.LIST_ALT, content=ft.Column([preset_manager], scroll=ft.ScrollMode.AUTO, expand=True)),
-        ft.Tab(text="Bot Configuration", icon=ft.Icons.SETTINGS, content=ft.Column([config_tab], scroll=ft.ScrollMode.AUTO, expand=True))
+        ft.Tab(text="Bot Configuration", icon=ft.Icons.SETTINGS, content=ft.Column([config_tab], scroll=ft.ScrollMode.AUTO, expand=True)),
+        ft.Tab(text="Health", icon=ft.Icons.MONITOR_HEART, content=ft.Column([metrics_tab], scroll=ft.ScrollMode.AUTO, expand=True))
     ])
     page.add(t)
+    # The window is up: import the bot's heavy dependencies while the user looks around,
+    # so the first button press does not wait for them
+    threading.Thread(target=warm_up, daemon=True).start()
+
+def warm_up():
+    start = time.perf_counter()
+    for module in WARM_UP_MODULES:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            # Reported again, with context, when the bot is actually built
+            print(f"[Startup] Could not preload {module}: {e}")
+    print(f"[Startup] Bot dependencies preloaded in {time.perf_counter() - start:.1f}s")
 
 if __name__ == "__main__":
     ft.app(target=main)
\ No newline at end of file
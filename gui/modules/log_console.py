@@ -0,0 +1,55 @@
+# gui/log_console.py
+import threading
+import time
+import flet as ft
+from utils.logger import LogBuffer, WARNING, ERROR
+
+FLUSH_INTERVAL = 0.25 # s, at most 4 redraws per second however much is logged
+MAX_VISIBLE_LINES = 300
+LEVEL_COLORS = {ERROR: ft.Colors.RED_300, WARNING: ft.Colors.AMBER_300}
+
+class LogConsole(ft.Container):
+    """
+    Shows the tail of a LogBuffer. A daemon thread polls the buffer every FLUSH_INTERVAL and adds
+    the new lines in one update, dropping the oldest ones past MAX_VISIBLE_LINES.
+    """
+    def __init__(self, buffer: LogBuffer, height: int = 400):
+        # Fixed height: the dashboard column scrolls, an unbounded ListView inside it would not lay out
+        super().__init__(height=height, border_radius=5, bgcolor=ft.Colors.BLACK38, border=ft.border.all(1, ft.Colors.GREY_800), padding=5)
+        self.buffer = buffer
+        self.last_seq = 0
+        self.lines = ft.ListView(expand=True, spacing=0, auto_scroll=True, controls=[self.line_control("--- Bot Logs ---", None)])
+        self.content = self.lines
+        self.running = False
+
+    @staticmethod
+    def line_control(text: str, level) -> ft.Text:
+        return ft.Text(text, size=12, font_family="Consolas", color=LEVEL_COLORS.get(level, ft.Colors.GREY_300), selectable=True, no_wrap=False)
+
+    def did_mount(self):
+        self.running = True
+        threading.Thread(target=self._run, daemon=True, name="log-console").start()
+
+    def will_unmount(self):
+        self.running = False
+
+    def _run(self):
+        while self.running:
+            time.sleep(FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception:
+                pass # Page closing, nothing left to draw on
+
+    def flush(self) -> int:
+        records = self.buffer.since(self.last_seq, MAX_VISIBLE_LINES)
+        if not records:
+            return 0
+        self.last_seq = records[-1].seq
+        controls = self.lines.controls
+        controls.extend(self.line_control(r.format(), r.level) for r in records)
+        if len(controls) > MAX_VISIBLE_LINES:
+            del controls[:len(controls) - MAX_VISIBLE_LINES]
+        if self.lines.page:
+            self.lines.update()
+        return len(records)
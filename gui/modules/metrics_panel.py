@@ -0,0 +1,78 @@
+# gui/metrics_panel.py
+import threading
+import time
+import flet as ft
+from utils.metrics import METRICS, MetricsRegistry
+
+REFRESH_INTERVAL = 1.0 # s
+ITEM_RATE_WINDOW = 60.0 # s, an item takes seconds to process: a shorter window flips between 0 and 60+/min
+
+class StatTile(ft.Container):
+    def __init__(self, label: str, width: int = 150):
+        super().__init__(width=width, padding=8, bgcolor=ft.Colors.BLACK26, border_radius=5, border=ft.border.all(1, ft.Colors.GREY_800))
+        self.value_text = ft.Text("-", size=20, weight=ft.FontWeight.BOLD)
+        self.content = ft.Column([ft.Text(label, size=11, color=ft.Colors.GREY_400), self.value_text], spacing=2)
+
+    def show(self, value: str) -> None:
+        self.value_text.value = value
+
+class MetricsPanel(ft.Container):
+    """
+    Throughput and health of the running bot, redrawn every REFRESH_INTERVAL from the shared
+    metrics registry: sniffer/DB/bot rates, DB queue depth, current step and latency percentiles.
+    """
+    def __init__(self, registry: MetricsRegistry = METRICS):
+        super().__init__(padding=5)
+        self.registry = registry
+        self.sampler = registry.sampler()
+        self.item_sampler = registry.sampler(ITEM_RATE_WINDOW)
+        self.running = False
+        self.tiles = {
+            "packets": StatTile("Packets/s"),
+            "messages": StatTile("Messages/s"),
+            "orders": StatTile("Orders captured/s"),
+            "queue": StatTile("DB queue"),
+            "items": StatTile("Items/min"),
+        }
+        self.step_text = ft.Text("Idle", size=12, color=ft.Colors.GREY_300, no_wrap=True, overflow=ft.TextOverflow.ELLIPSIS)
+        self.latency_table = ft.DataTable(
+            columns=[ft.DataColumn(ft.Text(h, size=11)) for h in ("Step", "Count", "p50 ms", "p95 ms", "p99 ms")],
+            rows=[], heading_row_height=28, data_row_min_height=24, data_row_max_height=24, column_spacing=24,
+        )
+        self.content = ft.Column([
+            ft.Row(list(self.tiles.values()), wrap=True, spacing=8),
+            ft.Row([ft.Text("Step:", size=12, color=ft.Colors.GREY_500), self.step_text]),
+            self.latency_table,
+        ], spacing=8)
+
+    def did_mount(self):
+        self.running = True
+        threading.Thread(target=self._run, daemon=True, name="metrics-panel").start()
+
+    def will_unmount(self):
+        self.running = False
+
+    def _run(self):
+        while self.running:
+            try:
+                self.refresh()
+            except Exception:
+                pass # Page closing
+            time.sleep(REFRESH_INTERVAL)
+
+    def refresh(self) -> None:
+        sample = self.registry.sample(self.sampler)
+        rates, gauges = sample["rates"], sample["gauges"]
+        self.tiles["packets"].show(f"{rates.get('sniffer.packets', 0):.0f}")
+        self.tiles["messages"].show(f"{rates.get('sniffer.messages', 0):.0f}")
+        self.tiles["orders"].show(f"{rates.get('sniffer.orders', 0):.1f}")
+        depth = gauges.get("db.queue_depth")
+        self.tiles["queue"].show("-" if depth is None else str(depth))
+        self.tiles["items"].show(f"{self.item_sampler.rates().get('bot.items', 0) * 60:.1f}")
+        self.step_text.value = str(gauges.get("bot.step") or "Idle")
+        self.latency_table.rows = [
+            ft.DataRow(cells=[ft.DataCell(ft.Text(str(v), size=11)) for v in (name, h["count"], h["p50_ms"], h["p95_ms"], h["p99_ms"])])
+            for name, h in sample["latency"].items()
+        ]
+        if self.page:
+            self.update()
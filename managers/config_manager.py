@@ -21,6 +21,11 @@ DEFAULT_SETTINGS = {
     "buy_amount_under_100k": "",
     "buy_amount_under_200k": "",
     "buy_amount_under_1m": "",
+    "input_backend": "pyautogui",
+    "input_action_gap": 0.05,
+    "capture_print_window": False, # True: full-window PrintWindow per grab, for a client behind other windows
+    "metrics_port": 9105,
+    "metrics_export_file": os.path.join("logs", "latency.json"),
 }
 
 class ConfigManager:
@@ -1,82 +1,134 @@
 from core.capture import WindowCapture
 from core.input import InputSender
-from config import MOUSE_POSITIONS, CAPTURE_POSITIONS, ITEM_DATA, LANGUAGE
+from core.preprocess import Preprocess
+from core.settle import UiSettle
+from core.timing import TimingProfile
+from config import MOUSE_POSITIONS, CAPTURE_POSITIONS, OCR_PREPROCESS, LANGUAGE
+from utils.items import ItemCatalog
+from utils.tracing import traced
 
-class MarketManager(InputSender):
-    def __init__(self, capture: WindowCapture = None):
-        super().__init__()
+class MarketManager:
+    def __init__(self, capture: WindowCapture = None, input_sender: InputSender = None, timing: TimingProfile = None):
+        if input_sender == None:
+            input_sender = InputSender()
+        self.input = input_sender
         if capture == None:
             capture = WindowCapture(window_name="Albion Online Client")
         self.mouse_positions = MOUSE_POSITIONS["2560x1600"]["market"]
         self.capture_positions = CAPTURE_POSITIONS["2560x1600"]["market"]
-        self.items = { item["UniqueName"]: item for item in ITEM_DATA }
+        self.preprocess = {name: Preprocess.from_dict(options) for name, options in OCR_PREPROCESS.get("2560x1600", {}).get("market", {}).items()}
+        self.catalog = ItemCatalog()
         self.capture = capture
+        self.settle = UiSettle(capture)
+        self.timing = timing if timing is not None else TimingProfile.load()
         self.lang = LANGUAGE
 
     def __repr__(self) -> str:
-        return f"MarketManager: {self.mouse_positions["search"]}"
+        return f"MarketManager: {self.mouse_positions['search']}"
+
+    # --- Input, forwarded to the InputSender (pyautogui, SendInput, recording or simulated) ---
+
+    def sleep(self, seconds: float) -> None:
+        self.input.sleep(seconds)
+
+    def typewrite(self, text: str | int) -> None:
+        self.input.typewrite(text)
+
+    def press(self, keycode: str) -> None:
+        self.input.press(keycode)
+
+    def click(self, position: list[int], clicks: int = 1, interval: float = 0.02) -> None:
+        self.input.click(position, clicks=clicks, interval=interval)
+
+    def click_and_settle(self, action: str, position: list[int], region_name: str, template: str = None,
+                         timeout: float = 1.0, clicks: int = 1, interval: float = 0.02) -> float:
+        """Clicks, then waits until the given capture region stops changing instead of sleeping a fixed time."""
+        region = self.capture_positions[region_name]
+        before = self.settle.sample(region)
+        self.click(position, clicks=clicks, interval=interval)
+        return self.wait_settled(action, region, before, template, timeout)
+
+    def wait_settled(self, action: str, region: list[int], before=None, template: str = None, timeout: float = 1.0) -> float:
+        """UiSettle wait whose timeout comes from the machine's timing profile ('timeout' until it has enough samples)."""
+        key = "settle." + action
+        elapsed = self.settle.wait(action, region, before=before, template=template, timeout=self.timing.delay(key, timeout))
+        self.timing.observe(key, elapsed, ok=not self.settle.last_timed_out)
+        return elapsed
     
+    @traced("market.get_market_title")
     def get_market_title(self) -> str:
-        return self.capture.get_text_from_screenshot(self.capture_positions["title"]).replace("marketplace", "").strip().replace(" ", "_")
+        return self.capture.get_text_from_screenshot(self.capture_positions["title"], preprocess=self.preprocess.get("title")).replace("marketplace", "").strip().replace(" ", "_")
+
+    def read_texts(self, *names: str) -> dict:
+        """OCR of several named capture regions from one grab, e.g. read_texts("title", "stats")."""
+        regions = {name: self.capture_positions[name] for name in names}
+        results = self.capture.read_regions(regions, preprocess=self.preprocess)
+        return {name: result["text"] for name, result in results.items()}
 
+    @traced("market.check_pages")
     def check_pages(self) -> None:
-        self.click(self.mouse_positions["next_page"], clicks=5, interval=0.2)
-        self.sleep(0.5)
+        self.click_and_settle("check_pages", self.mouse_positions["next_page"], "settle_list", clicks=5, interval=0.2)
     
     def get_name_from_unique(self, unique_name) -> str | None:
-        if unique_name in self.items:
-            return self.items[unique_name]["LocalizedNames"].get(self.lang, "Language not found")
+        if unique_name in self.catalog:
+            return self.catalog.get(unique_name).localized_names.get(self.lang, "Language not found")
         return None
     
+    @traced("market.check_item_stats")
     def check_item_stats(self) -> None:
-        if self.capture.get_text_from_screenshot(self.capture_positions["stats"]) != "sell orders":
-            self.click(self.mouse_positions["button_extend_item_statistic"])
-            self.sleep(0.5)
+        if not self.capture.match_label(self.capture_positions["stats"], "sell orders", preprocess=self.preprocess.get("stats")):
+            self.click_and_settle("check_item_stats", self.mouse_positions["button_extend_item_statistic"], "settle_stats", template="sell_orders")
         
+    @traced("market.search_item")
     def search_item(self, name: str, from_db: bool = False, black_market: bool = False) -> None:
-        tier = name.split("_")[0][1]
-        enchant = "0"
-        if name.split("@")[-1][0] != "T":
-            enchant = name.split("@")[-1][0]
-
-        if from_db == True:
-            name_from_unique = self.get_name_from_unique(name)
-            if name_from_unique != None:
-                name = self.get_name_from_unique(name)
-
-        self.click(self.mouse_positions["search_reset"])
-        self.click(self.mouse_positions["search"])
         if black_market == False:
-            name = name+f" {tier}_{enchant}"
-        self.typewrite(name)
-        self.sleep(0.3)
+            key = self.catalog.get(name)
+            if from_db == True and key.localized_names:
+                name = key.search_text
+            else:
+                name = f"{key.unique_name} {key.tier}_{key.enchant}"
+        elif from_db == True:
+            name = self.get_name_from_unique(name) or name
+
+        self.search_text(name)
 
+    @traced("market.search_text")
+    def search_text(self, text: str) -> None:
+        """Types raw text into the market search box."""
+        region = self.capture_positions["settle_list"]
+        with self.input.batch():
+            self.click(self.mouse_positions["search_reset"])
+            self.click(self.mouse_positions["search"])
+        before = self.settle.sample(region)
+        self.typewrite(text)
+        self.wait_settled("search", region, before, timeout=0.8)
+
+    @traced("market.change_tab")
     def change_tab(self, name: str) -> None:
-        self.click(self.mouse_positions["tab_"+name])
-        self.sleep(0.5)
+        self.click_and_settle("change_tab", self.mouse_positions["tab_"+name], "settle_list")
 
+    @traced("market.open_item")
     def open_item(self) -> None:
-        self.click(self.mouse_positions["button_buy"])
+        self.click_and_settle("open_item", self.mouse_positions["button_buy"], "settle_popup")
         self.check_item_stats()
-        self.sleep(0.5)
 
+    @traced("market.close_item")
     def close_item(self) -> None:
-        self.click(self.mouse_positions["button_close_order_popup"])
-        self.sleep(0.5)
+        self.click_and_settle("close_item", self.mouse_positions["button_close_order_popup"], "settle_popup")
 
+    @traced("market.buy_item")
     def buy_item(self, amount: int = 10, fast_buy: bool = False, fast_buy_price: int = 1) -> None:
-        self.click(self.mouse_positions["button_buy_order"])
-        self.click(self.mouse_positions["button_change_amount"])
-        self.click(self.mouse_positions["button_amount_more"], clicks=amount-1)
-
-        if fast_buy == True:
-            self.click(self.mouse_positions["button_change_price"])
-            self.typewrite(fast_buy_price)
-        else:
-            self.click(self.mouse_positions["button_one_silver_more"])
+        # The order form is filled in one queued sequence, only the order creation waits on the UI
+        with self.input.batch():
+            self.click(self.mouse_positions["button_buy_order"])
+            self.click(self.mouse_positions["button_change_amount"])
+            self.click(self.mouse_positions["button_amount_more"], clicks=amount-1)
 
-        self.click(self.mouse_positions["button_create_order"])
-        self.sleep(0.2)
-        self.click(self.mouse_positions["button_crate_order_confirmation"])
+            if fast_buy == True:
+                self.click(self.mouse_positions["button_change_price"])
+                self.typewrite(fast_buy_price)
+            else:
+                self.click(self.mouse_positions["button_one_silver_more"])
 
-        self.sleep(0.5)
\ No newline at end of file
+        self.click_and_settle("create_order", self.mouse_positions["button_create_order"], "settle_popup", timeout=0.5)
+        self.click_and_settle("confirm_order", self.mouse_positions["button_crate_order_confirmation"], "settle_popup")
\ No newline at end of file
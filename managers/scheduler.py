@@ -0,0 +1,225 @@
+import threading
+from managers.state import CheckpointStore
+from managers.search_planner import SearchGroup
+from utils.helper import ITEMS_BLACK_MARKET
+
+# Order in which markets are visited, the Black Market sits next to Caerleon
+CITY_ROUTE = ["fort_sterling", "lymhurst", "bridgewatch", "martlock", "thetford", "caerleon", "black_market", "brecilien"]
+BLACK_MARKET = "black_market"
+# Market tab each task kind runs on
+TASK_TABS = {"check_price": "buy", "buy": "create_buy_order"}
+JOBS = ["check_price", "check_price_preset", "buy_items", "trade_route"]
+
+MAX_CONSECUTIVE_FAILURES = 3
+TRAVEL_POLL_SECONDS = 5
+
+class JobScheduler:
+    """
+    Runs bot jobs as lists of per-city, per-item tasks on a single worker thread.
+    Progress is checkpointed after every task, so a crashed or cancelled job resumes where it stopped.
+    """
+    def __init__(self, bot_factory, store: CheckpointStore = None):
+        self.bot_factory = bot_factory # Called on the worker thread, returns a TradeBot or None
+        self.store = store if store is not None else CheckpointStore()
+        self._run_lock = threading.Lock()
+        self._progress_lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread = None
+        self._progress = {"job": None, "state": "idle", "done": 0, "total": 0, "failed": 0, "city": None, "current": None}
+        self.listeners = []
+
+    # --- Control (safe to call from the GUI thread) ---
+
+    def start(self, job_name: str, resume: bool = True) -> bool:
+        if job_name not in JOBS:
+            print(f"[Scheduler] Unknown job '{job_name}'.")
+            return False
+        if not self._run_lock.acquire(blocking=False):
+            print(f"[Scheduler] '{self.progress()['job']}' is already running, ignoring '{job_name}'.")
+            return False
+        self._cancel.clear()
+        self._set_progress(job=job_name, state="starting", done=0, total=0, failed=0, city=None, current=None)
+        self._thread = threading.Thread(target=self._run, args=(job_name, resume), daemon=True)
+        self._thread.start()
+        return True
+
+    def cancel(self) -> None:
+        if self.is_running():
+            print("[Scheduler] Cancelling after the current task...")
+            self._cancel.set()
+            self._set_progress(state="cancelling")
+
+    def wait(self, timeout: float = None) -> bool:
+        """Blocks until the running job has stopped. False if it is still running after 'timeout'."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return not self.is_running()
+
+    def add_listener(self, callback) -> None:
+        """callback(progress) is called with a copy of progress() on every change, from the worker thread."""
+        self.listeners.append(callback)
+
+    def is_running(self) -> bool:
+        return self._run_lock.locked()
+
+    def progress(self) -> dict:
+        with self._progress_lock:
+            return dict(self._progress)
+
+    def _set_progress(self, **values) -> None:
+        with self._progress_lock:
+            self._progress.update(values)
+            snapshot = dict(self._progress)
+        for callback in self.listeners:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"[Scheduler] Progress listener failed: {e}")
+
+    # --- Planning ---
+
+    def build_tasks(self, bot, job_name: str) -> list[dict]:
+        tasks = []
+        # Price checks run in whatever market is open, like TradeBot.check_price(); only the trade route
+        # needs Black Market prices to compare its buys against
+        check_city = BLACK_MARKET if job_name == "trade_route" else None
+        if job_name in ("check_price", "trade_route"):
+            for name in ITEMS_BLACK_MARKET.values():
+                tasks.append(self.make_task("check_price", "dictionary", check_city, name))
+        if job_name == "check_price_preset" or (job_name == "trade_route" and bot.config_manager.get("check_price_preset")):
+            for group in bot.search_planner.plan(bot.load_preset_items("check_price_preset")):
+                tasks.append(self.make_task("check_price", "preset", check_city, group.search_text, [k.unique_name for k in group.keys]))
+
+        if job_name == "buy_items":
+            cities = [bot.market_manager.get_market_title()]
+        elif job_name == "trade_route":
+            cities = [city for city in CITY_ROUTE if bot.config_manager.get(f"buy_items_preset_{city}")]
+        else:
+            cities = []
+
+        for city in cities:
+            for unique_name in bot.load_preset_items(f"buy_items_preset_{city}"):
+                tasks.append(self.make_task("buy", "preset", city, unique_name))
+        return tasks
+
+    @staticmethod
+    def make_task(kind: str, source: str, city: str | None, item: str, names: list[str] = None) -> dict:
+        """'city' None runs the task in the open market. 'source' keeps ids of equal search texts apart."""
+        return {"id": f"{kind}:{source}:{city or 'any'}:{item}", "kind": kind, "city": city, "item": item, "names": names or []}
+
+    @staticmethod
+    def order_tasks(tasks: list[dict], current_city: str) -> list[dict]:
+        """Current city (and tasks for any city) first, then along CITY_ROUTE; within a city tasks are grouped by market tab."""
+        start = CITY_ROUTE.index(current_city) if current_city in CITY_ROUTE else 0
+
+        def city_rank(city):
+            if city is None or city == current_city:
+                return -1
+            if city not in CITY_ROUTE:
+                return len(CITY_ROUTE)
+            return (CITY_ROUTE.index(city) - start) % len(CITY_ROUTE)
+
+        return sorted(tasks, key=lambda t: (city_rank(t["city"]), TASK_TABS[t["kind"]]))
+
+    # --- Execution (worker thread) ---
+
+    def _run(self, job_name: str, resume: bool) -> None:
+        try:
+            bot = self.bot_factory()
+            if bot is None:
+                self._set_progress(state="failed")
+                return
+            bot.cancelled.clear() # Left set if the last run was stopped through the bot itself
+            bot.capture.set_foreground_window()
+
+            state = self.store.load(job_name) if resume else None
+            if state and len(state["done"]) + len(state["failed"]) < len(state["tasks"]):
+                print(f"[Scheduler] Resuming '{job_name}': {len(state['done'])}/{len(state['tasks'])} tasks already done.")
+            else:
+                state = {"job": job_name, "tasks": self.build_tasks(bot, job_name), "done": [], "failed": []}
+                self.store.save(job_name, state)
+
+            current_city = bot.market_manager.get_market_title()
+            tasks = self.order_tasks(state["tasks"], current_city)
+            self._set_progress(state="running", total=len(tasks), done=len(state["done"]), failed=len(state["failed"]), city=current_city)
+            print(f"[Scheduler] Running '{job_name}' with {len(tasks)} tasks.")
+
+            if self._execute(bot, job_name, state, tasks, current_city):
+                self.store.clear(job_name)
+                self._set_progress(state="finished", current=None)
+                print(f"[Scheduler] '{job_name}' finished.")
+        except Exception as e:
+            print(f"[Scheduler] '{job_name}' stopped with error: {e}")
+            self._set_progress(state="failed")
+        finally:
+            self._run_lock.release()
+
+    def _execute(self, bot, job_name: str, state: dict, tasks: list[dict], current_city: str) -> bool:
+        processed = set(state["done"]) | set(state["failed"])
+        items_prices = None
+        active_tab = None
+        recent_failures = []
+
+        for task in tasks:
+            if task["id"] in processed:
+                continue
+            if self._cancel.is_set():
+                self._set_progress(state="cancelled", current=None)
+                print(f"[Scheduler] '{job_name}' cancelled, progress saved.")
+                return False
+
+            if task["city"] is not None and task["city"] != current_city:
+                if not self._wait_for_city(bot, task["city"]):
+                    continue
+                current_city = task["city"]
+                active_tab = None
+
+            tab = TASK_TABS[task["kind"]]
+            if tab != active_tab:
+                bot.market_manager.change_tab(tab)
+                active_tab = tab
+
+            self._set_progress(current=task["item"], city=current_city)
+            try:
+                if task["kind"] == "buy" and items_prices is None:
+                    items_prices = bot.db.get_all_prices_for_city(BLACK_MARKET)
+                self._run_task(bot, task, items_prices)
+                state["done"].append(task["id"])
+                recent_failures = []
+            except Exception as e:
+                print(f"[Scheduler] Task {task['id']} failed: {e}")
+                state["failed"].append(task["id"])
+                recent_failures.append(task["id"])
+
+            if len(recent_failures) >= MAX_CONSECUTIVE_FAILURES:
+                # Most likely a disconnect or a closed client: keep those tasks pending so a resume retries them
+                state["failed"] = [t for t in state["failed"] if t not in recent_failures]
+                self.store.save(job_name, state)
+                self._set_progress(state="paused", current=None, failed=len(state["failed"]))
+                print(f"[Scheduler] {len(recent_failures)} tasks failed in a row, pausing '{job_name}'.")
+                return False
+
+            self.store.save(job_name, state)
+            self._set_progress(done=len(state["done"]), failed=len(state["failed"]))
+        return True
+
+    def _run_task(self, bot, task: dict, items_prices: dict) -> None:
+        if task["kind"] == "check_price":
+            if task["names"]:
+                bot.check_price_group(SearchGroup(task["item"], [bot.catalog.get(n) for n in task["names"]]))
+            else:
+                bot.search_and_save_prices(task["item"], task["item"])
+        elif task["kind"] == "buy":
+            bot.buy_item_if_profitable(task["item"], items_prices)
+
+    def _wait_for_city(self, bot, city: str) -> bool:
+        """Blocks until the open market belongs to 'city'. Travel is manual, returns False on cancel."""
+        self._set_progress(state="waiting_for_travel", city=city, current=None)
+        print(f"[Scheduler] Waiting for travel to {city}...")
+        while not self._cancel.is_set():
+            if bot.market_manager.get_market_title() == city:
+                self._set_progress(state="running")
+                return True
+            self._cancel.wait(TRAVEL_POLL_SECONDS)
+        return False
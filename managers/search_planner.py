@@ -0,0 +1,50 @@
+from utils.items import ItemCatalog, ItemKey
+
+class SearchGroup:
+    """One market search covering one or more requested item variants."""
+    __slots__ = ("search_text", "keys")
+
+    def __init__(self, search_text: str, keys: list[ItemKey]):
+        self.search_text = search_text
+        self.keys = keys
+
+    @property
+    def is_batched(self) -> bool:
+        return len(self.keys) > 1
+
+    def __repr__(self) -> str:
+        return f"SearchGroup({self.search_text!r}, {len(self.keys)} items)"
+
+
+class SearchPlanner:
+    """
+    Groups preset items by their tier-less localized name, so all tiers/enchants
+    of an item ("Adept's Bag", "Elder's Bag@3", ...) are covered by a single search.
+    Only EN-US tier prefixes are stripped; in other client languages every item is searched on its own.
+    """
+    def __init__(self, catalog: ItemCatalog = None):
+        self.catalog = catalog if catalog is not None else ItemCatalog()
+
+    def plan(self, unique_names: list[str]) -> list[SearchGroup]:
+        groups = {}
+        singles = []
+        for name in unique_names:
+            key = self.catalog.get(name)
+            if key.base_search_text:
+                groups.setdefault(key.base_search_text, []).append(key)
+            else:
+                # Unknown to items.json, only the per-variant search can find it
+                singles.append(SearchGroup(key.search_text, [key]))
+
+        plan = []
+        for base_text, keys in groups.items():
+            if len(keys) == 1:
+                plan.append(SearchGroup(keys[0].search_text, keys))
+            else:
+                plan.append(SearchGroup(base_text, keys))
+        return plan + singles
+
+    @staticmethod
+    def missing(group: SearchGroup, found: dict) -> list[ItemKey]:
+        """Variants of a batched search that received no orders and need their own search."""
+        return [key for key in group.keys if key not in found]
@@ -0,0 +1,39 @@
+import json
+import os
+import time
+
+CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "checkpoints")
+
+class CheckpointStore:
+    """Persists scheduler job state as one JSON file per job, so interrupted runs can resume."""
+    def __init__(self, directory: str = CHECKPOINT_DIR):
+        self.directory = directory
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+    def path(self, job_name: str) -> str:
+        return os.path.join(self.directory, f"{job_name}.json")
+
+    def load(self, job_name: str) -> dict | None:
+        path = self.path(job_name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"[Checkpoint] Error loading {path}: {e}")
+            return None
+
+    def save(self, job_name: str, state: dict) -> None:
+        state["saved_at"] = time.time()
+        path = self.path(job_name)
+        tmp_path = path + ".tmp"
+        # Write then rename, a crash mid-write never leaves a truncated checkpoint behind
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def clear(self, job_name: str) -> None:
+        try: os.remove(self.path(job_name))
+        except FileNotFoundError: pass
@@ -1,13 +1,19 @@
-from scapy.all import sniff, UDP
 from .photon_layer import PhotonLayerDecoder
 from photon.decoder import PhotonDataDecoder
 import photon.constants as const
-from utils.items import ItemManager
+from utils.items import ItemCatalog
+from utils.metrics import METRICS
 import json
+import threading
 import struct
 import io
 import gzip
 
+def _scapy():
+    # scapy.all takes about a second to import, only pay for it once packets are needed
+    from scapy.all import AsyncSniffer, UDP
+    return AsyncSniffer, UDP
+
 class FragmentBuffer:
     def __init__(self):
         self.buffers = {}
@@ -32,32 +38,63 @@ class AlbionSniffer:
         self.layer_decoder = PhotonLayerDecoder()
         self.frag_buffer = FragmentBuffer()
         self.db = db_interface
-        self.items = ItemManager()
+        self.items = ItemCatalog()
         self.history_cache = {}
         self.market_data_buffer = []
         self.running = False
+        self.stop_requested = threading.Event() # Final: a stopped sniffer is not restarted
+        self.udp_layer = None
+        self.capture = None # scapy AsyncSniffer while start() runs
+        # Dashboard counters, bound once so the packet path only appends to them
+        self.packets = METRICS.counter("sniffer.packets")
+        self.messages = METRICS.counter("sniffer.messages")
+        self.orders = METRICS.counter("sniffer.orders")
 
     def clear_buffer(self):
         self.market_data_buffer = []
 
     def start(self, interface=None):
+        """Captures until stop() is called, blocking the calling thread. Returns at once if stop() came first."""
+        AsyncSniffer, self.udp_layer = _scapy()
+        if self.stop_requested.is_set():
+            return
         self.running = True
-        print(">>> Sniffer Started. Listening for Market Data...")
-        sniff(
+        # AsyncSniffer can be stopped from another thread right away, sniff()'s stop_filter
+        # only ran when the next packet arrived
+        self.capture = AsyncSniffer(
             filter="udp port 5056",
             prn=self.packet_callback,
             store=0,
             iface=interface,
-            stop_filter=lambda p: not self.running
+            stop_filter=lambda p: self.stop_requested.is_set(),
+            started_callback=self._capture_started,
         )
+        self.capture.start()
+        print(">>> Sniffer Started. Listening for Market Data...")
+        self.capture.join()
+        self.running = False
         print(">>> Sniffer Stopped.")
 
+    def _capture_started(self):
+        # Runs on the capture thread once it can be stopped: catches a stop() that found it not yet running
+        if self.stop_requested.is_set():
+            self.capture.stop_cb()
+
     def stop(self):
+        self.stop_requested.set()
         self.running = False
+        capture = self.capture
+        if capture is not None and capture.running:
+            try:
+                capture.stop(join=False)
+            except Exception as e:
+                print(f"[Sniffer] Could not stop capture: {e}")
 
     def packet_callback(self, packet):
+        UDP = self.udp_layer or _scapy()[1]
         if not packet.haslayer(UDP): return
         if packet[UDP].sport != 5056 and packet[UDP].dport != 5056: return
+        self.packets.add()
 
         try:
             payload = bytes(packet[UDP].payload)
@@ -83,6 +120,7 @@ class AlbionSniffer:
         stream = io.BytesIO(payload)
         stream.read(1) 
         msg_type = ord(stream.read(1))
+        self.messages.add()
 
         if msg_type == 2: # Request
             self.handle_request(stream)
@@ -171,6 +209,7 @@ class AlbionSniffer:
             data['item_db_name'] = data.get('ItemTypeId')
             # print(f"   >>> [MARKET] Found: {data['item_db_name']} | {data.get('UnitPriceSilver')} Silver")
             self.market_data_buffer.append(data)
+            self.orders.add()
             if self.db: self.db.add_order(data)
         except: pass
 
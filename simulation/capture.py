@@ -0,0 +1,51 @@
+from typing import Optional, Tuple
+import numpy as np
+from core.capture import WindowCapture
+from core.frames import FileFrameSource, NumpyFrameSource
+from core.preprocess import Preprocess
+
+class SimulatedCapture(WindowCapture):
+    """
+    WindowCapture serving a canned frame instead of a live window.
+    OCR reads of known regions return recorded text, other reads run the real OCR path on the frame.
+    """
+    def __init__(self, width: int = 2560, height: int = 1600, frame_path: Optional[str] = None,
+                 region_texts: Optional[dict] = None, regions: Optional[dict] = None, base_dir: str = "", debugging=False):
+        if frame_path:
+            frame_source = FileFrameSource(frame_path)
+        else:
+            frame_source = NumpyFrameSource(np.zeros((height, width, 4), dtype=np.uint8))
+        super().__init__(base_dir=base_dir, debugging=debugging, frame_source=frame_source)
+        # Region name -> recorded text, matched by the crop coordinates the managers pass in
+        region_texts = region_texts or {}
+        self.canned_texts = {tuple(pos): region_texts[name] for name, pos in (regions or {}).items() if name in region_texts}
+        self.frames_served = 0
+
+    def grab_region(self, region: Optional[Tuple[int, int, int, int]] = None) -> Optional[np.ndarray]:
+        self.frames_served += 1
+        return super().grab_region(region)
+
+    def get_text_from_screenshot(self, crop_screenshot_positions: Tuple[int, int, int, int], is_gray_reading: bool = True,
+                                 lowercase: bool = True, tesseract_config: str = "--psm 6", preprocess: Optional[Preprocess] = None) -> str:
+        text = self.canned_texts.get(tuple(crop_screenshot_positions))
+        if text is None:
+            return super().get_text_from_screenshot(crop_screenshot_positions, is_gray_reading, lowercase, tesseract_config, preprocess)
+        self.frames_served += 1
+        return text.lower() if lowercase else text
+
+    def read_regions(self, regions: dict, lowercase: bool = True, tesseract_config: str = "--psm 6", preprocess: Optional[dict] = None) -> dict:
+        live = {name: region for name, region in regions.items() if tuple(region) not in self.canned_texts}
+        results = super().read_regions(live, lowercase, tesseract_config, preprocess) if live else {}
+        for name, region in regions.items():
+            if name not in live:
+                text = self.canned_texts[tuple(region)]
+                results[name] = {"text": text.lower() if lowercase else text, "ms": 0.0}
+        if len(live) < len(regions):
+            self.frames_served += 1
+        return {name: results[name] for name in regions}
+
+    def set_foreground_window(self, max_wait_seconds=5) -> None:
+        pass
+
+    def is_foreground_window(self) -> bool:
+        return True
@@ -0,0 +1,25 @@
+class SimulatedDatabase:
+    """In-memory DatabaseInterface stand-in: serves recorded prices and keeps every write for inspection."""
+    def __init__(self, prices: dict = None):
+        self.prices = prices or {}
+        self.item_updates = []
+        self.orders = []
+        self.history = []
+
+    def add_order(self, order_dict):
+        self.orders.append(order_dict)
+
+    def add_history(self, history_list):
+        self.history.extend(history_list)
+
+    def add_mail(self, mail_dict):
+        pass
+
+    def update_item_prices(self, price_data_list):
+        self.item_updates.extend(price_data_list)
+
+    def get_all_prices_for_city(self, city: str) -> dict:
+        return dict(self.prices.get(city.lower().replace(" ", "_"), {}))
+
+    def close(self, timeout: float = 10.0) -> bool:
+        return True
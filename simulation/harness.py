@@ -0,0 +1,229 @@
+"""
+Headless end-to-end harness: runs TradeBot.check_price / buy_items unchanged against
+simulated input, capture, sniffer and database, then reports throughput, a per-step
+time breakdown and decision parity against a recorded run.
+
+    python -m simulation.harness simulation/recordings/sample.json --task buy_items
+"""
+import argparse
+import json
+import time
+from bot import TradeBot
+from config import MOUSE_POSITIONS, CAPTURE_POSITIONS
+from managers.config_manager import ConfigManager
+from managers.market import MarketManager
+from simulation.capture import SimulatedCapture
+from simulation.database import SimulatedDatabase
+from simulation.input import SimulatedInput
+from simulation.sniffer import ReplaySniffer
+from core.timing import TimingProfile
+from utils.tracing import TRACER
+
+TASKS = ["buy_items", "check_price", "check_price_preset"]
+# MarketManager actions timed as separate steps, everything else the bot does counts as "decision"
+STEPS = ["search_item", "search_text", "check_pages", "open_item", "close_item", "buy_item", "change_tab", "check_item_stats", "get_market_title"]
+
+
+class SimulatedConfigManager(ConfigManager):
+    """Settings from the recording, never written to disk."""
+    def __init__(self, settings: dict):
+        # No metrics server or export file unless the recording asks for them
+        self.settings = {"metrics_port": 0, "metrics_export_file": "", **settings}
+
+    def save_settings(self, new_settings):
+        self.settings = new_settings
+        return True
+
+
+class SimulatedTradeBot(TradeBot):
+    """TradeBot reading presets from the recording and tagging each item it works on."""
+    def __init__(self, presets: dict, on_item, time_scale: float = 1.0, **kwargs):
+        self.presets = presets
+        self.on_item = on_item
+        self.time_scale = time_scale
+        super().__init__(**kwargs)
+
+    def load_preset_items(self, setting_key):
+        if setting_key in self.presets:
+            return list(self.presets[setting_key])
+        return super().load_preset_items(setting_key)
+
+    def buy_item_if_profitable(self, item_unique_name, items_prices, fast_buy=False):
+        self.on_item(item_unique_name)
+        return super().buy_item_if_profitable(item_unique_name, items_prices, fast_buy)
+
+    def wait_for_market_data(self, key, default=.3):
+        # Items without a recorded response would otherwise cost the full real-time wait
+        return super().wait_for_market_data(key, default * self.time_scale)
+
+    def search_and_save_prices(self, search_text, label):
+        self.on_item(label)
+        return super().search_and_save_prices(search_text, label)
+
+
+class StepTimer:
+    """Wraps MarketManager actions on one instance and sums wall time per top-level call."""
+    def __init__(self):
+        self.totals = {}
+        self.calls = {}
+        self._depth = 0
+
+    def instrument(self, obj, names: list[str]) -> None:
+        for name in names:
+            setattr(obj, name, self._wrap(name, getattr(obj, name)))
+
+    def _wrap(self, name, func):
+        def timed(*args, **kwargs):
+            self._depth += 1
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._depth -= 1
+                # Nested actions (search_item -> search_text) are already inside the outer step
+                if self._depth == 0:
+                    self.totals[name] = self.totals.get(name, 0.0) + time.perf_counter() - start
+                    self.calls[name] = self.calls.get(name, 0) + 1
+        return timed
+
+
+class SimulationHarness:
+    def __init__(self, recording: dict, time_scale: float = 1.0):
+        self.recording = recording
+        self.time_scale = time_scale
+        self.resolution = recording.get("resolution", "2560x1600")
+
+    @classmethod
+    def from_file(cls, path: str, time_scale: float = 1.0):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), time_scale)
+
+    def build(self):
+        rec = self.recording
+        width, height = (int(v) for v in self.resolution.split("x"))
+        self.current_item = None
+        self.decisions = {}
+
+        self.input = SimulatedInput(MOUSE_POSITIONS[self.resolution]["market"], self.time_scale)
+        self.capture = SimulatedCapture(width, height, rec.get("frame"), rec.get("region_texts"), CAPTURE_POSITIONS[self.resolution]["market"])
+        self.sniffer = ReplaySniffer(rec.get("responses", {}), rec.get("latency", 0.05), self.time_scale)
+        self.sniffer.attach(self.input)
+        self.db = SimulatedDatabase(rec.get("prices"))
+        self.input.add_listener(self._track_decision)
+
+        # Fresh in-memory profile: recorded runs neither read nor overwrite this machine's timings
+        market_manager = MarketManager(capture=self.capture, input_sender=self.input, timing=TimingProfile())
+        # Simulated frames never change, only wait for a reaction as long as the scaled delays would
+        market_manager.settle.change_timeout *= self.time_scale
+        self.steps = StepTimer()
+        self.steps.instrument(market_manager, STEPS)
+
+        self.bot = SimulatedTradeBot(
+            rec.get("presets", {}), self._set_item, self.time_scale,
+            capture=self.capture, sniffer=self.sniffer, market_manager=market_manager,
+            db=self.db, config_manager=SimulatedConfigManager(rec.get("settings", {})),
+        )
+        self.steps.instrument(self.bot, ["wait_for_market_data"])
+        return self.bot
+
+    def _set_item(self, item: str) -> None:
+        self.current_item = item
+        self.sniffer.current_item = item
+        self.decisions.setdefault(item, {"action": "skip", "amount": 0})
+
+    def _track_decision(self, kind: str, target, count: int) -> None:
+        # Amount = 1 + clicks on "+", the order is placed when the create button is pressed
+        decision = self.decisions.get(self.current_item)
+        if decision is None or kind != "click":
+            return
+        if target == "button_amount_more":
+            decision["amount"] += count
+        elif target == "button_create_order":
+            decision["action"] = "buy"
+            decision["amount"] += 1
+
+    def run(self, task: str = "buy_items") -> dict:
+        if task not in TASKS:
+            raise ValueError(f"Unknown task '{task}', expected one of {TASKS}")
+        bot = self.build()
+        TRACER.reset()
+
+        start = time.perf_counter()
+        if task == "buy_items":
+            bot.buy_items()
+        else:
+            bot.check_price(isBlackMarket=(task == "check_price"))
+        elapsed = time.perf_counter() - start
+        self.sniffer.stop()
+
+        return self.report(task, elapsed)
+
+    def observed_decisions(self, task: str) -> dict:
+        if task == "buy_items":
+            return {item: d for item, d in self.decisions.items()}
+        prices = {}
+        for update in self.db.item_updates:
+            prices[update["unique_name"]] = update["price_black_market"]
+        return prices
+
+    def report(self, task: str, elapsed: float) -> dict:
+        items = len(self.decisions)
+        steps = {}
+        for name, total in self.steps.totals.items():
+            label = "sniffer_wait" if name == "wait_for_market_data" else name
+            steps[label] = {
+                "calls": self.steps.calls[name],
+                "total_s": round(total, 4),
+                "mean_ms": round(total / self.steps.calls[name] * 1000, 2),
+                "share": round(total / elapsed, 4) if elapsed else 0.0,
+            }
+        accounted = sum(self.steps.totals.values())
+        steps["decision"] = {"calls": items, "total_s": round(max(elapsed - accounted, 0.0), 4)}
+
+        report = {
+            "task": task,
+            "items": items,
+            "elapsed_s": round(elapsed, 3),
+            "items_per_minute": round(items / elapsed * 60, 2) if elapsed else 0.0,
+            "time_scale": self.time_scale,
+            "actions": len(self.input.actions),
+            "steps": dict(sorted(steps.items(), key=lambda kv: -kv[1]["total_s"])),
+            "trace": TRACER.snapshot(),
+        }
+
+        expected = self.recording.get("decisions", {}).get(task)
+        if expected is not None:
+            observed = self.observed_decisions(task)
+            mismatches = [
+                {"item": item, "expected": want, "observed": observed.get(item)}
+                for item, want in expected.items() if observed.get(item) != want
+            ]
+            report["parity"] = {
+                "matched": len(expected) - len(mismatches),
+                "total": len(expected),
+                "mismatches": mismatches,
+            }
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the trade bot against a recorded session, headless.")
+    parser.add_argument("recording", help="Recording JSON (see simulation/recordings/sample.json)")
+    parser.add_argument("--task", choices=TASKS, default="buy_items")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiplier for simulated delays, 0 skips them")
+    parser.add_argument("--output", help="Write the report JSON to this file")
+    args = parser.parse_args()
+
+    harness = SimulationHarness.from_file(args.recording, args.time_scale)
+    report = harness.run(args.task)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    parity = report.get("parity")
+    return 1 if parity and parity["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+import threading
+import time
+import zlib
+import struct
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+def solid_png(size: int, rgb: tuple) -> bytes:
+    """Smallest valid PNG of one colour, no imaging library needed."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+    row = b"\x00" + bytes(rgb) * size
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(row * size)) + chunk(b"IEND", b"")
+
+
+class StandInImageServer:
+    """
+    Local stand-in for render.albiononline.com: GET /<UniqueName>.png answers with a generated icon,
+    coloured by the base item so tiers/enchants of one item share their bytes like many real icons do.
+    Names listed in 'missing' get a 404. Counts requests, and 'latency' seconds delay each answer.
+
+        with StandInImageServer() as server:
+            cache = ThumbnailCache(directory, base_url=server.url)
+    """
+    def __init__(self, latency: float = 0.0, missing: set | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.missing = missing or set()
+        self.requests = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class ImageHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                name = urlparse(self.path).path.strip("/").removesuffix(".png")
+                if server.latency:
+                    time.sleep(server.latency)
+                if not name or name in server.missing:
+                    self.send_error(404)
+                    return
+                base = name.split("_", 1)[-1].split("@")[0]
+                shade = zlib.crc32(base.encode("utf-8"))
+                body = solid_png(16, (shade & 0xff, (shade >> 8) & 0xff, (shade >> 16) & 0xff))
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), ImageHandler)
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self) -> "StandInImageServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
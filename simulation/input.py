@@ -0,0 +1,30 @@
+import time
+from core.input import RecordingInputSender, TYPE_INTERVAL
+
+class SimulatedInput(RecordingInputSender):
+    """
+    RecordingInputSender that also spends the time the pyautogui sender would: its pause after
+    standalone actions, one type interval per (padded) character and the interval between repeated
+    clicks, all scaled by 'time_scale' (0 = no waiting at all).
+    """
+    def __init__(self, mouse_positions: dict, time_scale: float = 1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.time_scale = time_scale
+        # Reverse lookup so recorded clicks carry the button name, e.g. "button_buy"
+        self.position_names = {tuple(pos): name for name, pos in mouse_positions.items()}
+
+    def _wait(self, seconds: float) -> None:
+        if seconds > 0 and self.time_scale > 0:
+            time.sleep(seconds * self.time_scale)
+
+    def _gap(self, seconds: float) -> None:
+        self._wait(seconds)
+
+    def _type(self, text: str) -> None:
+        # InputSender pads short strings to 10 characters
+        self._wait(max(len(text), 10) * TYPE_INTERVAL)
+        super()._type(text)
+
+    def _click(self, position: tuple, clicks: int, interval: float) -> None:
+        self._wait(max(clicks - 1, 0) * interval)
+        super()._click(self.position_names.get(tuple(position), tuple(position)), clicks, interval)
@@ -0,0 +1,63 @@
+import copy
+import threading
+
+# Actions after which the client receives market orders for the current search
+RESPONSE_TRIGGERS = {"button_buy", "next_page"}
+
+class ReplaySniffer:
+    """
+    Stand-in for AlbionSniffer that replays recorded market orders.
+    Orders are keyed by the text typed into the search box (or the item's UniqueName) and arrive 'latency' seconds after
+    the search is typed or the item is opened, like responses from the game server would.
+    """
+    def __init__(self, responses: dict, latency: float = 0.05, time_scale: float = 1.0):
+        self.responses = {text.strip().lower(): orders for text, orders in responses.items()}
+        self.latency = latency * time_scale
+        self.market_data_buffer = []
+        self.current_search = None
+        self.current_item = None # Set by the harness, lets recordings key responses by UniqueName too
+        self.running = False
+        self.deliveries = 0
+        self._stopped = threading.Event()
+
+    def attach(self, sim_input) -> None:
+        sim_input.add_listener(self.on_action)
+
+    def on_action(self, kind: str, target, count: int) -> None:
+        if kind == "type" and isinstance(target, str) and not target.strip().isdigit():
+            self.current_search = target.strip().lower()
+            self._schedule_delivery()
+        elif kind == "click" and target in RESPONSE_TRIGGERS:
+            self._schedule_delivery()
+
+    def _schedule_delivery(self) -> None:
+        orders = self.responses.get(self.current_search)
+        if orders is None and self.current_item:
+            orders = self.responses.get(self.current_item.lower())
+        if not orders:
+            return
+        if self.latency > 0:
+            timer = threading.Timer(self.latency, self._deliver, args=(orders,))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._deliver(orders)
+
+    def _deliver(self, orders: list) -> None:
+        # Same shape AlbionSniffer.process_market_order produces
+        for order in orders:
+            data = copy.copy(order)
+            data['item_db_name'] = data.get('ItemTypeId')
+            self.market_data_buffer.append(data)
+        self.deliveries += 1
+
+    def clear_buffer(self):
+        self.market_data_buffer = []
+
+    def start(self, interface=None):
+        self.running = True
+        self._stopped.wait()
+
+    def stop(self):
+        self.running = False
+        self._stopped.set()
@@ -0,0 +1,67 @@
+import hashlib
+import json
+import marshal
+import os
+import sys
+from typing import Callable, Optional
+
+COMPILED_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'compiled')
+FORMAT_VERSION = 1
+
+def file_digest(path: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def compiled_path(source_path: str, variant: str = "") -> str:
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(COMPILED_DIR, f"{name}{'.' + variant if variant else ''}.bin")
+
+
+def load_compiled(source_path: str, compile_func: Callable[[object], object], variant: str = "", cache_path: Optional[str] = None):
+    """
+    Returns compile_func(json.load(source_path)), served from a marshal file next to the config.
+    The artifact is rebuilt only when the source's size/mtime changed and its content hash differs too,
+    or when it was written by another format version, Python version or 'variant' (e.g. language).
+    The payload must only hold builtin types (dict, list, tuple, str, int, float, None).
+    """
+    cache_path = cache_path or compiled_path(source_path, variant)
+    stat = os.stat(source_path)
+    expected = {"format": FORMAT_VERSION, "python": list(sys.version_info[:2]), "variant": variant}
+
+    try:
+        with open(cache_path, "rb") as f:
+            header = json.loads(f.readline())
+            if all(header.get(k) == v for k, v in expected.items()):
+                if header.get("mtime_ns") == stat.st_mtime_ns and header.get("size") == stat.st_size:
+                    # One read + loads: marshal.load() on the file object reads object by object, ~30x slower
+                    return marshal.loads(f.read())
+                # Touched but possibly unchanged (copied, checked out again): compare content
+                if header.get("size") == stat.st_size and header.get("digest") == file_digest(source_path):
+                    payload = marshal.loads(f.read())
+                    _write(cache_path, {**header, "mtime_ns": stat.st_mtime_ns}, payload)
+                    return payload
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        pass # Missing or unreadable artifact, rebuild it
+
+    with open(source_path, "r", encoding="utf-8") as f:
+        payload = compile_func(json.load(f))
+    header = {**expected, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "digest": file_digest(source_path)}
+    try:
+        _write(cache_path, header, payload)
+    except OSError as e:
+        print(f"[Compiled] Could not write {cache_path}: {e}")
+    return payload
+
+
+def _write(cache_path: str, header: dict, payload) -> None:
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        # One JSON header line, then the marshalled payload
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        f.write(marshal.dumps(payload))
+    os.replace(tmp_path, cache_path)
@@ -11,8 +11,8 @@ def load_json_config(filename):
 
 # Load the constant data when the application starts
 MOUSE_POSITIONS = load_json_config('mouse_positions.json')
-ITEM_DATA = load_json_config('items.json')
 CAPTURE_POSITIONS = load_json_config('capture_positions.json')
+OCR_PREPROCESS = load_json_config('ocr_preprocess.json')
 ITEMS_TO_BUY = load_json_config('items_to_buy.json')
 ITEMS_BLACK_MARKET = load_json_config('black_market_items_dictionary.json')
 LANGUAGE = "EN-US"
@@ -0,0 +1,122 @@
+import bisect
+import re
+
+_TOKEN_RE = re.compile(r"[^\W_]+") # Words of a name; '_' and '@' split unique names ("T4_BAG@2" -> t4, bag, 2)
+PREFIX_CACHE_SIZE = 256
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+class ItemIndex:
+    """
+    Filter and search index over the preset editor's items. Every facet value (category, sub-category,
+    tier, enchant) and every name token maps to a bitset, an int whose bit i is set when items[i] has it.
+    A filter combination is then a few big-int ANDs/ORs instead of a scan over all items, and a text query
+    ANDs the union of the tokens each typed word is a prefix of. Items need unique_name, localized_name,
+    category, sub_category, tier and enchant attributes.
+    """
+    def __init__(self, items: list = ()):
+        self.items = []
+        self.all = 0
+        self.name_bits = {} # unique_name -> bits, more than one if an item is listed under several categories
+        self.facets = {"category": {}, "sub_category": {}, "tier": {}, "enchant": {}}
+        self._token_map = {}
+        self.tokens = []
+        self.token_bits = []
+        self._prefix_cache = {}
+        self.add(items)
+
+    def add(self, items) -> None:
+        """Appends items, for catalogs that arrive in chunks. Existing bit positions do not change."""
+        token_map = self._token_map
+        for item in items:
+            i = len(self.items)
+            bit = 1 << i
+            self.items.append(item)
+            self.name_bits[item.unique_name] = self.name_bits.get(item.unique_name, 0) | bit
+            for facet, values in self.facets.items():
+                value = getattr(item, facet)
+                values[value] = values.get(value, 0) | bit
+            for token in set(tokenize(item.localized_name) + tokenize(item.unique_name)):
+                token_map[token] = token_map.get(token, 0) | bit
+        self.all = (1 << len(self.items)) - 1
+        # Sorted tokens: the tokens starting with a prefix are one contiguous bisect range
+        self.tokens = sorted(token_map)
+        self.token_bits = [token_map[t] for t in self.tokens]
+        self._prefix_cache = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def facet(self, facet: str, values) -> int:
+        """Items with any of 'values' for 'facet'; no values means no restriction."""
+        if not values:
+            return self.all
+        index = self.facets[facet]
+        mask = 0
+        for value in values:
+            mask |= index.get(value, 0)
+        return mask
+
+    def prefix(self, prefix: str) -> int:
+        """Items with a name token starting with 'prefix'."""
+        mask = self._prefix_cache.get(prefix)
+        if mask is not None:
+            return mask
+        start = bisect.bisect_left(self.tokens, prefix)
+        end = bisect.bisect_left(self.tokens, prefix + "\uffff", start)
+        mask = 0
+        for bits in self.token_bits[start:end]:
+            mask |= bits
+        if len(self._prefix_cache) >= PREFIX_CACHE_SIZE:
+            self._prefix_cache.clear()
+        self._prefix_cache[prefix] = mask
+        return mask
+
+    def search(self, text: str) -> int:
+        """Items matching every word of 'text' as a name prefix ("adep bag" finds Adept's Bag)."""
+        mask = self.all
+        for word in tokenize(text):
+            mask &= self.prefix(word)
+            if not mask:
+                break
+        return mask
+
+    def query(self, category=None, sub_category=None, tiers=(), enchants=(), text: str = "") -> int:
+        mask = self.all
+        if category:
+            mask &= self.facets["category"].get(category, 0)
+        if sub_category:
+            mask &= self.facets["sub_category"].get(sub_category, 0)
+        if tiers:
+            mask &= self.facet("tier", tiers)
+        if enchants:
+            mask &= self.facet("enchant", enchants)
+        if text and mask:
+            mask &= self.search(text)
+        return mask
+
+    def mask_of(self, unique_names) -> int:
+        """Bitset of the given unique names, unknown names are ignored."""
+        mask = 0
+        for name in unique_names:
+            mask |= self.name_bits.get(name, 0)
+        return mask
+
+    def items_of(self, mask: int) -> list:
+        """Items of a bitset, in index order."""
+        if not mask:
+            return []
+        if mask == self.all:
+            return list(self.items)
+        # Scanning the reversed binary string with find() is far cheaper than peeling bits off a big int
+        bits = bin(mask)[:1:-1]
+        items = self.items
+        result = []
+        i = bits.find("1")
+        while i != -1:
+            result.append(items[i])
+            i = bits.find("1", i + 1)
+        return result
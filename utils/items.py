@@ -1,46 +1,206 @@
-import requests
 import json
 import os
+import re
+import sys
+import threading
+from utils.compiled import load_compiled
 
 ITEMS_JSON_URL = "https://raw.githubusercontent.com/ao-data/ao-bin-dumps/master/formatted/items.json"
 CACHE_FILE = "items.json"
+CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', CACHE_FILE)
+BOT_ITEMS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'bot_items.json')
+DEFAULT_LANGUAGE = "EN-US"
 
-class ItemManager:
+_TIER_RE = re.compile(r"T(\d+)_(.+)")
+# EN-US tier prefixes ("Adept's Bag" -> "Bag"), used to find the name shared by every tier of an item.
+# Other client languages name tiers differently, their names are left whole and get no batched search.
+_TIER_PREFIX_RE = re.compile(r"^(Beginner's|Novice's|Journeyman's|Adept's|Expert's|Master's|Grandmaster's|Elder's)\s+")
+
+
+def parse_unique_name(unique_name: str) -> tuple[str, int, int]:
+    """Splits 'T4_BAG@2' into ('BAG', 4, 2). Tier is 0 when the name has no T-prefix."""
+    base_with_tier, sep, enchant_part = unique_name.partition("@")
+    enchant = 0
+    if sep:
+        try: enchant = int(enchant_part)
+        except ValueError: enchant = 0
+
+    match = _TIER_RE.match(base_with_tier)
+    if match:
+        return match.group(2), int(match.group(1)), enchant
+    return base_with_tier, 0, enchant
+
+
+class ItemKey:
+    """Immutable, interned identity of one item variant (tier + enchant included)."""
+    __slots__ = ("unique_name", "base_name", "tier", "enchant", "index", "localized_names", "search_text", "base_search_text")
+
+    def __init__(self, unique_name: str, index: int | None = None, localized_names: dict | None = None, language: str = DEFAULT_LANGUAGE):
+        base_name, tier, enchant = parse_unique_name(unique_name)
+        self.unique_name = sys.intern(unique_name)
+        self.base_name = sys.intern(base_name)
+        self.tier = tier
+        self.enchant = enchant
+        self.index = index
+        self.localized_names = localized_names or {}
+        # Text typed into the market search box: "<localized name> <tier>_<enchant>"
+        localized = self.localized_names.get(language)
+        self.search_text = f"{localized or unique_name} {tier}_{enchant}"
+        # Tier-less localized name; one search for it lists every tier/enchant of the item (EN-US only,
+        # elsewhere it is the full name and each tier stays its own search)
+        self.base_search_text = _TIER_PREFIX_RE.sub("", localized) if localized else None
+
+    def record(self, language: str = DEFAULT_LANGUAGE) -> tuple:
+        """Plain-tuple form stored in the compiled catalog, with the name in 'language' only."""
+        return (self.unique_name, self.base_name, self.tier, self.enchant, self.index,
+                self.localized_names.get(language), self.search_text, self.base_search_text)
+
+    @classmethod
+    def from_record(cls, record: tuple, language: str = DEFAULT_LANGUAGE) -> "ItemKey":
+        """Rebuilds a key from record() without re-parsing the name."""
+        key = cls.__new__(cls)
+        (unique_name, base_name, key.tier, key.enchant, key.index,
+         localized, key.search_text, key.base_search_text) = record
+        key.unique_name = sys.intern(unique_name)
+        key.base_name = sys.intern(base_name)
+        key.localized_names = {language: localized} if localized else {}
+        return key
+
+    @property
+    def tier_label(self) -> str:
+        return f"T{self.tier}" if self.tier else "TX"
+
+    def localized_name(self, language: str = DEFAULT_LANGUAGE) -> str | None:
+        return self.localized_names.get(language)
+
+    def __repr__(self) -> str:
+        return f"ItemKey({self.unique_name})"
+
+
+def compile_items(data: list[dict], language: str = DEFAULT_LANGUAGE) -> list[list]:
+    """
+    items.json entries -> ItemKey records, stored column by column (one list per record field),
+    which unmarshals about twice as fast as a list of tuples. Only the catalog language's name is kept.
+    """
+    records = []
+    for item in data:
+        unique_name = item.get("UniqueName")
+        if not unique_name:
+            continue
+        # Indexes in JSON are often strings, convert to int
+        try: index = int(item["Index"]) if "Index" in item else None
+        except (TypeError, ValueError): index = None
+        records.append(ItemKey(unique_name, index, item.get("LocalizedNames"), language).record(language))
+    return [list(column) for column in zip(*records)]
+
+
+def compile_bot_items(data: dict) -> dict:
+    """bot_items.json (category -> sub-category -> {UniqueName: name} or [UniqueName]) -> flat entries."""
+    categories = {}
+    entries = []
+    for cat, sub_cats in data.items():
+        categories[cat] = list(sub_cats.keys())
+        for sub, items in sub_cats.items():
+            if isinstance(items, dict):
+                entries.extend((uid, name, cat, sub) for uid, name in items.items())
+            elif isinstance(items, list):
+                entries.extend((uid, uid, cat, sub) for uid in items)
+    return {"categories": categories, "entries": entries}
+
+
+def load_bot_items(path: str = BOT_ITEMS_PATH) -> dict:
+    """Preset-editor item list: {"categories": {cat: [sub, ...]}, "entries": [(uid, name, cat, sub), ...]}."""
+    if not os.path.exists(path):
+        return {"categories": {}, "entries": []}
+    try:
+        return load_compiled(path, compile_bot_items)
+    except Exception as e:
+        print(f"[ItemCatalog] Error loading {path}: {e}")
+        return {"categories": {}, "entries": []}
+
+
+class ItemCatalog:
+    """
+    Single, process-wide index over items.json.
+    Build once, then look items up by UniqueName or by numeric Index in O(1).
+    """
     _instance = None
+    _lock = threading.Lock() # The preset editor loads it on a worker thread while the bot may be starting
 
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(ItemManager, cls).__new__(cls)
-            cls._instance.id_to_name = {}
-            cls._instance.load_items()
+        if cls._instance is not None:
+            return cls._instance
+        with cls._lock:
+            if cls._instance is None:
+                instance = super(ItemCatalog, cls).__new__(cls)
+                instance.by_name = {}
+                instance.unknown = {} # Keys made on demand for names missing from items.json
+                instance.by_index = {}
+                instance.language = DEFAULT_LANGUAGE
+                instance.load_items()
+                cls._instance = instance
         return cls._instance
 
-    def load_items(self):
+    def load_items(self, path: str = CACHE_PATH):
         # Check if we have a local cache
-        if not os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', CACHE_FILE):
+        if not os.path.exists(path):
             print("Downloading Item Database (this happens once)...")
             try:
+                import requests # Only needed for this one download
                 response = requests.get(ITEMS_JSON_URL)
                 response.raise_for_status()
-                with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+                with open(path, 'w', encoding='utf-8') as f:
                     f.write(response.text)
             except Exception as e:
-                print(f"Failed to download items: {e}")
+                print(f"[ItemCatalog] Failed to download items: {e}")
                 return
 
-        # Load into memory
         try:
-            with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', CACHE_FILE), 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                for item in data:
-                    # Map "Index" (int) to "UniqueName" (string)
-                    if "Index" in item and "UniqueName" in item:
-                        # Indexes in JSON are often strings, convert to int
-                        idx = int(item["Index"])
-                        self.id_to_name[idx] = item["UniqueName"]
-            print(f"[ItemManager] Loaded {len(self.id_to_name)} items.")
+            # Parsed once into config/compiled/, later starts only unmarshal the records
+            columns = load_compiled(path, lambda data: compile_items(data, self.language), variant=self.language)
         except Exception as e:
-            print(f"[ItemManager] Error loading cache: {e}")
+            print(f"[ItemCatalog] Error loading cache: {e}")
+            return
+
+        self.add_records(zip(*columns))
+        print(f"[ItemCatalog] Loaded {len(self.by_name)} items.")
+
+    def build(self, data: list[dict]):
+        self.add_records(zip(*compile_items(data, self.language)))
+
+    def add_records(self, records):
+        for record in records:
+            key = ItemKey.from_record(record, self.language)
+            self.by_name[key.unique_name] = key
+            if key.index is not None:
+                self.by_index[key.index] = key
+
+    def get(self, unique_name: str) -> ItemKey:
+        """
+        Returns the interned key for a UniqueName. Names missing from items.json get a key as well, kept apart
+        in 'unknown' so 'name in catalog' still means "known to items.json". Keys are compared by identity
+        (dict keys of found prices), so the same unknown name always gets the same key.
+        """
+        key = self.by_name.get(unique_name)
+        if key is None:
+            key = self.unknown.get(unique_name)
+        if key is None:
+            # Called from the sniffer, bot and GUI threads: only one of them may create the key
+            with self._lock:
+                key = self.unknown.get(unique_name)
+                if key is None:
+                    key = self.unknown[unique_name] = ItemKey(unique_name, language=self.language)
+        return key
+
+    def get_by_index(self, index: int) -> ItemKey | None:
+        return self.by_index.get(index)
+
+    def get_name(self, index: int) -> str:
+        key = self.by_index.get(index)
+        return key.unique_name if key else str(index) # Fallback to ID if unknown
+
+    def __contains__(self, unique_name: str) -> bool:
+        return unique_name in self.by_name
 
-    def get_name(self, item_id):
-        return self.id_to_name.get(item_id, str(item_id)) # Fallback to ID if unknown
\ No newline at end of file
+    def __len__(self) -> int:
+        return len(self.by_name)
@@ -0,0 +1,149 @@
+import io
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
+LOG_FILE = os.path.join(LOG_DIR, 'bot.log')
+CAPACITY = 5000 # Records kept in memory
+MAX_FILE_BYTES = 5 * 1024 * 1024
+FILE_BACKUPS = 3
+
+DEBUG, INFO, WARNING, ERROR = "DEBUG", "INFO", "WARNING", "ERROR"
+_TAG_RE = re.compile(r"^\[([^\]]+)\]\s*") # "[DB Loop Error] ..." -> source "DB", level ERROR
+_LEVEL_NUMBERS = {DEBUG: logging.DEBUG, INFO: logging.INFO, WARNING: logging.WARNING, ERROR: logging.ERROR}
+
+
+class LogRecord:
+    __slots__ = ("seq", "time", "level", "source", "message")
+
+    def __init__(self, seq: int, time: float, level: str, source: str, message: str):
+        self.seq = seq
+        self.time = time
+        self.level = level
+        self.source = source
+        self.message = message
+
+    def format(self) -> str:
+        return f"{time.strftime('%H:%M:%S', time.localtime(self.time))} {self.level:<7} {self.source:<10} {self.message}"
+
+
+def classify(line: str, default_level: str = INFO) -> tuple[str, str, str]:
+    """(level, source, message) of a printed line, from the repo's '[Tag] message' convention."""
+    match = _TAG_RE.match(line)
+    if not match:
+        level = ERROR if line.startswith(("Error", "Traceback")) else default_level
+        return level, "", line
+    words = match.group(1).split()
+    tag = " ".join(words).lower()
+    message = line[match.end():]
+    if "error" in tag:
+        level = ERROR
+    elif "warn" in tag or message.startswith(("Could not", "Ignoring")):
+        level = WARNING
+    else:
+        level = default_level
+    return level, words[0] if words else "", message
+
+
+class LogFile:
+    """Writes records to a size-rotated file from its own thread, so logging never waits on the disk."""
+    def __init__(self, path: str = LOG_FILE, max_bytes: int = MAX_FILE_BYTES, backups: int = FILE_BACKUPS):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+        self.handler.setFormatter(logging.Formatter("%(message)s"))
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="log-file")
+        self.thread.start()
+
+    def write(self, record: LogRecord) -> None:
+        self.queue.put(record)
+
+    def _run(self) -> None:
+        while True:
+            record = self.queue.get()
+            if record is None:
+                break
+            entry = logging.makeLogRecord({"msg": record.format(), "levelno": _LEVEL_NUMBERS.get(record.level, logging.INFO)})
+            try:
+                self.handler.emit(entry)
+            except Exception:
+                pass # Disk trouble must not take the bot down
+        self.handler.close()
+
+    def close(self, timeout: float = 2.0) -> None:
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+
+class LogBuffer:
+    """
+    Thread-safe ring buffer of the last 'capacity' log records. Writers only append under a lock;
+    readers poll since(seq) at their own pace, so a burst of log lines costs the GUI one redraw
+    instead of one per line. Every record also goes to the optional LogFile.
+    """
+    def __init__(self, capacity: int = CAPACITY, log_file: Optional[LogFile] = None):
+        self.records = deque(maxlen=capacity)
+        self.log_file = log_file
+        self.seq = 0
+        self._lock = threading.Lock()
+
+    def append(self, level: str, source: str, message: str) -> LogRecord:
+        with self._lock:
+            self.seq += 1
+            record = LogRecord(self.seq, time.time(), level, source, message)
+            self.records.append(record)
+        if self.log_file:
+            self.log_file.write(record)
+        return record
+
+    def log(self, line: str, default_level: str = INFO) -> LogRecord:
+        return self.append(*classify(line, default_level))
+
+    def since(self, seq: int, limit: Optional[int] = None) -> list:
+        """Records newer than 'seq', at most the last 'limit' of them."""
+        with self._lock:
+            if not self.records or self.records[-1].seq <= seq:
+                return []
+            newer = self.records[-1].seq - seq
+            count = min(newer, len(self.records), limit or newer)
+            return [self.records[i] for i in range(len(self.records) - count, len(self.records))]
+
+    def close(self) -> None:
+        if self.log_file:
+            self.log_file.close()
+
+
+class ConsoleStream(io.TextIOBase):
+    """
+    sys.stdout / sys.stderr replacement feeding a LogBuffer, one record per completed line.
+    Partial writes (print() sends the text and the newline separately) are joined per thread.
+    """
+    def __init__(self, buffer: LogBuffer, default_level: str = INFO):
+        super().__init__()
+        self.buffer = buffer
+        self.default_level = default_level
+        self._local = threading.local()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        pending = getattr(self._local, "pending", "") + text
+        *lines, self._local.pending = pending.split("\n")
+        for line in lines:
+            if line.strip():
+                self.buffer.log(line.rstrip(), self.default_level)
+        return len(text)
+
+    def flush(self) -> None:
+        pending = getattr(self._local, "pending", "")
+        if pending.strip():
+            self._local.pending = ""
+            self.buffer.log(pending.rstrip(), self.default_level)
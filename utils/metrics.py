@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from utils.tracing import TRACER
+
+RATE_WINDOW = 10.0 # s, default span a Sampler averages its rates over
+# Latency histograms of the tracer shown next to the counters
+LATENCY_STEPS = ("ocr.match", "ocr.batch", "ocr.text", "sniffer.wait", "db.save_orders", "db.save_history", "db.save_item_data")
+
+
+class Counter:
+    """Monotonic running total. The lock only covers the increment, a few hundred ns per packet."""
+    __slots__ = ("total", "_lock")
+
+    def __init__(self):
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def add(self, n: int = 1) -> None:
+        with self._lock:
+            self.total += n
+
+
+class Sampler:
+    """
+    One consumer's view of the counter rates, averaged over its own sliding 'window' of samples.
+    Each display keeps its own sampler, so polling at different rates never shortens another one's window.
+    """
+    __slots__ = ("registry", "window", "history")
+
+    def __init__(self, registry: "MetricsRegistry", window: float = RATE_WINDOW):
+        self.registry = registry
+        self.window = window
+        self.history = deque() # (time, {counter: total}), about 'window' long
+
+    def rates(self, now: float = None) -> dict:
+        """{counter: per second} over the last 'window' seconds (less until that much has been sampled)."""
+        now = time.monotonic() if now is None else now
+        totals = self.registry.totals()
+        history = self.history
+        history.append((now, totals))
+        while len(history) > 2 and now - history[1][0] >= self.window:
+            history.popleft()
+        then, old = history[0]
+        elapsed = now - then
+        return {name: (total - old.get(name, 0)) / elapsed if elapsed > 0 else 0.0 for name, total in totals.items()}
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters and gauges for the live dashboard. Subsystems call add()/set() on the hot path;
+    displays call sample() at their own rate, passing their own Sampler to get per-second rates.
+    Gauges can also be functions, evaluated on sample(), e.g. a queue's qsize.
+    Latency percentiles come from the shared TRACER.
+    """
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str) -> Counter:
+        counter = self.counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self.counters.setdefault(name, Counter())
+        return counter
+
+    def add(self, name: str, n: int = 1) -> None:
+        self.counter(name).add(n)
+
+    def set(self, name: str, value) -> None:
+        self.gauges[name] = value
+
+    def gauge(self, name: str, func: Callable[[], object]) -> None:
+        """Registers a gauge evaluated on every sample()."""
+        self.gauges[name] = func
+
+    def sampler(self, window: float = RATE_WINDOW) -> Sampler:
+        return Sampler(self, window)
+
+    def totals(self) -> dict:
+        with self._lock:
+            counters = list(self.counters.items())
+        return {name: counter.total for name, counter in counters}
+
+    def sample(self, sampler: Sampler = None, now: float = None) -> dict:
+        """{"rates": {name: per second} (empty without a sampler), "totals", "gauges", "latency": {step: histogram dict}}"""
+        rates = sampler.rates(now) if sampler is not None else {}
+        totals = self.totals()
+
+        gauges = {}
+        for name, value in list(self.gauges.items()):
+            if callable(value):
+                try:
+                    value = value()
+                except Exception:
+                    value = None
+            gauges[name] = value
+
+        steps = TRACER.snapshot()
+        latency = {name: steps[name] for name in LATENCY_STEPS if name in steps}
+        return {"rates": rates, "totals": totals, "gauges": gauges, "latency": latency}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+
+
+METRICS = MetricsRegistry()
@@ -0,0 +1,246 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Optional
+
+THUMBNAIL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'thumbnails')
+RENDER_URL = "https://render.albiononline.com/v1/item"
+THUMBNAIL_SIZE = 64 # px, the lists show 30 px icons
+MAX_BYTES = 64 * 1024 * 1024
+SAVE_EVERY = 50 # Index writes are batched, every N stored thumbnails and on close()
+PREFETCH_LIMIT = 400 # Items queued per filter change, the rest load when scrolled into view
+PREFETCH_WORKERS = 4
+RETRY_AFTER = 300.0 # s before a failed download is attempted again
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+
+class ThumbnailCache:
+    """
+    Item icons on disk, content-addressed: each image is stored once as <blake2b digest>.png under
+    'directory', and index.json maps unique names to digests in least-recently-used order. When the
+    blobs exceed 'max_bytes', the least recently used names are dropped and unreferenced blobs deleted.
+    src() answers with the local file when cached, the render URL otherwise.
+    """
+    def __init__(self, directory: str = THUMBNAIL_DIR, base_url: str = RENDER_URL, size: int = THUMBNAIL_SIZE, max_bytes: int = MAX_BYTES):
+        self.directory = directory
+        self.base_url = base_url.rstrip("/")
+        self.size = size
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict() # unique_name -> digest, oldest access first
+        self.blobs = {} # digest -> [bytes, references]
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.failed = {} # unique_name -> time of the last failed download
+        self._unsaved = 0
+        self._local = threading.local() # One HTTP session per prefetch worker
+        self._lock = threading.Lock()
+        self.load()
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, "index.json")
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest + ".png")
+
+    def url(self, unique_name: str) -> str:
+        return f"{self.base_url}/{unique_name}.png?size={self.size}"
+
+    def load(self) -> None:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        for unique_name, digest in entries:
+            if digest not in self.blobs:
+                try:
+                    self.blobs[digest] = [os.path.getsize(self.blob_path(digest)), 0]
+                except OSError:
+                    continue # Blob deleted behind our back
+                self.total_bytes += self.blobs[digest][0]
+            self.blobs[digest][1] += 1
+            self.entries[unique_name] = digest
+
+    def save(self) -> None:
+        with self._lock:
+            entries = list(self.entries.items())
+            self._unsaved = 0
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.index_path)
+
+    def path(self, unique_name: str) -> Optional[str]:
+        """Local file of a cached icon (marking it recently used), None if not cached."""
+        with self._lock:
+            digest = self.entries.get(unique_name)
+            if digest is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(unique_name)
+            self.hits += 1
+        return self.blob_path(digest)
+
+    def src(self, unique_name: str) -> str:
+        return self.path(unique_name) or self.url(unique_name)
+
+    def __contains__(self, unique_name: str) -> bool:
+        return unique_name in self.entries
+
+    def store(self, unique_name: str, data: bytes) -> str:
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        path = self.blob_path(digest)
+        # Files are written and removed under the lock too, another thread may be evicting the same blob
+        with self._lock:
+            if digest not in self.blobs:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                self.blobs[digest] = [len(data), 0]
+                self.total_bytes += len(data)
+            self.blobs[digest][1] += 1
+            old = self.entries.pop(unique_name, None)
+            if old is not None:
+                self._release(old)
+            self.entries[unique_name] = digest
+            self._unsaved += 1
+            self._evict()
+            save = self._unsaved >= SAVE_EVERY
+        if save:
+            self.save()
+        return path
+
+    def _release(self, digest: str) -> None:
+        """Drops one reference to a blob, deleting it with the last one."""
+        blob = self.blobs[digest]
+        blob[1] -= 1
+        if blob[1] <= 0:
+            self.total_bytes -= self.blobs.pop(digest)[0]
+            try:
+                os.remove(self.blob_path(digest))
+            except OSError:
+                pass
+
+    def _evict(self) -> None:
+        """Drops least recently used names until the remaining blobs fit in max_bytes."""
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, digest = self.entries.popitem(last=False)
+            self._release(digest)
+
+    def fetch(self, unique_name: str, timeout: float = 10.0) -> Optional[str]:
+        """Cached path of the icon, downloading it first if needed. None when the download fails."""
+        path = self.path(unique_name)
+        if path is not None:
+            return path
+        with self._lock:
+            failed_at = self.failed.get(unique_name)
+        if failed_at is not None and time.monotonic() - failed_at < RETRY_AFTER:
+            return None
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests # Only when something has to be downloaded
+            session = self._local.session = requests.Session()
+        try:
+            response = session.get(self.url(unique_name), timeout=timeout)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"[Thumbnails] Could not download {unique_name}: {e}")
+            self._mark_failed(unique_name)
+            return None
+        if not response.content.startswith(PNG_MAGIC):
+            print(f"[Thumbnails] {unique_name}: not a PNG ({response.headers.get('Content-Type')})")
+            self._mark_failed(unique_name)
+            return None
+        return self.store(unique_name, response.content)
+
+    def _mark_failed(self, unique_name: str) -> None:
+        # Written by every prefetch worker
+        with self._lock:
+            self.failed[unique_name] = time.monotonic()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"items": len(self.entries), "blobs": len(self.blobs), "bytes": self.total_bytes, "hits": self.hits, "misses": self.misses}
+
+
+class ThumbnailPrefetcher:
+    """
+    Fills a ThumbnailCache in the background. prefetch() replaces the queue with the items of the
+    current filter (the previous filter's leftovers are no longer interesting), urgent=True puts
+    names in front, for the rows that are on screen right now. on_ready(unique_name, path) is
+    called from a worker thread for every icon that got downloaded.
+    """
+    def __init__(self, cache: ThumbnailCache, on_ready: Optional[Callable[[str, str], None]] = None, workers: int = PREFETCH_WORKERS):
+        self.cache = cache
+        self.on_ready = on_ready
+        self.pending = deque()
+        self.in_flight = set()
+        self.running = True
+        self._wake = threading.Condition()
+        self.threads = [threading.Thread(target=self._run, daemon=True, name=f"thumbnails-{i}") for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def prefetch(self, unique_names, urgent: bool = False, limit: int = PREFETCH_LIMIT) -> int:
+        names = []
+        for name in unique_names:
+            if name not in self.cache and name not in self.in_flight:
+                names.append(name)
+                if len(names) >= limit:
+                    break
+        with self._wake:
+            if urgent:
+                queued = set(names)
+                self.pending = deque(names + [n for n in self.pending if n not in queued])
+            else:
+                self.pending = deque(names)
+            self._wake.notify_all()
+        return len(names)
+
+    def _run(self) -> None:
+        while True:
+            with self._wake:
+                while self.running and not self.pending:
+                    self._wake.wait()
+                if not self.running:
+                    return
+                name = self.pending.popleft()
+                if name in self.in_flight or name in self.cache:
+                    continue
+                self.in_flight.add(name)
+            try:
+                path = self.cache.fetch(name)
+            finally:
+                with self._wake:
+                    self.in_flight.discard(name)
+            if path and self.on_ready:
+                try:
+                    self.on_ready(name, path)
+                except Exception as e:
+                    print(f"[Thumbnails] on_ready failed for {name}: {e}")
+
+    def wait_idle(self, timeout: float = 30.0) -> bool:
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            with self._wake:
+                if not self.pending and not self.in_flight:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def close(self) -> None:
+        with self._wake:
+            self.running = False
+            self.pending.clear()
+            self._wake.notify_all()
+        for thread in self.threads:
+            thread.join(timeout=1.0)
+        self.cache.save()
@@ -0,0 +1,190 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+# Histogram bucket upper bounds in seconds, from fast in-process steps to slow UI round trips
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_NAME = "albion_step_latency_seconds"
+
+class Histogram:
+    """Fixed-bucket latency histogram. observe() is a bisect and a few additions."""
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1) # Last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """Estimate, interpolated linearly inside the bucket holding the p-th observation."""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BUCKETS[i - 1] if i > 0 else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Tracer:
+    """
+    Collects per-step latency histograms from spans around bot actions, sniffer waits and DB calls.
+    Cheap enough to stay on: one perf_counter pair and one short lock per span.
+    """
+    def __init__(self):
+        self.enabled = True
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._exporter = None
+
+    def span(self, name: str):
+        return _Span(self, name)
+
+    def traced(self, name: str):
+        """Decorator form of span()."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def observe(self, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram()
+            hist.observe(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: hist.to_dict() for name, hist in sorted(self.histograms.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+
+    # --- Export ---
+
+    def render_prometheus(self) -> str:
+        lines = [f"# HELP {METRIC_NAME} Latency of trade bot steps.", f"# TYPE {METRIC_NAME} histogram"]
+        with self._lock:
+            items = [(name, list(h.counts), h.count, h.total) for name, h in sorted(self.histograms.items())]
+        for name, counts, count, total in items:
+            cumulative = 0
+            for bound, n in zip(BUCKETS, counts):
+                cumulative += n
+                lines.append(f'{METRIC_NAME}_bucket{{step="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_bucket{{step="{name}",le="+Inf"}} {count}')
+            lines.append(f'{METRIC_NAME}_sum{{step="{name}"}} {total:.6f}')
+            lines.append(f'{METRIC_NAME}_count{{step="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def export_json(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"exported_at": time.time(), "steps": self.snapshot()}, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def start_file_export(self, path: str, interval: float = 10.0) -> None:
+        """Writes the histogram snapshot to 'path' every 'interval' seconds on a daemon thread."""
+        if self._exporter is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try: self.export_json(path)
+                except Exception as e: print(f"[Tracing] Export to {path} failed: {e}")
+
+        self._exporter = threading.Thread(target=loop, daemon=True)
+        self._exporter.start()
+
+    def serve(self, port: int = 9105, host: str = "127.0.0.1") -> bool:
+        """Serves the Prometheus text format on http://host:port/metrics."""
+        if self._server is not None:
+            return True
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer # Off unless metrics_port is set
+        tracer = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = tracer.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass # Keep scrapes out of the bot log
+
+        try:
+            self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as e:
+            print(f"[Tracing] Could not serve metrics on {host}:{port}: {e}")
+            return False
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"[Tracing] Metrics on http://{host}:{port}/metrics")
+        return True
+
+
+TRACER = Tracer()
+span = TRACER.span
+traced = TRACER.traced